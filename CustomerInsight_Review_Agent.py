@@ -64,7 +64,7 @@ When invoked, this agent MUST generate a PM-focused report containing:
 
 ================================================================================
 USAGE:
-    python CustomerInsight_Review_Agent.py [reviews_file.json]
+    python CustomerInsight_Review_Agent.py [reviews_file.json] [--workers N]
 
 OUTPUT FILES:
     - Insight_Appstore.md   (Full PM report)
@@ -79,9 +79,19 @@ CUSTOMIZATION:
 
 import json
 import csv
+import hashlib
+import os
 import re
-from collections import Counter, defaultdict
-from datetime import datetime
+import shutil
+import sqlite3
+import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+
+import numpy as np
 
 # ============================================================================
 # TOP 10 CATEGORIES FOR PRINTER/CONSUMER APP
@@ -215,6 +225,146 @@ SENTIMENT_KEYWORDS = {
 }
 
 
+# ============================================================================
+# KEYWORD MATCHER
+# ============================================================================
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton built once from SENTIMENT_KEYWORDS and
+    INSIGHT_CATEGORIES.
+
+    scan() walks the lowercased text a single time and returns every keyword
+    that occurs in it, with the same substring semantics as the original
+    `keyword in text_lower` checks. Positive/negative hit counts and the
+    category bitmask are then derived from the matched keyword ids.
+    """
+
+    def __init__(self, sentiment_keywords, insight_categories):
+        self.category_ids = list(insight_categories.keys())
+
+        # Unique keyword strings; each one carries the table entries it stands for
+        self.keywords = []
+        keyword_index = {}
+        self.positive_weight = []
+        self.negative_weight = []
+        self.category_mask = []
+
+        def intern(keyword):
+            if keyword not in keyword_index:
+                keyword_index[keyword] = len(self.keywords)
+                self.keywords.append(keyword)
+                self.positive_weight.append(0)
+                self.negative_weight.append(0)
+                self.category_mask.append(0)
+            return keyword_index[keyword]
+
+        for word in sentiment_keywords.get("positive", []):
+            self.positive_weight[intern(word)] += 1
+        for word in sentiment_keywords.get("negative", []):
+            self.negative_weight[intern(word)] += 1
+        for bit, cat_info in enumerate(insight_categories.values()):
+            for keyword in cat_info["keywords"]:
+                self.category_mask[intern(keyword)] |= 1 << bit
+
+        self._build()
+
+    def _build(self):
+        """Build the goto trie, failure links and a dense transition table"""
+        goto = [{}]
+        outputs = [[]]
+        for kw_id, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append([])
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state].append(kw_id)
+
+        # Breadth-first pass: failure links, inherited outputs, full transitions
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = [tuple(out) if out else None for out in outputs]
+
+    def scan(self, text_lower):
+        """Return the set of keyword ids occurring in already-lowercased text"""
+        delta = self._delta
+        outputs = self._outputs
+        hits = set()
+        state = 0
+        for ch in text_lower:
+            state = delta[state].get(ch, 0)
+            if outputs[state] is not None:
+                hits.update(outputs[state])
+        return hits
+
+    def match(self, text):
+        """
+        Match text against both tables in one pass.
+        Returns (positive_hits, negative_hits, category_mask).
+        """
+        hits = self.scan(text.lower())
+        pos_count = 0
+        neg_count = 0
+        mask = 0
+        for kw_id in hits:
+            pos_count += self.positive_weight[kw_id]
+            neg_count += self.negative_weight[kw_id]
+            mask |= self.category_mask[kw_id]
+        return pos_count, neg_count, mask
+
+    def categories_from_mask(self, mask):
+        """Expand a category bitmask into category ids (table order)"""
+        return [cat_id for bit, cat_id in enumerate(self.category_ids) if mask >> bit & 1]
+
+
+_KEYWORD_MATCHER = None
+
+
+def get_keyword_matcher(rebuild=False):
+    """
+    Return the shared KeywordMatcher, building it on first use.
+    Pass rebuild=True after editing the keyword tables at runtime.
+    """
+    global _KEYWORD_MATCHER
+    if _KEYWORD_MATCHER is None or rebuild:
+        _KEYWORD_MATCHER = KeywordMatcher(SENTIMENT_KEYWORDS, INSIGHT_CATEGORIES)
+    return _KEYWORD_MATCHER
+
+
+def _sentiment_label(pos_count, neg_count):
+    """Map positive/negative keyword hit counts to a sentiment label"""
+    if pos_count > neg_count:
+        return "positive"
+    elif neg_count > pos_count:
+        return "negative"
+    else:
+        return "neutral"
+
+
 def load_reviews(filepath):
     """Load reviews from CSV or JSON file"""
     reviews = []
@@ -230,80 +380,1351 @@ def load_reviews(filepath):
     return reviews
 
 
-def analyze_sentiment(text):
-    """Analyze sentiment of review text"""
-    text_lower = text.lower()
+# Characters read per refill by the streaming JSON loader
+JSON_READ_SIZE = 1 << 16
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_VALUE_END = _JSON_WHITESPACE + ",]"
+
+
+def iter_json_array(filepath, read_size=JSON_READ_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    The file is read in fixed-size blocks and each element is decoded with
+    JSONDecoder.raw_decode as soon as it is complete, so memory holds one
+    buffer plus the current element regardless of file size. The file is
+    opened immediately, so a missing file raises FileNotFoundError here
+    rather than on first iteration.
+    """
+    f = open(filepath, 'r', encoding='utf-8')
+    return _iter_json_array(f, read_size)
+
+
+def _iter_json_array(f, read_size):
+    decoder = json.JSONDecoder()
+    with f:
+        buf = f.read(read_size)
+        eof = not buf
+        pos = 0
+
+        def skip_whitespace():
+            nonlocal buf, pos, eof
+            while True:
+                while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                buf = f.read(read_size)
+                pos = 0
+                eof = not buf
+
+        def refill():
+            nonlocal buf, pos, eof
+            more = f.read(read_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] != '[':
+            raise json.JSONDecodeError("Expecting '[' at start of review array", buf, pos)
+        pos += 1
+
+        skip_whitespace()
+        if pos < len(buf) and buf[pos] == ']':
+            return
+
+        while True:
+            skip_whitespace()
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill()
+                continue
+            if not eof and (end == len(buf) or (
+                    isinstance(item, (int, float)) and buf[end] not in _JSON_VALUE_END)):
+                # A bare number could continue in the next block
+                refill()
+                continue
+            yield item
+            pos = end
+
+            skip_whitespace()
+            if pos >= len(buf):
+                raise json.JSONDecodeError("Unterminated review array", buf, pos)
+            if buf[pos] == ']':
+                return
+            if buf[pos] != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+
+            # Drop consumed text so the buffer stays bounded
+            if pos >= read_size:
+                buf = buf[pos:]
+                pos = 0
+
+
+def iter_reviews(filepath, records=False):
+    """
+    Stream reviews from a CSV or JSON file without loading it whole.
+    Same formats as load_reviews; use with ReviewAnalysisAccumulator or
+    analyze_reviews for flat-memory analysis. With records=True each
+    review is yielded as a compact Review instead of a dict.
+    """
+    if filepath.endswith('.json'):
+        reviews = iter_json_array(filepath)
+    elif filepath.endswith('.csv'):
+        f = open(filepath, 'r', encoding='utf-8')
+        reviews = _iter_csv_rows(f)
+    else:
+        return iter(())
+    return map(Review.from_dict, reviews) if records else reviews
+
+
+def _iter_csv_rows(f):
+    with f:
+        yield from csv.DictReader(f)
+
+
+# Columns kept by the columnar CSV loader (matches save_to_csv output)
+REVIEW_COLUMNS = ["id", "title", "content", "rating", "date", "version", "platform", "country"]
+
+
+def load_review_columns(filepath, columns=REVIEW_COLUMNS):
+    """
+    Columnar CSV loader: returns {column: values} for the requested columns
+    only, instead of one dict per row.
+
+    Only the requested columns are kept while the rows are read, so other
+    fields are never held in memory. Types are coerced once per column:
+    "rating" becomes an int64 array (blank or missing -> 3, as in
+    analyze_reviews); every other column is a list of strings, "" when the
+    column is absent. A legacy "review" column fills in empty "content".
+    """
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        index = {name: i for i, name in reversed(list(enumerate(header)))}
+        wanted = [name for name in dict.fromkeys(columns) if name in index]
+        if "content" in columns and "review" in index and "review" not in wanted:
+            wanted.append("review")
+        values = {name: [] for name in wanted}
+        picks = [(index[name], values[name].append) for name in wanted]
+        count = 0
+        for row in reader:
+            width = len(row)
+            for i, append in picks:
+                append(row[i] if i < width else "")
+            count += 1
+
+    result = {}
+    for name in columns:
+        column = values.get(name, [""] * count)
+        if name == "rating":
+            ratings = np.array(column, dtype=str)
+            ratings[ratings == ""] = "3"
+            result[name] = ratings.astype(np.int64)
+        else:
+            result[name] = list(column)
 
-    pos_count = sum(1 for word in SENTIMENT_KEYWORDS["positive"] if word in text_lower)
-    neg_count = sum(1 for word in SENTIMENT_KEYWORDS["negative"] if word in text_lower)
+    if "content" in result and "review" in values:
+        result["content"] = [content or review
+                             for content, review in zip(result["content"], values["review"])]
+    return result
 
-    if pos_count > neg_count:
-        return "positive"
-    elif neg_count > pos_count:
-        return "negative"
-    else:
-        return "neutral"
+
+def extract_review_text(review):
+    """Return (title, content) for any supported review format"""
+    if type(review) is Review:
+        return review.text()
+    content = review.get("content", "") or review.get("review", "") or ""
+    title = review.get("title", "") or ""
+    return title, content
+
+
+def analyze_sentiment(text):
+    """Analyze sentiment of review text"""
+    pos_count, neg_count, _ = get_keyword_matcher().match(text)
+    return _sentiment_label(pos_count, neg_count)
 
 
 def categorize_review(text):
     """Categorize review into insight categories"""
-    text_lower = text.lower()
-    categories = []
+    matcher = get_keyword_matcher()
+    _, _, mask = matcher.match(text)
+    categories = matcher.categories_from_mask(mask)
+    return categories if categories else ["uncategorized"]
 
-    for cat_id, cat_info in INSIGHT_CATEGORIES.items():
-        for keyword in cat_info["keywords"]:
-            if keyword in text_lower:
-                categories.append(cat_id)
-                break
 
-    return categories if categories else ["uncategorized"]
+def classify_review(text):
+    """
+    Sentiment and categories for one review text, from a single matcher pass.
+    Equivalent to (analyze_sentiment(text), categorize_review(text)).
+    """
+    matcher = get_keyword_matcher()
+    pos_count, neg_count, mask = matcher.match(text)
+    categories = matcher.categories_from_mask(mask)
+    return _sentiment_label(pos_count, neg_count), categories if categories else ["uncategorized"]
 
 
-def analyze_reviews(reviews):
-    """Main analysis function"""
+# ============================================================================
+# BATCH CLASSIFICATION (NumPy)
+# ============================================================================
+
+# int8 codes used by the batch API
+SENTIMENT_CODES = {"positive": 1, "negative": -1, "neutral": 0}
+SENTIMENT_LABELS = {code: label for label, code in SENTIMENT_CODES.items()}
+
+
+def _match_batch(texts):
+    """
+    Scan every text once and reduce keyword hits per review with NumPy.
+    Returns (positive_hits, negative_hits, category_mask) arrays.
+    """
+    matcher = get_keyword_matcher()
+    if len(matcher.category_ids) > 16:
+        raise ValueError("uint16 category masks support at most 16 categories")
+
+    # Sparse review x keyword incidence, one entry per distinct keyword hit
+    doc_ids = []
+    kw_ids = []
+    for i, text in enumerate(texts):
+        hits = matcher.scan(text.lower())
+        doc_ids.extend([i] * len(hits))
+        kw_ids.extend(hits)
+
+    n = len(texts)
+    doc = np.asarray(doc_ids, dtype=np.intp)
+    kw = np.asarray(kw_ids, dtype=np.intp)
+
+    positive_weight = np.asarray(matcher.positive_weight, dtype=np.int64)
+    negative_weight = np.asarray(matcher.negative_weight, dtype=np.int64)
+    category_mask = np.asarray(matcher.category_mask, dtype=np.uint16)
+
+    pos = np.bincount(doc, weights=positive_weight[kw], minlength=n).astype(np.int64)
+    neg = np.bincount(doc, weights=negative_weight[kw], minlength=n).astype(np.int64)
+    masks = np.zeros(n, dtype=np.uint16)
+    np.bitwise_or.at(masks, doc, category_mask[kw])
+    return pos, neg, masks
+
+
+def classify_reviews_batch(texts):
+    """
+    Classify many review texts with a single keyword scan each.
+    Returns (sentiment int8 array, category uint16 bitmask array).
+    """
+    pos, neg, masks = _match_batch(texts)
+    return np.sign(pos - neg).astype(np.int8), masks
+
+
+def analyze_sentiment_batch(texts):
+    """
+    Batch version of analyze_sentiment.
+    Returns an int8 array: 1 positive, -1 negative, 0 neutral (see SENTIMENT_CODES).
+    """
+    return classify_reviews_batch(texts)[0]
+
+
+def categorize_reviews_batch(texts):
+    """
+    Batch version of categorize_review.
+    Returns a uint16 array; bit i is set when the review matches the i-th
+    INSIGHT_CATEGORIES entry. A zero mask means "uncategorized".
+    """
+    return classify_reviews_batch(texts)[1]
+
+
+# ============================================================================
+# CLASSIFICATION CACHE
+# ============================================================================
 
-    # Initialize counters
-    category_counts = Counter()
-    category_sentiment = defaultdict(lambda: {"positive": 0, "negative": 0, "neutral": 0})
-    category_reviews = defaultdict(list)
-    sentiment_counts = Counter()
-    rating_distribution = Counter()
+# Bump when the matching semantics change so cached results are discarded
+CLASSIFIER_VERSION = 1
+
+# SQLite host-parameter limit is 999 on older builds
+_CACHE_LOOKUP_BATCH = 500
+
+
+def taxonomy_fingerprint():
+    """
+    Short hash of SENTIMENT_KEYWORDS and INSIGHT_CATEGORIES keywords.
+    Category order is included because it defines the mask bits.
+    """
+    taxonomy = {
+        "version": CLASSIFIER_VERSION,
+        "sentiment": SENTIMENT_KEYWORDS,
+        "categories": [[cat_id, info["keywords"]] for cat_id, info in INSIGHT_CATEGORIES.items()],
+    }
+    payload = json.dumps(taxonomy, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def review_content_hash(text):
+    """Hash of the exact text that gets classified (title + content)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ClassificationCache:
+    """
+    On-disk cache of per-review classification results.
+
+    Maps (review id, content hash, taxonomy fingerprint) to
+    (sentiment code, category mask). One row is kept per review id; a row
+    only counts as a hit when both the content hash and the fingerprint
+    match, so edited reviews and edited keyword tables are reclassified
+    automatically. Rows from an older taxonomy are pruned on open.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fingerprint = taxonomy_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS classifications ("
+            " review_id TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " taxonomy TEXT NOT NULL,"
+            " sentiment INTEGER NOT NULL,"
+            " category_mask INTEGER NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM classifications WHERE taxonomy != ?", (self.fingerprint,))
+        self._conn.commit()
+
+    def lookup(self, review_ids, content_hashes):
+        """
+        Return {position: (sentiment, mask)} for every review whose cached
+        row matches its id, content hash and the current taxonomy.
+        """
+        wanted = {}
+        for pos, (review_id, content_hash) in enumerate(zip(review_ids, content_hashes)):
+            if review_id:
+                wanted.setdefault(review_id, []).append((pos, content_hash))
+
+        found = {}
+        ids = list(wanted)
+        for start in range(0, len(ids), _CACHE_LOOKUP_BATCH):
+            batch = ids[start:start + _CACHE_LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                "SELECT review_id, content_hash, sentiment, category_mask FROM classifications"
+                f" WHERE taxonomy = ? AND review_id IN ({placeholders})",
+                [self.fingerprint] + batch,
+            )
+            for review_id, content_hash, sentiment, mask in rows:
+                for pos, wanted_hash in wanted[review_id]:
+                    if wanted_hash == content_hash:
+                        found[pos] = (sentiment, mask)
+
+        self.hits += len(found)
+        self.misses += len(review_ids) - len(found)
+        return found
+
+    def store(self, rows):
+        """Insert or replace (review_id, content_hash, sentiment, mask) rows"""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO classifications"
+            " (review_id, content_hash, taxonomy, sentiment, category_mask)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [(review_id, content_hash, self.fingerprint, int(sentiment), int(mask))
+             for review_id, content_hash, sentiment, mask in rows if review_id],
+        )
+        self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def classify_reviews_cached(review_ids, texts, cache=None):
+    """
+    classify_reviews_batch that consults a ClassificationCache first.
+    Only reviews without a valid cached row are classified; their results
+    are written back to the cache.
+    """
+    if cache is None:
+        return classify_reviews_batch(texts)
+
+    hashes = [review_content_hash(text) for text in texts]
+    found = cache.lookup(review_ids, hashes)
+
+    sentiments = np.zeros(len(texts), dtype=np.int8)
+    masks = np.zeros(len(texts), dtype=np.uint16)
+    for pos, (sentiment, mask) in found.items():
+        sentiments[pos] = sentiment
+        masks[pos] = mask
+
+    missing = [pos for pos in range(len(texts)) if pos not in found]
+    if missing:
+        new_sentiments, new_masks = classify_reviews_batch([texts[pos] for pos in missing])
+        sentiments[missing] = new_sentiments
+        masks[missing] = new_masks
+        cache.store((review_ids[pos], hashes[pos], new_sentiments[i], new_masks[i])
+                    for i, pos in enumerate(missing))
+
+    return sentiments, masks
+
+
+class SharedClassifications:
+    """
+    In-memory classification results shared by every dataset in one run.
+
+    enrich() classifies the union of several review lists once, keyed by the
+    hash of the classified text, so overlapping datasets (US, AllCountries,
+    Last500 and the Combined files) never rescan the same review. Pass it as
+    `cache=` to analyze_reviews to aggregate a dataset from those results.
+    Misses fall through to an optional on-disk ClassificationCache.
+    """
+
+    def __init__(self, backing=None):
+        self.backing = backing
+        self.path = backing.path if backing is not None else None
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+
+    def enrich(self, review_lists, workers=1):
+        """
+        Classify every distinct review across review_lists once.
+        review_lists may be lists or streams (e.g. iter_reviews); texts are
+        classified in chunks so memory holds one chunk plus the result map.
+        Returns the number of distinct reviews seen.
+        """
+        flush_size = ANALYSIS_CHUNK_SIZE * max(1, workers or 1)
+        pending = ([], [], [])
+        seen = set()
+        for reviews in review_lists:
+            for review in reviews:
+                title, content = extract_review_text(review)
+                text = f"{title} {content}"
+                content_hash = review_content_hash(text)
+                if content_hash in seen:
+                    continue
+                seen.add(content_hash)
+                if content_hash in self.results:
+                    continue
+                pending[0].append(str(review.get("id", "") or ""))
+                pending[1].append(content_hash)
+                pending[2].append(text)
+                if len(pending[2]) >= flush_size:
+                    self._classify_pending(*pending, workers=workers)
+                    pending = ([], [], [])
+
+        self._classify_pending(*pending, workers=workers)
+        return len(seen)
+
+    def _classify_pending(self, review_ids, hashes, texts, workers=1):
+        """Resolve a batch of unseen texts from the backing cache or the matcher"""
+        if not texts:
+            return
+        found = self.backing.lookup(review_ids, hashes) if self.backing is not None else {}
+        for pos, result in found.items():
+            self.results[hashes[pos]] = result
+
+        missing = [pos for pos in range(len(texts)) if pos not in found]
+        sentiments, masks = _classify_texts(
+            [texts[pos] for pos in missing], workers)
+        rows = [(review_ids[pos], hashes[pos], sentiments[i], masks[i])
+                for i, pos in enumerate(missing)]
+        self.store(rows)
+
+    def lookup(self, review_ids, content_hashes):
+        """Same contract as ClassificationCache.lookup"""
+        found = {}
+        miss_positions = []
+        for pos, content_hash in enumerate(content_hashes):
+            result = self.results.get(content_hash)
+            if result is not None:
+                found[pos] = result
+            else:
+                miss_positions.append(pos)
+
+        if miss_positions and self.backing is not None:
+            backed = self.backing.lookup([review_ids[pos] for pos in miss_positions],
+                                         [content_hashes[pos] for pos in miss_positions])
+            for i, result in backed.items():
+                pos = miss_positions[i]
+                found[pos] = result
+                self.results[content_hashes[pos]] = result
+
+        self.hits += len(found)
+        self.misses += len(content_hashes) - len(found)
+        return found
+
+    def store(self, rows):
+        """Record (review_id, content_hash, sentiment, mask) rows"""
+        rows = list(rows)
+        for _, content_hash, sentiment, mask in rows:
+            self.results[content_hash] = (int(sentiment), int(mask))
+        if self.backing is not None:
+            self.backing.store(rows)
+
+
+def _classify_texts(texts, workers=1):
+    """classify_reviews_batch, optionally spread over worker processes"""
+    if workers is None or workers <= 1 or len(texts) < 2:
+        return classify_reviews_batch(texts)
+
+    shard_size = -(-len(texts) // workers)
+    shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        parts = list(executor.map(classify_reviews_batch, shards))
+    return (np.concatenate([sentiments for sentiments, _ in parts]),
+            np.concatenate([masks for _, masks in parts]))
+
+
+# ============================================================================
+# COLUMNAR REVIEW CORPUS
+# ============================================================================
+
+# Review fields in scraper output order; presence is tracked per review
+CORPUS_FIELDS = ["id", "author", "rating", "title", "content", "version", "date",
+                 "country", "platform", "vote_count", "vote_sum", "reply_content"]
+CORPUS_TEXT_FIELDS = ["id", "author", "title", "content", "date", "reply_content"]
+CORPUS_CODED_FIELDS = ["platform", "country", "version"]
+CORPUS_INT_FIELDS = ["rating", "vote_count", "vote_sum"]
+CORPUS_FORMAT = 1
+
+# date_epoch value for missing or unparseable dates
+NO_DATE = np.iinfo(np.int64).min
+
+
+def review_epoch(date_str):
+    """
+    UTC epoch seconds for a review date string, or None if it is empty or
+    unparseable. Offsets are honoured; naive timestamps are taken as UTC.
+    """
+    if not date_str:
+        return None
+    try:
+        if 'T' in date_str:
+            review_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        else:
+            review_date = datetime.strptime(date_str[:10], '%Y-%m-%d')
+    except (ValueError, TypeError):
+        return None
+    if review_date.tzinfo is None:
+        review_date = review_date.replace(tzinfo=timezone.utc)
+    return int(review_date.timestamp())
+
+
+def _date_day(date_str):
+    """YYYYMMDD integer for the calendar date a date string starts with, 0 if none"""
+    if date_str and len(date_str) >= 10 and date_str[4] == '-' and date_str[7] == '-':
+        digits = date_str[:4] + date_str[5:7] + date_str[8:10]
+        if digits.isdigit():
+            return int(digits)
+    return 0
+
+
+def save_review_corpus(reviews, directory):
+    """
+    Write reviews as a columnar corpus directory (see ReviewCorpus).
+
+    Reviews are consumed in one pass and classified in one batch, so the
+    stored sentiment and category masks can be reused by later analysis.
+    A legacy "review" key is stored as content. Returns the review count.
+
+    The columns are written to a temporary sibling directory that replaces
+    the old corpus only once complete, so a failed save leaves the previous
+    corpus untouched.
+    """
+    field_bits = {name: 1 << i for i, name in enumerate(CORPUS_FIELDS)}
+
+    texts = {name: [] for name in CORPUS_TEXT_FIELDS}
+    ints = {name: [] for name in CORPUS_INT_FIELDS}
+    codes = {name: [] for name in CORPUS_CODED_FIELDS}
+    dictionaries = {name: {} for name in CORPUS_CODED_FIELDS}
+    present, null, epochs, days, classify_texts = [], [], [], [], []
 
     for review in reviews:
-        # Get review content
-        content = review.get("content", "") or review.get("review", "") or ""
-        title = review.get("title", "") or ""
-        full_text = f"{title} {content}"
-
-        # Get rating
-        rating = int(review.get("rating", 3))
-        rating_distribution[rating] += 1
-
-        # Analyze sentiment
-        sentiment = analyze_sentiment(full_text)
-        sentiment_counts[sentiment] += 1
-
-        # Categorize
-        categories = categorize_review(full_text)
-        for cat in categories:
-            category_counts[cat] += 1
-            category_sentiment[cat][sentiment] += 1
-            if len(category_reviews[cat]) < 5:  # Keep top 5 examples
-                category_reviews[cat].append({
-                    "rating": rating,
-                    "title": title[:50],
-                    "snippet": content[:150],
-                    "sentiment": sentiment
-                })
-
-    return {
-        "total_reviews": len(reviews),
-        "category_counts": category_counts,
-        "category_sentiment": dict(category_sentiment),
-        "category_reviews": dict(category_reviews),
-        "sentiment_counts": sentiment_counts,
-        "rating_distribution": rating_distribution
+        if "content" not in review and "review" in review:
+            review = dict(review, content=review["review"])
+        present_bits = null_bits = 0
+        for name in CORPUS_FIELDS:
+            if name in review:
+                present_bits |= field_bits[name]
+                if review[name] is None:
+                    null_bits |= field_bits[name]
+        present.append(present_bits)
+        null.append(null_bits)
+
+        for name in CORPUS_TEXT_FIELDS:
+            value = review.get(name)
+            texts[name].append(("" if value is None else str(value)).encode("utf-8"))
+        for name in CORPUS_INT_FIELDS:
+            value = review.get(name)
+            ints[name].append(int(value) if value not in (None, "") else 0)
+        for name in CORPUS_CODED_FIELDS:
+            codes[name].append(dictionaries[name].setdefault(review.get(name),
+                                                             len(dictionaries[name])))
+
+        date_str = review.get("date") or ""
+        epoch = review_epoch(date_str)
+        epochs.append(NO_DATE if epoch is None else epoch)
+        days.append(_date_day(date_str))
+
+        title, content = extract_review_text(review)
+        classify_texts.append(f"{title} {content}")
+
+    sentiments, masks = classify_reviews_batch(classify_texts)
+
+    directory = os.path.abspath(directory)
+    parent, base = os.path.split(directory)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{base}.", dir=parent)
+    try:
+        _write_corpus_files(staging, texts, ints, codes, dictionaries, present, null,
+                            epochs, days, sentiments, masks)
+        if os.path.isdir(directory):
+            retired = tempfile.mkdtemp(prefix=f".{base}.old.", dir=parent)
+            os.replace(directory, os.path.join(retired, base))
+            try:
+                os.replace(staging, directory)
+            except BaseException:
+                # Put the previous corpus back rather than leave none
+                os.replace(os.path.join(retired, base), directory)
+                os.rmdir(retired)
+                raise
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, directory)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return len(present)
+
+
+def _write_corpus_files(directory, texts, ints, codes, dictionaries, present, null,
+                        epochs, days, sentiments, masks):
+    """Write the column files of save_review_corpus into directory, meta.json last"""
+
+    def save(name, values, dtype):
+        np.save(os.path.join(directory, f"{name}.npy"), np.asarray(values, dtype=dtype))
+
+    for name in CORPUS_INT_FIELDS:
+        save(name, ints[name], np.int64)
+    for name in CORPUS_CODED_FIELDS:
+        save(f"{name}_code", codes[name], np.int32)
+    for name in CORPUS_TEXT_FIELDS:
+        encoded = texts[name]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        save(f"{name}_text", np.frombuffer(b"".join(encoded), dtype=np.uint8), np.uint8)
+        save(f"{name}_offsets", offsets, np.int64)
+    save("date_epoch", epochs, np.int64)
+    save("date_day", days, np.int32)
+    save("present", present, np.uint16)
+    save("null", null, np.uint16)
+    save("sentiment", sentiments, np.int8)
+    save("category_mask", masks, np.uint16)
+
+    # Metadata last: a corpus without meta.json is incomplete
+    meta = {
+        "format": CORPUS_FORMAT,
+        "count": len(present),
+        "taxonomy": taxonomy_fingerprint(),
+        "dictionaries": {name: list(values) for name, values in dictionaries.items()},
     }
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+class ReviewCorpus:
+    """
+    Columnar review corpus written by save_review_corpus.
+
+    Fixed-width columns are NumPy arrays memory-mapped from .npy files:
+    rating, vote_count, vote_sum (0 when missing), date_epoch (UTC seconds,
+    NO_DATE when missing), date_day (YYYYMMDD as written in the review),
+    platform/country/version dictionary codes, and the sentiment
+    (SENTIMENT_CODES) and category_mask computed at save time. Each text
+    field is one UTF-8 blob plus an offsets array, decoded on demand.
+    """
+
+    def __init__(self, directory, mmap=True):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != CORPUS_FORMAT:
+            raise ValueError(f"Unsupported review corpus format: {meta.get('format')}")
+
+        self.directory = directory
+        self.count = meta["count"]
+        self.taxonomy = meta["taxonomy"]
+        self.dictionaries = meta["dictionaries"]
+
+        mmap_mode = "r" if mmap else None
+
+        def load(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        self.rating = load("rating")
+        self.vote_count = load("vote_count")
+        self.vote_sum = load("vote_sum")
+        self.date_epoch = load("date_epoch")
+        self.date_day = load("date_day")
+        self.sentiment = load("sentiment")
+        self.category_mask = load("category_mask")
+        self.present = load("present")
+        self.null = load("null")
+        self.codes = {name: load(f"{name}_code") for name in CORPUS_CODED_FIELDS}
+        self._text = {name: (load(f"{name}_text"), load(f"{name}_offsets"))
+                      for name in CORPUS_TEXT_FIELDS}
+
+    def __len__(self):
+        return self.count
+
+    def text(self, name):
+        """Decode one text column into a list of strings"""
+        blob, offsets = self._text[name]
+        raw = blob.tobytes()
+        bounds = offsets.tolist()
+        return [raw[start:stop].decode("utf-8") for start, stop in zip(bounds, bounds[1:])]
+
+    def values(self, name):
+        """Expand one dictionary-coded column into a list of values"""
+        dictionary = self.dictionaries[name]
+        return [dictionary[code] for code in self.codes[name].tolist()]
+
+    def has(self, name):
+        """Boolean array: reviews where the field is present and not None"""
+        bit = 1 << CORPUS_FIELDS.index(name)
+        return ((self.present & bit) != 0) & ((self.null & bit) == 0)
+
+    def classified(self):
+        """(sentiments, masks) stored at save time, or None if the taxonomy changed"""
+        if self.taxonomy != taxonomy_fingerprint():
+            return None
+        return np.asarray(self.sentiment), np.asarray(self.category_mask)
+
+    def review_columns(self):
+        """Columns in the load_review_columns shape, for ReviewAnalysisAccumulator"""
+        ratings = np.where(self.has("rating"), self.rating, 3).astype(np.int64)
+        return {
+            "id": self.text("id"),
+            "title": self.text("title"),
+            "content": self.text("content"),
+            "rating": ratings,
+            "date": self.text("date"),
+            "version": [v or "" for v in self.values("version")],
+            "platform": [v or "" for v in self.values("platform")],
+            "country": [v or "" for v in self.values("country")],
+        }
+
+    def __iter__(self):
+        """Yield the reviews as dicts, with the fields each one was saved with"""
+        columns = {name: self.text(name) for name in CORPUS_TEXT_FIELDS}
+        columns.update({name: self.values(name) for name in CORPUS_CODED_FIELDS})
+        columns.update({name: getattr(self, name).tolist() for name in CORPUS_INT_FIELDS})
+        present = self.present.tolist()
+        null = self.null.tolist()
+        for i in range(self.count):
+            review = {}
+            for bit, name in enumerate(CORPUS_FIELDS):
+                if present[i] >> bit & 1:
+                    review[name] = None if null[i] >> bit & 1 else columns[name][i]
+            yield review
+
+
+def load_review_corpus(directory, mmap=True):
+    """Open a corpus directory written by save_review_corpus"""
+    return ReviewCorpus(directory, mmap=mmap)
+
+
+# ============================================================================
+# REVIEW RECORDS
+# ============================================================================
+
+# Low-cardinality fields whose strings are interned (one object per value)
+INTERNED_FIELDS = ("platform", "country", "version")
+
+_REVIEW_FIELD_SET = frozenset(CORPUS_FIELDS)
+
+# Shared key layouts: reviews with the same fields share one tuple
+_KEY_LAYOUTS = {}
+
+# Review._epoch before the date has been parsed
+_EPOCH_UNSET = object()
+
+
+class Review:
+    """
+    Compact review record used in place of a per-review dict.
+
+    Known fields (CORPUS_FIELDS) live in slots and read as None when the
+    review does not have them; platform, country and version strings are
+    interned. The review's key layout is kept as a tuple shared by every
+    review with the same fields, so to_dict() gives back the original dict,
+    key order included. Unknown keys go to a small side dict. The date is
+    parsed to UTC epoch seconds at most once (date_epoch).
+
+    get(), [], `in` and == behave as they do on the dict, so code written
+    against review dicts accepts Review unchanged.
+    """
+
+    __slots__ = tuple(CORPUS_FIELDS) + ("_keys", "_extra", "_epoch")
+
+    def __init__(self, data=None):
+        data = data or {}
+        self._assign(tuple(data), data.values())
+
+    @classmethod
+    def from_dict(cls, data):
+        """Convert a review dict (loader boundary)"""
+        review = cls.__new__(cls)
+        review._assign(tuple(data), data.values())
+        return review
+
+    @classmethod
+    def from_fields(cls, keys, values, date_epoch=_EPOCH_UNSET):
+        """
+        Build a review from a key layout and matching values, without a
+        dict. Pass date_epoch when it is already known (e.g. stored).
+        """
+        review = cls.__new__(cls)
+        review._assign(tuple(keys), values)
+        review._epoch = date_epoch
+        return review
+
+    def _assign(self, keys, values):
+        for name in CORPUS_FIELDS:
+            setattr(self, name, None)
+        self._keys = _KEY_LAYOUTS.setdefault(keys, keys)
+        self._extra = None
+        self._epoch = _EPOCH_UNSET
+        for name, value in zip(keys, values):
+            self._set(name, value)
+
+    def _set(self, name, value):
+        if name in _REVIEW_FIELD_SET:
+            if name in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            elif name == "date":
+                self._epoch = _EPOCH_UNSET
+            setattr(self, name, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[name] = value
+
+    def to_dict(self):
+        """Convert back to a review dict (saver boundary)"""
+        return {name: self[name] for name in self._keys}
+
+    @property
+    def date_epoch(self):
+        """UTC epoch seconds of the date (see review_epoch), parsed once"""
+        if self._epoch is _EPOCH_UNSET:
+            self._epoch = review_epoch(self.date)
+        return self._epoch
+
+    def text(self):
+        """(title, content) as extract_review_text returns them"""
+        content = self.content or (self._extra.get("review") if self._extra else None) or ""
+        return self.title or "", content
+
+    def keys(self):
+        return self._keys
+
+    def get(self, name, default=None):
+        if name not in self._keys:
+            return default
+        if name in _REVIEW_FIELD_SET:
+            return getattr(self, name)
+        return self._extra[name]
+
+    def __getitem__(self, name):
+        if name not in self._keys:
+            raise KeyError(name)
+        return self.get(name)
+
+    def __setitem__(self, name, value):
+        if name not in self._keys:
+            keys = self._keys + (name,)
+            self._keys = _KEY_LAYOUTS.setdefault(keys, keys)
+        self._set(name, value)
+
+    def __contains__(self, name):
+        return name in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __eq__(self, other):
+        if isinstance(other, Review):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self._keys, [self[name] for name in self._keys]
+
+    def __setstate__(self, state):
+        self._assign(*state)
+
+    def __repr__(self):
+        return f"Review({self.to_dict()!r})"
+
+
+def review_date_epoch(review):
+    """UTC epoch seconds for a review dict or Review, None if undated/unparseable"""
+    if type(review) is Review:
+        return review.date_epoch
+    return review_epoch(review.get("date"))
+
+
+def review_sort_key(review):
+    """Newest-first sort key: UTC epoch seconds, undated or unparseable reviews last"""
+    epoch = review_date_epoch(review)
+    return epoch if epoch is not None else float("-inf")
+
+
+# ============================================================================
+# NEAR-DUPLICATE DETECTION (MinHash + LSH)
+# ============================================================================
+
+# Estimated Jaccard similarity at which two reviews are near-duplicates
+NEAR_DUP_THRESHOLD = 0.8
+
+# Shorter reviews ("Love it", "Great app") are never clustered
+NEAR_DUP_MIN_WORDS = 6
+
+# Character shingle length (bytes of normalized UTF-8 text)
+SHINGLE_SIZE = 5
+
+# 32 bands x 4 rows: pairs at the threshold become candidates almost surely
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+
+# Fixed seed so cluster assignments are the same in every process and run
+MINHASH_SEED = 20260116
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_review_text(text):
+    """Lowercase, drop punctuation and collapse whitespace for similarity checks"""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash + LSH index that assigns each review to a
+    near-duplicate cluster in roughly linear time.
+
+    Each text is normalized, shingled into character n-grams and reduced to
+    a MinHash signature. The signature is split into LSH bands; reviews
+    sharing any band bucket with a cluster representative are candidates,
+    and join the earliest representative whose estimated similarity is at
+    least threshold. Buckets hold representatives only, so large clusters
+    of copies cost one comparison per new copy.
+
+    add() returns the cluster id: the position of the cluster's first
+    review, or the review's own position if it starts a new cluster.
+    """
+
+    def __init__(self, threshold=NEAR_DUP_THRESHOLD, min_words=NEAR_DUP_MIN_WORDS,
+                 num_perm=MINHASH_PERMUTATIONS, bands=LSH_BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.min_words = min_words
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(MINHASH_SEED)
+        self._mul = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._add = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self.count = 0
+        self.duplicates = 0
+
+    def signature(self, text):
+        """MinHash signature (uint32 array) of a text, or None if too short"""
+        normalized = normalize_review_text(text)
+        if len(normalized.split()) < self.min_words:
+            return None
+        data = np.frombuffer(normalized.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        width = len(data) - SHINGLE_SIZE + 1
+        # Polynomial hash of every shingle at once (wraps mod 2**64)
+        shingles = np.zeros(width, dtype=np.uint64)
+        for offset in range(SHINGLE_SIZE):
+            shingles = shingles * np.uint64(1099511628211) + data[offset:offset + width]
+        shingles = np.unique(shingles)
+        # Multiply-shift hash family, one row per permutation
+        hashed = (self._mul[:, None] * shingles[None, :] + self._add[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def add(self, text):
+        """Index one review text and return its cluster id"""
+        position = self.count
+        self.count += 1
+        signature = self.signature(text)
+        if signature is None:
+            return position
+
+        keys = [signature[band * self.rows:(band + 1) * self.rows].tobytes()
+                for band in range(self.bands)]
+        candidates = set()
+        for bucket, key in zip(self._buckets, keys):
+            candidates.update(bucket.get(key, ()))
+
+        cluster = position
+        for rep in sorted(candidates):
+            if np.mean(self._signatures[rep] == signature) >= self.threshold:
+                cluster = rep
+                break
+
+        if cluster == position:
+            self._signatures[position] = signature
+        else:
+            self.duplicates += 1
+        for bucket, key in zip(self._buckets, keys):
+            reps = bucket.setdefault(key, [])
+            if cluster not in reps:
+                reps.append(cluster)
+        return cluster
+
+
+def find_near_duplicates(texts, threshold=NEAR_DUP_THRESHOLD, min_words=NEAR_DUP_MIN_WORDS):
+    """
+    Cluster ids for a sequence of review texts (see NearDuplicateIndex).
+    Review i is a near-duplicate of an earlier review when ids[i] != i.
+    """
+    index = NearDuplicateIndex(threshold=threshold, min_words=min_words)
+    return [index.add(text) for text in texts]
+
+
+def iter_distinct_reviews(reviews, index=None):
+    """
+    Yield only the first review of each near-duplicate cluster.
+    index.duplicates counts the reviews dropped.
+    """
+    if index is None:
+        index = NearDuplicateIndex()
+    for review in reviews:
+        position = index.count
+        title, content = extract_review_text(review)
+        if index.add(f"{title} {content}") == position:
+            yield review
+
+
+# ============================================================================
+# STREAMING ANALYSIS
+# ============================================================================
+
+# Sample reviews kept per category in the analysis output
+MAX_CATEGORY_SAMPLES = 5
+
+# Reviews classified per NumPy batch when streaming
+ANALYSIS_CHUNK_SIZE = 2048
+
+
+class ReviewAnalysisAccumulator:
+    """
+    Mergeable, constant-memory version of analyze_reviews.
+
+    update() consumes any iterable of reviews in fixed-size chunks, so only
+    one chunk is held at a time. merge() folds in a partial result from
+    another accumulator (e.g. another shard or day); merging partials in
+    input order gives exactly the result of one sequential pass, including
+    sample selection and Counter ordering. result() returns the same dict
+    as analyze_reviews.
+
+    Pass a NearDuplicateIndex as near_duplicates to count each
+    near-duplicate cluster once; result() then also reports how many
+    reviews were collapsed.
+    """
+
+    def __init__(self, chunk_size=ANALYSIS_CHUNK_SIZE, cache=None, near_duplicates=None):
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.near_duplicates = near_duplicates
+        self.total_reviews = 0
+        self.category_counts = Counter()
+        self.category_sentiment = {}
+        self.category_reviews = {}
+        self.sentiment_counts = Counter()
+        self.rating_distribution = Counter()
+
+    def update(self, reviews):
+        """Consume reviews from any iterable. Returns self."""
+        iterator = iter(reviews)
+        if self.near_duplicates is not None:
+            iterator = iter_distinct_reviews(iterator, self.near_duplicates)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                break
+            self.merge(self._analyze_chunk(chunk, self.cache))
+        return self
+
+    def update_columns(self, columns, classified=None):
+        """
+        Consume reviews already in columnar form (see load_review_columns),
+        without building a dict per review. classified is an optional
+        (sentiments, masks) pair of arrays that skips classification.
+        Returns self.
+        """
+        count = len(columns["rating"])
+        for start in range(0, count, self.chunk_size):
+            stop = start + self.chunk_size
+            review_ids = columns["id"][start:stop]
+            titles = columns["title"][start:stop]
+            contents = columns["content"][start:stop]
+            ratings = columns["rating"][start:stop]
+            texts = [f"{title} {content}" for title, content in zip(titles, contents)]
+            chunk_classified = None
+            if classified is not None:
+                chunk_classified = (classified[0][start:stop], classified[1][start:stop])
+            if self.near_duplicates is not None:
+                keep = self._cluster_heads(texts)
+                if len(keep) < len(texts):
+                    review_ids, titles, contents, texts = (
+                        [values[i] for i in keep]
+                        for values in (review_ids, titles, contents, texts))
+                    ratings = np.asarray(ratings)[keep]
+                    if chunk_classified is not None:
+                        chunk_classified = tuple(np.asarray(values)[keep]
+                                                 for values in chunk_classified)
+            self.merge(self._analyze_columns(review_ids, titles, contents, texts, ratings,
+                                             self.cache, chunk_classified))
+        return self
+
+    def _cluster_heads(self, texts):
+        """Positions within texts that start a new near-duplicate cluster"""
+        index = self.near_duplicates
+        keep = []
+        for i, text in enumerate(texts):
+            position = index.count
+            if index.add(text) == position:
+                keep.append(i)
+        return keep
+
+    def update_corpus(self, corpus):
+        """
+        Consume a ReviewCorpus, reusing its stored classifications when the
+        taxonomy has not changed since it was saved. Returns self.
+        """
+        return self.update_columns(corpus.review_columns(), corpus.classified())
+
+    def merge(self, other):
+        """Fold another accumulator's partial result into this one. Returns self."""
+        self.total_reviews += other.total_reviews
+        self.rating_distribution.update(other.rating_distribution)
+        self.sentiment_counts.update(other.sentiment_counts)
+        self.category_counts.update(other.category_counts)
+
+        for cat, sentiment in other.category_sentiment.items():
+            totals = self.category_sentiment.setdefault(
+                cat, {"positive": 0, "negative": 0, "neutral": 0})
+            for label, count in sentiment.items():
+                totals[label] += count
+
+        for cat, samples in other.category_reviews.items():
+            kept = self.category_reviews.setdefault(cat, [])
+            kept.extend(samples[:MAX_CATEGORY_SAMPLES - len(kept)])
+
+        return self
+
+    def result(self):
+        """Return the analysis dict (same shape as analyze_reviews)"""
+        result = {
+            "total_reviews": self.total_reviews,
+            "category_counts": Counter(self.category_counts),
+            "category_sentiment": {cat: dict(sent) for cat, sent in self.category_sentiment.items()},
+            "category_reviews": {cat: list(samples) for cat, samples in self.category_reviews.items()},
+            "sentiment_counts": Counter(self.sentiment_counts),
+            "rating_distribution": Counter(self.rating_distribution)
+        }
+        if self.near_duplicates is not None:
+            result["near_duplicates_collapsed"] = self.near_duplicates.duplicates
+        return result
+
+    @classmethod
+    def _analyze_chunk(cls, reviews, cache=None):
+        """Classify one in-memory chunk of reviews (dicts or Review) with array reductions"""
+        # Extract text and ratings once
+        review_ids = []
+        titles = []
+        contents = []
+        texts = []
+        ratings = []
+        for review in reviews:
+            if type(review) is Review:
+                # Slot access; a missing rating reads as None
+                title, content = review.text()
+                review_ids.append(str(review.id or ""))
+                rating = review.rating
+                ratings.append(3 if rating is None else int(rating))
+            else:
+                # Get review content
+                title, content = extract_review_text(review)
+                review_ids.append(str(review.get("id", "") or ""))
+
+                # Get rating
+                ratings.append(int(review.get("rating", 3)))
+            titles.append(title)
+            contents.append(content)
+            texts.append(f"{title} {content}")
+
+        return cls._analyze_columns(review_ids, titles, contents, texts, ratings, cache)
+
+    @classmethod
+    def _analyze_columns(cls, review_ids, titles, contents, texts, ratings, cache=None,
+                         classified=None):
+        """Aggregate one chunk given as parallel column lists"""
+        partial = cls()
+        partial.total_reviews = len(texts)
+        if not texts:
+            return partial
+
+        # Classify the whole batch (cached reviews are not rescanned)
+        if classified is None:
+            sentiments, masks = classify_reviews_cached(review_ids, texts, cache)
+        else:
+            sentiments = np.asarray(classified[0], dtype=np.int8)
+            masks = np.asarray(classified[1], dtype=np.uint16)
+        ratings = np.asarray(ratings, dtype=np.int64)
+
+        # Rating distribution
+        values, first, counts = np.unique(ratings, return_index=True, return_counts=True)
+        for i in np.argsort(first, kind="stable"):
+            partial.rating_distribution[int(values[i])] = int(counts[i])
+
+        # Sentiment counts
+        values, first, counts = np.unique(sentiments, return_index=True, return_counts=True)
+        for i in np.argsort(first, kind="stable"):
+            partial.sentiment_counts[SENTIMENT_LABELS[int(values[i])]] = int(counts[i])
+
+        # Category membership matrix: one column per category, plus uncategorized
+        cat_ids = get_keyword_matcher().category_ids + ["uncategorized"]
+        bits = np.arange(len(cat_ids) - 1, dtype=np.uint16)
+        member = np.empty((len(texts), len(cat_ids)), dtype=bool)
+        member[:, :-1] = (masks[:, None] >> bits) & 1
+        member[:, -1] = masks == 0
+
+        cat_totals = member.sum(axis=0)
+        cat_first = member.argmax(axis=0)
+
+        # Per-category sentiment via one-hot matmul: columns positive/negative/neutral
+        sentiment_onehot = np.stack([sentiments == SENTIMENT_CODES[label]
+                                     for label in ("positive", "negative", "neutral")], axis=1)
+        cat_sentiment = member.T.astype(np.int64) @ sentiment_onehot.astype(np.int64)
+
+        # Insert categories in first-seen order so most_common() ties break as before
+        present = [c for c in range(len(cat_ids)) if cat_totals[c] > 0]
+        present.sort(key=lambda c: cat_first[c])
+
+        for c in present:
+            cat = cat_ids[c]
+            partial.category_counts[cat] = int(cat_totals[c])
+            partial.category_sentiment[cat] = {
+                "positive": int(cat_sentiment[c, 0]),
+                "negative": int(cat_sentiment[c, 1]),
+                "neutral": int(cat_sentiment[c, 2]),
+            }
+            partial.category_reviews[cat] = [{
+                "rating": int(ratings[i]),
+                "title": titles[i][:50],
+                "snippet": contents[i][:150],
+                "sentiment": SENTIMENT_LABELS[int(sentiments[i])]
+            } for i in np.flatnonzero(member[:, c])[:MAX_CATEGORY_SAMPLES]]
+
+        return partial
+
+
+def _analyze_shard(reviews, cache_path=None):
+    """
+    Worker entry point: analyze one contiguous shard of reviews.
+    Returns (partial accumulator, cache hits, cache misses).
+    """
+    if cache_path is None:
+        return ReviewAnalysisAccumulator().update(reviews), 0, 0
+
+    with ClassificationCache(cache_path) as cache:
+        partial = ReviewAnalysisAccumulator(cache=cache).update(reviews)
+    partial.cache = None
+    return partial, cache.hits, cache.misses
+
+
+def analyze_reviews(reviews, workers=1, cache=None, collapse_near_duplicates=False):
+    """
+    Main analysis function
+
+    With workers > 1 the reviews are split into contiguous shards that are
+    classified in a ProcessPoolExecutor. Shard partials are merged in input
+    order, so the result (including category samples) is identical to the
+    single-process run.
+
+    Pass a ClassificationCache to skip reviews classified in earlier runs.
+
+    With collapse_near_duplicates=True, copy-pasted reviews (see
+    NearDuplicateIndex) are counted once, and the result gains a
+    "near_duplicates_collapsed" count.
+    """
+    index = NearDuplicateIndex() if collapse_near_duplicates else None
+    if workers is None or workers <= 1:
+        return ReviewAnalysisAccumulator(cache=cache, near_duplicates=index).update(reviews).result()
+
+    # Clusters span shards, so collapse in the parent before splitting
+    if index is not None:
+        reviews = iter_distinct_reviews(reviews, index)
+    reviews = list(reviews)
+    shard_size = max(1, -(-len(reviews) // workers))
+    shards = [reviews[i:i + shard_size] for i in range(0, len(reviews), shard_size)]
+    total = ReviewAnalysisAccumulator(cache=cache)
+    if len(shards) <= 1:
+        total.update(reviews)
+        total.near_duplicates = index
+        return total.result()
+
+    # Each worker opens its own connection; SQLite serializes the writes
+    cache_paths = [cache.path if cache is not None else None] * len(shards)
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        for partial, hits, misses in executor.map(_analyze_shard, shards, cache_paths):
+            total.merge(partial)
+            if cache is not None:
+                cache.hits += hits
+                cache.misses += misses
+    total.near_duplicates = index
+    return total.result()
+
+
+def analyze_review_file(filepath, workers=1, cache=None, collapse_near_duplicates=False):
+    """
+    Analyze a reviews file without materializing it as a list of dicts.
+    CSV files go through the columnar loader; JSON files are streamed; a
+    corpus directory (save_review_corpus) is memory-mapped and its stored
+    classifications are reused.
+    """
+    index = NearDuplicateIndex() if collapse_near_duplicates else None
+    if os.path.isdir(filepath):
+        corpus = load_review_corpus(filepath)
+        return ReviewAnalysisAccumulator(cache=cache, near_duplicates=index) \
+            .update_corpus(corpus).result()
+    if filepath.endswith('.csv') and (workers is None or workers <= 1):
+        columns = load_review_columns(filepath)
+        return ReviewAnalysisAccumulator(cache=cache, near_duplicates=index) \
+            .update_columns(columns).result()
+    return analyze_reviews(iter_reviews(filepath), workers=workers, cache=cache,
+                           collapse_near_duplicates=collapse_near_duplicates)
 
 
 def generate_pm_insights_report(analysis):
@@ -483,7 +1904,7 @@ def save_insights_json(analysis, filepath="pm_insights.json"):
 
 def main():
     """Main entry point"""
-    import sys
+    import argparse
     import os
 
     # Get the directory where this script is located
@@ -492,31 +1913,36 @@ def main():
     # Default file path - look in same directory as script
     default_file = os.path.join(script_dir, "brother_print_reviews.json")
 
-    # Check for command line argument
-    if len(sys.argv) > 1:
-        review_file = sys.argv[1]
-    else:
-        review_file = default_file
+    parser = argparse.ArgumentParser(description="CustomerInsight Review Agent")
+    parser.add_argument("review_file", nargs="?", default=default_file,
+                        help="Reviews file (.json or .csv) or review corpus directory")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for classification (default: 1)")
+    parser.add_argument("--collapse-near-duplicates", action="store_true",
+                        help="Count each cluster of near-duplicate reviews once")
+    args = parser.parse_args()
+    review_file = args.review_file
 
     print(f"\nLoading reviews from: {review_file}")
 
+    # Analyze while streaming the file
+    print("Analyzing reviews...")
     try:
-        reviews = load_reviews(review_file)
-        print(f"Loaded {len(reviews)} reviews")
+        analysis = analyze_review_file(review_file, workers=args.workers,
+                                       collapse_near_duplicates=args.collapse_near_duplicates)
     except FileNotFoundError:
         print(f"Error: File not found: {review_file}")
         print("\nPlease run app_store_scraper.py first to collect reviews.")
         print("Usage: python pm_insights_agent.py [reviews_file.json]")
         return
+    print(f"Analyzed {analysis['total_reviews']} reviews")
+    if analysis.get("near_duplicates_collapsed"):
+        print(f"Collapsed {analysis['near_duplicates_collapsed']} near-duplicate reviews")
 
-    if not reviews:
+    if not analysis["total_reviews"]:
         print("No reviews found in file.")
         return
 
-    # Analyze
-    print("Analyzing reviews...")
-    analysis = analyze_reviews(reviews)
-
     # Generate report
     generate_pm_insights_report(analysis)
 
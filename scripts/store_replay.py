@@ -0,0 +1,309 @@
+"""
+================================================================================
+Store Replay - Offline Record/Replay of Store Traffic
+================================================================================
+
+Test harness for the weekly scraper, imported only for --record and
+--replay:
+
+- StoreFixtures: a directory of recorded iTunes responses and pickled
+  google_play_scraper results
+- StoreStandIn: a local HTTP server replaying them, with injected latency
+  and errors
+- install_recorder / install_stand_in: point a StoreClient (and
+  google_play_scraper) at the recorder or the stand-in
+
+The scraper's record_store_traffic and replay_store_traffic set these up
+and keep its own state (HTTP cache switch, state directory) in step.
+
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import random
+import sys
+import threading
+import time
+import types
+import requests
+from requests.adapters import HTTPAdapter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Response headers kept in HTTP fixtures (bodies are stored decoded)
+_FIXTURE_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+class StoreFixtures:
+    """
+    Directory of recorded store traffic.
+
+    http/<key>.json holds one iTunes response, keyed by the scraper's
+    ResponseCache.key (URL plus storefront headers). play/<key>.pkl holds the pickled result
+    of one google_play_scraper call, keyed by its arguments.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        for kind in ("http", "play"):
+            os.makedirs(os.path.join(directory, kind), exist_ok=True)
+
+    def _path(self, kind, key):
+        return os.path.join(self.directory, kind, f"{key}.{'json' if kind == 'http' else 'pkl'}")
+
+    def _write(self, path, data):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def save_http(self, key, url, resp):
+        entry = {
+            "url": url,
+            "status": resp.status_code,
+            "headers": {name: resp.headers[name] for name in _FIXTURE_HEADERS
+                        if name in resp.headers},
+            "body": resp.content.decode("utf-8", errors="replace"),
+        }
+        self._write(self._path("http", key), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def load_http(self, key):
+        path = self._path("http", key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_call(self, key, result):
+        self._write(self._path("play", key), pickle.dumps(result))
+
+    def load_call(self, key):
+        """Pickled bytes of a recorded call, or None"""
+        path = self._path("play", key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class ReplayToken:
+    """Play continuation token that also records its position in the review chain"""
+
+    def __init__(self, seq, real=None):
+        self.seq = seq
+        self.real = real
+
+
+def play_call_key(name, *args):
+    """Fixture key for a google_play_scraper call"""
+    parts = [name] + [str(getattr(arg, "value", arg)) for arg in args]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class _RecordingAdapter(HTTPAdapter):
+    """Transport adapter that saves every response it receives as a fixture"""
+
+    def __init__(self, fixtures, key, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+        self.key = key
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        self.fixtures.save_http(self.key(request.url, request.headers), request.url, resp)
+        return resp
+
+
+class _StandInAdapter(HTTPAdapter):
+    """Transport adapter that sends requests to the replay stand-in instead of the store"""
+
+    def __init__(self, base_url, key, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+        self.key = key
+
+    def send(self, request, **kwargs):
+        url = request.url
+        request.url = f"{self.base_url}/http/{self.key(url, request.headers)}"
+        resp = super().send(request, **kwargs)
+        resp.url = url
+        return resp
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        standin = self.server.standin
+        error = standin.next_fault()
+        if error is not None:
+            self._reply(error, {"Retry-After": standin.retry_after} if standin.retry_after else {},
+                        b"")
+            return
+
+        kind, _, key = self.path.strip("/").partition("/")
+        if kind == "http":
+            entry = standin.fixtures.load_http(key)
+            if entry is not None:
+                self._reply(entry["status"], entry["headers"], entry["body"].encode("utf-8"))
+                return
+        elif kind == "play":
+            data = standin.fixtures.load_call(key)
+            if data is not None:
+                self._reply(200, {"Content-Type": "application/octet-stream"}, data)
+                return
+        standin.missing += 1
+        self._reply(404, {}, b"")
+
+    def _reply(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StoreStandIn:
+    """
+    Local HTTP server that replays recorded store traffic.
+
+    Every request waits latency seconds (plus up to jitter) and fails with
+    error_status at error_rate, with an optional Retry-After header, so
+    concurrency, caching and rate limiting can be benchmarked repeatably
+    without a network. Faults are drawn from a seeded generator.
+    """
+
+    def __init__(self, fixture_dir, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 retry_after=None, seed=0):
+        self.fixtures = StoreFixtures(fixture_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = None if retry_after is None else str(retry_after)
+        self.requests = 0
+        self.errors = 0
+        self.missing = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    def next_fault(self):
+        """Sleep for the simulated latency; return an error status to inject, or None"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        time.sleep(delay)
+        return self.error_status if fail else None
+
+    def start(self):
+        """Start serving on a free localhost port. Returns the base URL."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _adapter_options(client):
+    return {"pool_connections": 4, "pool_maxsize": client.pool_size, "max_retries": 0}
+
+
+def install_recorder(client, fixtures, key):
+    """
+    Mount an adapter on client that records every iTunes response into
+    fixtures (keyed with key(url, headers)) and wrap google_play_scraper.
+    Returns False if google_play_scraper is missing.
+    """
+    client.cache = None
+    client.session.mount("https://itunes.apple.com",
+                         _RecordingAdapter(fixtures, key, **_adapter_options(client)))
+
+    try:
+        import google_play_scraper as real
+    except ImportError:
+        return False
+
+    def reviews(app_id, lang="en", country="us", sort=real.Sort.NEWEST, count=100,
+                continuation_token=None, **kwargs):
+        seq = continuation_token.seq if isinstance(continuation_token, ReplayToken) else 0
+        if isinstance(continuation_token, ReplayToken):
+            continuation_token = continuation_token.real
+        result, token = real.reviews(app_id, lang=lang, country=country, sort=sort, count=count,
+                                     continuation_token=continuation_token, **kwargs)
+        recorded = ReplayToken(seq + 1) if token is not None else None
+        fixtures.save_call(play_call_key("reviews", app_id, lang, country, sort, count, seq),
+                           (result, recorded))
+        return result, ReplayToken(seq + 1, token) if token is not None else None
+
+    def app(app_id, lang="en", country="us"):
+        result = real.app(app_id, lang=lang, country=country)
+        fixtures.save_call(play_call_key("app", app_id, lang, country), result)
+        return result
+
+    module = types.ModuleType("google_play_scraper")
+    module.reviews, module.app, module.Sort = reviews, app, real.Sort
+    sys.modules["google_play_scraper"] = module
+    return True
+
+
+def install_stand_in(client, base_url, key, timeout):
+    """
+    Send client's iTunes requests to the stand-in at base_url (fixture
+    keys from key(url, headers)) and replace google_play_scraper with a
+    module answering from it.
+    """
+    client.cache = None
+    client.session.mount("https://itunes.apple.com",
+                         _StandInAdapter(base_url, key, **_adapter_options(client)))
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_maxsize=client.pool_size))
+
+    def replay(call_key):
+        resp = session.get(f"{base_url}/play/{call_key}", timeout=timeout)
+        resp.raise_for_status()
+        return pickle.loads(resp.content)
+
+    class Sort:
+        MOST_RELEVANT = 1
+        NEWEST = 2
+        RATING = 3
+
+    def reviews(app_id, lang="en", country="us", sort=Sort.NEWEST, count=100,
+                continuation_token=None, **kwargs):
+        seq = continuation_token.seq if isinstance(continuation_token, ReplayToken) else 0
+        return replay(play_call_key("reviews", app_id, lang, country, sort, count, seq))
+
+    def app(app_id, lang="en", country="us"):
+        return replay(play_call_key("app", app_id, lang, country))
+
+    module = types.ModuleType("google_play_scraper")
+    module.reviews, module.app, module.Sort = reviews, app, Sort
+    sys.modules["google_play_scraper"] = module
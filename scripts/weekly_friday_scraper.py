@@ -15,8 +15,36 @@ COLLECTS:
 7. Combined iOS + Android US
 
 FEATURES:
-- Deduplication: Appends new reviews, removes duplicates by review ID
-- Rolling window: Keeps only reviews within date range for 30-day data
+- Review store: all reviews live in one SQLite table (data/reviews.sqlite),
+  upserted by review ID; each dataset above is an indexed query over it
+- Rolling window: 30-day datasets are date range scans on the store
+- JSON/CSV dataset files are exports of those queries (--no-export skips them)
+- AllCountries storefronts are scraped concurrently (--scrape-workers), with
+  a per-host cap on requests in flight; --play-processes runs each Google Play
+  storefront in its own worker process
+- Store requests go through a token bucket per endpoint family that backs
+  off on 429/503 (honoring Retry-After) and ramps back up when healthy
+- All iTunes requests share one keep-alive, gzip-enabled HTTP client
+- A fetch plan reads each storefront once per run at the deepest depth any
+  dataset needs (US is not re-scraped for AllCountries); ratings recorded by
+  the daily job earlier the same day are reused
+- Scraped pages stream straight into the review store (a few pages per
+  worker in memory), so memory does not grow with storefronts or depth;
+  with --play-processes each Play storefront comes back whole from its
+  worker instead, so memory grows with storefront depth
+- Depth and polling adapt to each storefront's review velocity (learned in
+  the store); quiet storefronts are polled less often and every run plans
+  at most a budget of review pages (--request-budget; retries not counted)
+- Incremental: each storefront keeps a high-water mark (newest stored review)
+  and pagination stops at the first page older than it (--full-scrape ignores it)
+- Scrapes checkpoint each storefront page by page (data/scrape_checkpoints.sqlite);
+  a rerun after a crash resumes instead of refetching (--restart discards them)
+- iTunes responses are cached on disk (data/http_cache.sqlite) with a TTL per
+  endpoint and ETag/Last-Modified revalidation (--no-http-cache bypasses it)
+- --record DIR captures every store response to fixtures; --replay DIR serves
+  them from a local stand-in with optional latency and error injection
+  (scripts/store_replay.py), writing the run's store, checkpoints, datasets
+  and reports to a scratch directory instead (--replay-state)
 - Runs CustomerInsight_Review_Agent for analysis
 - Commits all changes to GitHub
 
@@ -29,12 +57,30 @@ Created: January 2026
 
 import json
 import csv
+import hashlib
+import math
+import multiprocessing
 import os
+import pickle
+import queue
+import random
+import re
+import sqlite3
 import sys
+import tempfile
+import threading
 import time
+import urllib.error
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from collections import Counter
+from itertools import islice
+from urllib.parse import urlsplit
+
+import numpy as np
 
 # Optional: matplotlib for chart generation
 try:
@@ -77,6 +123,11 @@ COUNTRY_LANGUAGE_MAP = {
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.join(SCRIPT_DIR, "..")
+
+# CustomerInsight_Review_Agent lives at the project root; functions import
+# from it lazily, so the path is added once here rather than per call
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 IOS_DATA_DIR = os.path.join(DATA_DIR, "ios")
 ANDROID_DATA_DIR = os.path.join(DATA_DIR, "googleplay")
@@ -87,6 +138,25 @@ REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
 # Historical rating data file
 RATING_HISTORY_FILE = os.path.join(DATA_DIR, "app_rating_history.json")
 
+# Latest ratings snapshot, rewritten by every ratings run
+CURRENT_RATINGS_FILE = os.path.join(DATA_DIR, "current_app_ratings.json")
+
+# Per-review classification cache shared by all insights runs
+# (carried between workflow runs in the Actions cache, not committed)
+CLASSIFICATION_CACHE_FILE = os.path.join(DATA_DIR, "classification_cache.sqlite")
+
+# Review warehouse: one row per review, datasets are queries over it
+# (carried between workflow runs in the Actions cache, not committed; the
+# JSON exports reseed it if the cache is ever evicted)
+REVIEW_STORE_FILE = os.path.join(DATA_DIR, "reviews.sqlite")
+
+# Cached store API responses (not committed)
+HTTP_CACHE_FILE = os.path.join(DATA_DIR, "http_cache.sqlite")
+
+# In-progress scrape state, resumed after an interruption (carried between
+# workflow runs in the Actions cache, so re-running a failed job resumes too)
+CHECKPOINT_FILE = os.path.join(DATA_DIR, "scrape_checkpoints.sqlite")
+
 # Visualizations directory
 VISUALIZATIONS_DIR = os.path.join(OUTPUT_DIR, "visualizations")
 
@@ -100,20 +170,27 @@ for d in [IOS_DATA_DIR, ANDROID_DATA_DIR, INSIGHTS_DIR, REPORTS_DIR, VISUALIZATI
 # ============================================================================
 
 def load_existing_reviews(filepath):
-    """Load existing reviews from JSON file"""
+    """Load existing reviews from JSON file as compact Review records (streamed)"""
+    from CustomerInsight_Review_Agent import iter_reviews
+
     if os.path.exists(filepath):
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return list(iter_reviews(filepath, records=True))
         except (json.JSONDecodeError, IOError):
             return []
     return []
 
 
+def _json_default(value):
+    """json.dump fallback: Review records become dicts, anything else a string"""
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
 def save_reviews(reviews, filepath):
-    """Save reviews to JSON file"""
+    """Save reviews (dicts or Review records) to JSON file"""
     with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(reviews, f, indent=2, ensure_ascii=False, default=str)
+        json.dump(reviews, f, indent=2, ensure_ascii=False, default=_json_default)
     print(f"  Saved {len(reviews)} reviews to {os.path.basename(filepath)}")
 
 
@@ -136,7 +213,14 @@ def compute_histogram_from_reviews(reviews):
     """
     Compute a rating histogram [1-star, 2-star, 3-star, 4-star, 5-star] from reviews.
     Returns a 5-element list or None if no valid ratings found.
+    Also accepts a ReviewCorpus, reduced directly over its rating column.
     """
+    corpus = _as_review_corpus(reviews)
+    if corpus is not None:
+        ratings = corpus.rating[corpus.has("rating")]
+        counts = np.bincount(ratings[(ratings >= 1) & (ratings <= 5)], minlength=6)[1:]
+        return [int(c) for c in counts] if counts.sum() > 0 else None
+
     counts = [0, 0, 0, 0, 0]
     valid = 0
     for review in reviews:
@@ -147,75 +231,61 @@ def compute_histogram_from_reviews(reviews):
     return counts if valid > 0 else None
 
 
-def deduplicate_reviews(existing, new_reviews):
-    """
-    Merge reviews: add new, keep unique by ID.
-    Returns deduplicated list sorted by date (newest first).
-    """
-    reviews_by_id = {}
-
-    # Add existing reviews
-    for review in existing:
-        review_id = str(review.get('id', ''))
-        if review_id:
-            reviews_by_id[review_id] = review
-
-    # Add new reviews — do NOT overwrite existing to preserve original country tag
-    added_count = 0
-    for review in new_reviews:
-        review_id = str(review.get('id', ''))
-        if review_id and review_id not in reviews_by_id:
-            reviews_by_id[review_id] = review
-            added_count += 1
-
-    # Sort by date (newest first)
-    all_reviews = list(reviews_by_id.values())
-    all_reviews.sort(key=lambda x: x.get('date', ''), reverse=True)
-
-    print(f"  Added {added_count} new reviews, total: {len(all_reviews)}")
-    return all_reviews
-
-
-def filter_reviews_by_date(reviews, days_back):
-    """Filter reviews to only include those within the date range"""
-    cutoff_date = datetime.now() - timedelta(days=days_back)
-    filtered = []
-
-    for review in reviews:
-        date_str = review.get('date', '')
-        if date_str:
-            try:
-                # Handle various date formats
-                if 'T' in date_str:
-                    review_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    if review_date.tzinfo:
-                        review_date = review_date.replace(tzinfo=None)
-                else:
-                    review_date = datetime.strptime(date_str[:10], '%Y-%m-%d')
+def _as_review_corpus(reviews):
+    """Return reviews if it is a columnar ReviewCorpus, else None"""
+    from CustomerInsight_Review_Agent import ReviewCorpus
+    return reviews if isinstance(reviews, ReviewCorpus) else None
 
-                if review_date >= cutoff_date:
-                    filtered.append(review)
-            except (ValueError, TypeError):
-                # Keep reviews with unparseable dates
-                filtered.append(review)
 
-    print(f"  Filtered to {len(filtered)} reviews (last {days_back} days)")
-    return filtered
+def _corpus_analytics_inputs(corpus):
+    """
+    Array reductions over a ReviewCorpus giving the same
+    (ratings, rating_dist, version_dist, dates) as the dict path.
+    """
+    ratings = corpus.rating[corpus.has("rating") & (corpus.rating != 0)]
+    values, counts = np.unique(ratings, return_counts=True)
+    rating_dist = Counter({int(v): int(c) for v, c in zip(values, counts)})
+
+    # Versions: count truthy values, ties broken by first occurrence like Counter
+    dictionary = corpus.dictionaries["version"]
+    codes = np.asarray(corpus.codes["version"])
+    truthy = np.array([bool(v) for v in dictionary], dtype=bool)
+    codes = codes[truthy[codes]]
+    values, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    version_dist = Counter()
+    for i in np.lexsort((first, -counts)):
+        version_dist[dictionary[values[i]]] = int(counts[i])
+
+    days = corpus.date_day[corpus.date_day > 0]
+    dates = []
+    if len(days):
+        dates = [f"{d // 10000:04d}-{d // 100 % 100:02d}-{d % 100:02d}"
+                 for d in (int(days.min()), int(days.max()))]
+    return ratings, rating_dist, version_dist, dates
 
 
 def generate_analytics(reviews, platform, country, days=None):
-    """Generate analytics summary"""
-    if not reviews:
+    """
+    Generate analytics summary.
+    reviews is a list of review dicts or a ReviewCorpus; the corpus path
+    runs as array reductions over its memory-mapped columns.
+    """
+    if not len(reviews):
         return None
 
     total = len(reviews)
-    ratings = [r.get('rating', 0) for r in reviews if r.get('rating')]
-    avg_rating = sum(ratings) / len(ratings) if ratings else 0
+    corpus = _as_review_corpus(reviews)
+    if corpus is not None:
+        ratings, rating_dist, version_dist, dates = _corpus_analytics_inputs(corpus)
+        avg_rating = int(ratings.sum()) / len(ratings) if len(ratings) else 0
+    else:
+        ratings = [r.get('rating', 0) for r in reviews if r.get('rating')]
+        avg_rating = sum(ratings) / len(ratings) if ratings else 0
 
-    rating_dist = Counter(ratings)
-    version_dist = Counter(r.get('version', 'unknown') for r in reviews if r.get('version'))
+        rating_dist = Counter(ratings)
+        version_dist = Counter(r.get('version', 'unknown') for r in reviews if r.get('version'))
 
-    dates = [r.get('date', '')[:10] for r in reviews if r.get('date')]
+        dates = [r.get('date', '')[:10] for r in reviews if r.get('date')]
 
     analytics = {
         "scrape_date": datetime.now().isoformat(),
@@ -241,6 +311,351 @@ def generate_analytics(reviews, platform, country, days=None):
     return analytics
 
 
+# ============================================================================
+# REVIEW STORE (SQLite)
+# ============================================================================
+
+# Exported review fields per platform, in the order the scrapers build them
+REVIEW_FIELDS = {
+    "iOS App Store": ["id", "author", "rating", "title", "content", "version", "date",
+                      "country", "platform", "vote_count", "vote_sum"],
+    "Google Play": ["id", "author", "rating", "title", "content", "version", "date",
+                    "country", "platform", "vote_count", "reply_content"],
+}
+STORE_COLUMNS = ["id", "author", "rating", "title", "content", "version", "date",
+                 "country", "platform", "vote_count", "vote_sum", "reply_content"]
+
+# Reviews per ID-index lookup during ingest (below SQLite's variable limit)
+STORE_BATCH_SIZE = 500
+
+# Weight of the newest observation in each storefront's reviews-per-day estimate
+ACTIVITY_SMOOTHING = 0.5
+
+# Published datasets: each one is an indexed query over the store.
+# country=None means every storefront; tag replaces the country on export.
+STORE_DATASETS = [
+    {"name": "HP_App_iOS_US_Last30Days", "key": "ios_us_30d", "dir": IOS_DATA_DIR,
+     "platform": "iOS App Store", "country": "us", "days": 30, "label": "US"},
+    {"name": "HP_App_iOS_AllCountries_Last30Days", "key": "ios_all_30d", "dir": IOS_DATA_DIR,
+     "platform": "iOS App Store", "country": None, "tag": "global", "days": 30,
+     "label": "AllCountries"},
+    {"name": "HP_App_iOS_US_Last500", "key": "ios_us_500", "dir": IOS_DATA_DIR,
+     "platform": "iOS App Store", "country": "us", "limit": 500, "label": "US"},
+    {"name": "HP_App_Android_US_Last30Days", "key": "android_us_30d", "dir": ANDROID_DATA_DIR,
+     "platform": "Google Play", "country": "us", "days": 30, "label": "US"},
+    {"name": "HP_App_Android_AllCountries_Last30Days", "key": "android_all_30d",
+     "dir": ANDROID_DATA_DIR, "platform": "Google Play", "country": None, "tag": "global",
+     "days": 30, "label": "AllCountries"},
+    {"name": "HP_App_Android_US_Last500", "key": "android_us_500", "dir": ANDROID_DATA_DIR,
+     "platform": "Google Play", "country": "us", "limit": 500, "label": "US"},
+]
+
+
+class ReviewStore:
+    """
+    SQLite warehouse holding one row per (platform, review id).
+
+    Ingest is an upsert: existing rows are never overwritten, except that a
+    specific storefront tag (e.g. 'us') replaces the 'global' tag given by
+    the all-countries scrapers. Each row stores its date normalized to UTC
+    epoch seconds at ingest; dataset slices are range scans over the
+    (platform, country, date_epoch) index, newest first.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                platform TEXT NOT NULL,
+                id TEXT NOT NULL,
+                author TEXT,
+                rating INTEGER,
+                title TEXT,
+                content TEXT,
+                version TEXT,
+                date TEXT NOT NULL DEFAULT '',
+                country TEXT NOT NULL DEFAULT '',
+                vote_count INTEGER,
+                vote_sum INTEGER,
+                reply_content TEXT,
+                date_epoch INTEGER,
+                PRIMARY KEY (platform, id)
+            );
+        """)
+        self._migrate()
+        self.conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_reviews_window ON reviews (platform, country, date_epoch);
+            CREATE INDEX IF NOT EXISTS idx_reviews_recent ON reviews (platform, date_epoch);
+            CREATE INDEX IF NOT EXISTS idx_reviews_id ON reviews (id);
+            CREATE TABLE IF NOT EXISTS watermarks (
+                platform TEXT NOT NULL,
+                storefront TEXT NOT NULL,
+                date_epoch INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (platform, storefront)
+            );
+            CREATE TABLE IF NOT EXISTS storefront_activity (
+                platform TEXT NOT NULL,
+                storefront TEXT NOT NULL,
+                reviews_per_day REAL NOT NULL,
+                polled_at INTEGER NOT NULL,
+                PRIMARY KEY (platform, storefront)
+            );
+        """)
+
+    def _migrate(self):
+        """Add and backfill date_epoch in stores created before it existed"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(reviews)")]
+        if "date_epoch" in columns:
+            return
+        from CustomerInsight_Review_Agent import review_epoch
+
+        with self.conn:
+            self.conn.execute("ALTER TABLE reviews ADD COLUMN date_epoch INTEGER")
+            self.conn.execute("DROP INDEX IF EXISTS idx_reviews_slice")
+            self.conn.execute("DROP INDEX IF EXISTS idx_reviews_date")
+            rows = self.conn.execute("SELECT rowid, date FROM reviews").fetchall()
+            self.conn.executemany("UPDATE reviews SET date_epoch = ? WHERE rowid = ?",
+                                  [(review_epoch(date), rowid) for rowid, date in rows])
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def upsert(self, reviews, update=False):
+        """
+        Ingest reviews keyed by platform + id.
+
+        Membership is checked against the stored ID index in batches, so
+        nothing is reloaded. Unknown reviews are inserted; known ones are
+        skipped unless their 'global' country tag can be replaced by a
+        specific one, or update=True and another field changed (the stored
+        country tag is kept). Repeated IDs within a batch keep the first; a
+        repeat in a later batch meets the stored row like any other review,
+        so memory does not grow with the input (reviews may be a generator).
+        Each batch is committed as it is written: if the input fails part
+        way (a scrape error or a killed run), the batches before it stay
+        stored and the next run picks up from the scrape checkpoints.
+        Dates are normalized to UTC epoch seconds here, once.
+
+        Returns {"added", "skipped", "updated", "total"}.
+        """
+        from CustomerInsight_Review_Agent import review_date_epoch
+
+        stats = {"added": 0, "skipped": 0, "updated": 0}
+        country = STORE_COLUMNS.index("country")
+        platform = STORE_COLUMNS.index("platform")
+        iterator = iter(reviews)
+        while True:
+            batch = list(islice(iterator, STORE_BATCH_SIZE))
+            if not batch:
+                break
+            seen = set()
+            rows = []
+            for review in batch:
+                row = self._row(review)
+                key = (row[platform], row[0])
+                if not row[0] or key in seen:
+                    stats["skipped"] += 1
+                    continue
+                seen.add(key)
+                rows.append(row + [review_date_epoch(review)])
+
+            stored = self._lookup(rows)
+            inserts, updates = [], []
+            for row in rows:
+                old = stored.get((row[platform], row[0]))
+                if old is None:
+                    inserts.append(row)
+                    continue
+                new = list(old)
+                if old[country] == 'global' and row[country] not in ('', 'global'):
+                    new[country] = row[country]
+                if update:
+                    new = [new[i] if i == country else row[i] for i in range(len(row))]
+                if new != list(old):
+                    updates.append(new[1:] + [new[0], new[platform]])
+                else:
+                    stats["skipped"] += 1
+
+            columns = STORE_COLUMNS + ["date_epoch"]
+            placeholders = ", ".join("?" for _ in columns)
+            assignments = ", ".join(f"{c} = ?" for c in columns[1:])
+            with self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO reviews ({', '.join(columns)}) VALUES ({placeholders})", inserts)
+                self.conn.executemany(
+                    f"UPDATE reviews SET {assignments} WHERE id = ? AND platform = ?", updates)
+            stats["added"] += len(inserts)
+            stats["updated"] += len(updates)
+
+        stats["total"] = len(self)
+        print(f"  Added {stats['added']} new reviews, skipped {stats['skipped']}, "
+              f"updated {stats['updated']}, total: {stats['total']}")
+        return stats
+
+    def _lookup(self, rows):
+        """Stored rows (with date_epoch) for the (platform, id) keys of rows, via the ID index"""
+        stored = {}
+        platform = STORE_COLUMNS.index("platform")
+        by_platform = {}
+        for row in rows:
+            by_platform.setdefault(row[platform], []).append(row[0])
+        for name, ids in by_platform.items():
+            placeholders = ", ".join("?" for _ in ids)
+            for old in self.conn.execute(
+                    f"SELECT {', '.join(STORE_COLUMNS)}, date_epoch FROM reviews "
+                    f"WHERE platform = ? AND id IN ({placeholders})", [name] + ids):
+                stored[(old[platform], old[0])] = old
+        return stored
+
+    def import_json(self, filepath):
+        """Seed the store from an existing JSON export"""
+        reviews = load_existing_reviews(filepath)
+        if reviews:
+            print(f"  Importing {os.path.basename(filepath)}")
+            self.upsert(reviews)
+
+    def watermarks(self, platform):
+        """{storefront: newest scraped review epoch} for a platform"""
+        return dict(self.conn.execute(
+            "SELECT storefront, date_epoch FROM watermarks WHERE platform = ?", (platform,)))
+
+    def advance_watermarks(self, platform, marks):
+        """Raise the stored watermarks to marks ({storefront: epoch}); never lowers them"""
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO watermarks (platform, storefront, date_epoch, updated_at)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT (platform, storefront) DO UPDATE SET"
+                " date_epoch = MAX(date_epoch, excluded.date_epoch),"
+                " updated_at = excluded.updated_at",
+                [(platform, storefront, int(epoch), now) for storefront, epoch in marks.items()])
+
+    def activity(self):
+        """{(platform, storefront): (reviews per day, last polled epoch)} for every scraped storefront"""
+        return {(platform, storefront): (rate, polled_at) for platform, storefront, rate, polled_at
+                in self.conn.execute("SELECT platform, storefront, reviews_per_day, polled_at"
+                                     " FROM storefront_activity")}
+
+    def record_activity(self, platform, rates, polled_at=None):
+        """
+        Fold observed review velocities ({storefront: reviews per day}) into
+        the stored estimates (exponentially smoothed by ACTIVITY_SMOOTHING)
+        and mark those storefronts as polled now.
+        """
+        polled_at = int(time.time() if polled_at is None else polled_at)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO storefront_activity (platform, storefront, reviews_per_day, polled_at)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT (platform, storefront) DO UPDATE SET"
+                " reviews_per_day = ? * excluded.reviews_per_day + (1 - ?) * reviews_per_day,"
+                " polled_at = excluded.polled_at",
+                [(platform, storefront, float(rate), polled_at, ACTIVITY_SMOOTHING, ACTIVITY_SMOOTHING)
+                 for storefront, rate in rates.items()])
+
+    def query(self, platform, country=None, days=None, limit=None, tag=None):
+        """
+        Select reviews newest first, as compact Review records.
+
+        country: storefront tag to match, or None for all storefronts.
+        days: keep reviews dated within the last N days, compared in UTC
+        (reviews without a parseable date are outside every window).
+        limit: keep only the newest N; undated reviews come last.
+        tag: country value written into the returned records.
+        """
+        sql = f"SELECT {', '.join(STORE_COLUMNS)}, date_epoch FROM reviews WHERE platform = ?"
+        params = [platform]
+        if country is not None:
+            sql += " AND country = ?"
+            params.append(country)
+        if days is not None:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+            sql += " AND date_epoch >= ?"
+            params.append(int(cutoff.timestamp()))
+        sql += " ORDER BY date_epoch DESC, rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        from CustomerInsight_Review_Agent import Review
+
+        fields = REVIEW_FIELDS.get(platform)
+        indexes = [STORE_COLUMNS.index(f) for f in fields] if fields else None
+        country_index = STORE_COLUMNS.index("country")
+        reviews = []
+        for row in self.conn.execute(sql, params):
+            row, epoch = row[:-1], row[-1]
+            if tag is not None:
+                row = row[:country_index] + (tag,) + row[country_index + 1:]
+            if fields:
+                keys = fields
+                values = [row[i] for i in indexes]
+            else:
+                keys = [c for c, v in zip(STORE_COLUMNS, row) if v is not None]
+                values = [v for v in row if v is not None]
+            reviews.append(Review.from_fields(keys, values, date_epoch=epoch))
+        return reviews
+
+    def query_dataset(self, spec):
+        """Run the query for one STORE_DATASETS entry"""
+        return self.query(spec["platform"], country=spec.get("country"),
+                          days=spec.get("days"), limit=spec.get("limit"),
+                          tag=spec.get("tag"))
+
+    @staticmethod
+    def _row(review):
+        row = [review.get(c) for c in STORE_COLUMNS]
+        row[0] = str(review.get('id', ''))
+        row[STORE_COLUMNS.index("date")] = review.get('date') or ''
+        row[STORE_COLUMNS.index("country")] = review.get('country') or ''
+        return row
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_review_store(path=None):
+    """Open the review store (REVIEW_STORE_FILE by default), seeding it from the JSON exports on first use"""
+    store = ReviewStore(REVIEW_STORE_FILE if path is None else path)
+    if not len(store):
+        for spec in STORE_DATASETS:
+            store.import_json(os.path.join(spec["dir"], f"{spec['name']}.json"))
+    return store
+
+
+def publish_dataset(store, spec, export=True, columnar=False):
+    """
+    Query one dataset from the store and write its analytics file, plus
+    the JSON/CSV exports when export is True. With columnar=True the
+    dataset is also written as a review corpus directory (<name>.columns)
+    and the analytics are reduced from its columns. Returns the reviews.
+    """
+    reviews = store.query_dataset(spec)
+    print(f"  Selected {len(reviews)} reviews for {spec['name']}")
+    json_file = os.path.join(spec["dir"], f"{spec['name']}.json")
+    if export:
+        save_reviews(reviews, json_file)
+        save_to_csv(reviews, json_file.replace('.json', '.csv'))
+    source = reviews
+    if columnar:
+        from CustomerInsight_Review_Agent import save_review_corpus, load_review_corpus
+        corpus_dir = json_file.replace('.json', '.columns')
+        save_review_corpus(reviews, corpus_dir)
+        print(f"  Saved review corpus to {os.path.basename(corpus_dir)}")
+        source = load_review_corpus(corpus_dir)
+    analytics = generate_analytics(source, spec["platform"], spec["label"], days=spec.get("days"))
+    if analytics:
+        save_reviews(analytics, json_file.replace('.json', '_Analytics.json'))
+    return reviews
+
+
 # ============================================================================
 # APP STORE RATING FETCHERS
 # ============================================================================
@@ -252,16 +667,11 @@ def fetch_ios_app_rating(country="us"):
     """
     print(f"  Fetching iOS App Store rating for {country.upper()}...")
 
-    import urllib.request
-    import urllib.error
-
     app_id = APP_CONFIG["ios"]["app_id"]
     url = f"https://itunes.apple.com/lookup?id={app_id}&country={country}"
 
     try:
-        req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode('utf-8'))
+        data = store_client().get_json("itunes_lookup", url)
 
         if data.get('resultCount', 0) > 0:
             app_info = data['results'][0]
@@ -281,7 +691,7 @@ def fetch_ios_app_rating(country="us"):
             print(f"  No iOS app found for ID {app_id}")
             return None
 
-    except urllib.error.URLError as e:
+    except requests.RequestException as e:
         print(f"  Error fetching iOS rating for {country}: {e}")
         return None
     except Exception as e:
@@ -296,24 +706,18 @@ def fetch_ios_all_time_histogram(country="us"):
     iTunes lookup API does not expose the histogram; this uses the customer
     reviews endpoint which includes ratingCountList.
     """
-    import urllib.request
-    import urllib.error
-
     app_id = APP_CONFIG["ios"]["app_id"]
     url = (
         f"https://itunes.apple.com/{country}/customer-reviews/id{app_id}"
         f"?displayable-kind=11&media=software&page=1&sort-by=mostRecent"
     )
     headers = {
-        "User-Agent": "Mozilla/5.0",
         "X-Apple-Store-Front": "143441-1,32",
         "Accept": "application/json",
     }
 
     try:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
+        data = store_client().get_json("itunes_customer_reviews", url, headers=headers)
 
         histogram = data.get("ratingCountList")  # [1★, 2★, 3★, 4★, 5★]
         total = data.get("ratingCount")
@@ -379,18 +783,69 @@ def load_rating_history():
     return {"ios": [], "android": []}
 
 
+def _latest_per_day(entries):
+    """Keep one entry per (date, country), the latest recorded, in the position of the first"""
+    latest = {}
+    for entry in entries:
+        key = (entry.get("date"), entry.get("country"))
+        kept = latest.get(key)
+        if kept is None or str(entry.get("timestamp", "")) >= str(kept.get("timestamp", "")):
+            latest[key] = entry
+    return list(latest.values())
+
+
 def save_rating_history(history):
-    """Save rating history to file"""
+    """
+    Save rating history to file, one entry per platform, country and day.
+    The daily and weekly jobs both record ratings on Fridays (on separate
+    runners, so neither sees the other's snapshot); the later one wins.
+    """
+    history = {platform: _latest_per_day(entries) if isinstance(entries, list) else entries
+               for platform, entries in history.items()}
     with open(RATING_HISTORY_FILE, 'w', encoding='utf-8') as f:
         json.dump(history, f, indent=2, ensure_ascii=False, default=str)
     print(f"  Saved rating history to {os.path.basename(RATING_HISTORY_FILE)}")
 
 
-def record_app_ratings():
+# The weekly run reuses ratings the daily job recorded this recently (same day)
+RATINGS_REUSE_AGE = 6 * 3600
+
+
+def load_recent_ratings(max_age):
+    """
+    The current_app_ratings.json snapshot if it was recorded today, less
+    than max_age seconds ago, with both US ratings present; else None.
+    """
+    try:
+        with open(CURRENT_RATINGS_FILE, 'r', encoding='utf-8') as f:
+            current = json.load(f)
+        recorded = datetime.fromisoformat(current["timestamp"])
+    except (IOError, ValueError, KeyError, TypeError):
+        return None
+    now = datetime.now()
+    if current.get("date") != now.strftime('%Y-%m-%d'):
+        return None
+    if not 0 <= (now - recorded).total_seconds() < max_age:
+        return None
+    for platform in ("ios", "android"):
+        if not (current.get(platform) or {}).get("us"):
+            return None
+    return current
+
+
+def record_app_ratings(reuse_within=None):
     """
     Fetch current app ratings for iOS and Android and append to history.
-    Returns the current ratings dict.
+    Returns the current ratings dict. With reuse_within (seconds), a
+    snapshot recorded that recently today is returned instead, without
+    fetching or adding a second history entry for the day.
     """
+    if reuse_within:
+        current = load_recent_ratings(reuse_within)
+        if current:
+            print(f"\n  Reusing App Store Ratings recorded at {current['timestamp']}")
+            return current
+
     print("\n  Recording App Store Ratings...")
 
     timestamp = datetime.now().isoformat()
@@ -453,8 +908,7 @@ def record_app_ratings():
     save_rating_history(history)
 
     # Also save a current snapshot for easy access
-    current_ratings_file = os.path.join(DATA_DIR, "current_app_ratings.json")
-    with open(current_ratings_file, 'w', encoding='utf-8') as f:
+    with open(CURRENT_RATINGS_FILE, 'w', encoding='utf-8') as f:
         json.dump(current_ratings, f, indent=2, ensure_ascii=False, default=str)
     print(f"  Saved current ratings to current_app_ratings.json")
 
@@ -665,10 +1119,9 @@ def generate_rating_history_json():
 
     # Get current ratings
     current_ratings = {}
-    current_ratings_file = os.path.join(DATA_DIR, "current_app_ratings.json")
-    if os.path.exists(current_ratings_file):
+    if os.path.exists(CURRENT_RATINGS_FILE):
         try:
-            with open(current_ratings_file, 'r') as f:
+            with open(CURRENT_RATINGS_FILE, 'r') as f:
                 current_ratings = json.load(f)
         except (json.JSONDecodeError, IOError):
             pass
@@ -885,41 +1338,970 @@ def generate_rating_history_report():
     return report
 
 
+# ============================================================================
+# CONCURRENT SCRAPING
+# ============================================================================
+
+# Storefronts scraped at the same time (1 = one after another)
+SCRAPE_WORKERS = 6
+
+# Requests in flight per host, shared by all scraping threads
+HOST_CONCURRENCY = {
+    "itunes.apple.com": 4,
+    "play.google.com": 4,
+}
+DEFAULT_HOST_CONCURRENCY = 2
+
+# google_play_scraper talks to this host internally
+PLAY_STORE_HOST = "play.google.com"
+
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+def host_slot(url_or_host):
+    """
+    Semaphore bounding concurrent requests to one host.
+    Use as: with host_slot(url): requests.get(url, ...)
+    """
+    host = urlsplit(url_or_host).hostname or url_or_host
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = threading.BoundedSemaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+            _host_slots[host] = slot
+    return slot
+
+
+def set_host_concurrency(limit, host=None):
+    """
+    Change the limit for one host, or if host is None the default for
+    hosts without their own entry in HOST_CONCURRENCY
+    """
+    global DEFAULT_HOST_CONCURRENCY
+    with _host_slots_lock:
+        if host is None:
+            DEFAULT_HOST_CONCURRENCY = limit
+        else:
+            HOST_CONCURRENCY[host] = limit
+        _host_slots.clear()
+
+
+# Pages each storefront may read ahead of the consumer in stream_storefronts
+STREAM_BUFFER_PAGES = 4
+
+_END_OF_STOREFRONT = object()
+
+
+def stream_storefronts(iter_pages, countries, max_reviews, workers=SCRAPE_WORKERS,
+                       watermarks=None, processes=False, depths=None, result=None):
+    """
+    Read every storefront with iter_pages(country, max_reviews=...,
+    since=..., result=...) and yield its pages (lists of reviews) in the
+    order given, exactly as a serial loop would.
+
+    Up to `workers` storefronts are read at once on a thread pool, each at
+    most STREAM_BUFFER_PAGES pages ahead of the consumer, so memory stays
+    bounded by a few pages per worker however many storefronts there are
+    or how deep they are read. watermarks maps storefront -> epoch passed
+    as since; depths maps storefront -> max_reviews where it differs.
+    result (a ScrapeResult) absorbs each storefront's bookkeeping.
+
+    With processes=True each storefront runs in a worker process instead
+    and arrives as a single page (iter_pages must be a module-level
+    function); the rate budget is split between the workers. Memory is
+    then not bounded by pages: every storefront is held whole in its
+    worker, and storefronts that finish ahead of the one being consumed
+    wait whole in this process.
+    """
+    countries = list(countries)
+    watermarks = watermarks or {}
+    depths = depths or {}
+    result = ScrapeResult() if result is None else result
+
+    def options(country):
+        return {"max_reviews": depths.get(country, max_reviews), "since": watermarks.get(country)}
+
+    if workers is None or workers <= 1 or len(countries) <= 1:
+        for country in countries:
+            yield from iter_pages(country, result=result, **options(country))
+        return
+
+    workers = min(workers, len(countries))
+    if processes:
+        tasks = [(iter_pages, country, options(country)) for country in countries]
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_scrape_worker,
+                                 initargs=(_scrape_worker_settings(workers),)) as executor:
+            for scraped in executor.map(_scrape_in_worker, tasks):
+                result.absorb(scraped.bookkeeping())
+                yield scraped
+        return
+
+    buffers = {country: queue.Queue(STREAM_BUFFER_PAGES) for country in countries}
+    stop = threading.Event()
+
+    def put(buffer, item):
+        """Block until there is room in the buffer; False if the consumer has gone"""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce(country):
+        part = ScrapeResult()
+        try:
+            if not stop.is_set():
+                for page in iter_pages(country, result=part, **options(country)):
+                    if not put(buffers[country], page):
+                        break
+        finally:
+            put(buffers[country], _END_OF_STOREFRONT)
+        return part
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(produce, country) for country in countries]
+        try:
+            for country, future in zip(countries, futures):
+                while True:
+                    page = buffers[country].get()
+                    if page is _END_OF_STOREFRONT:
+                        break
+                    yield page
+                result.absorb(future.result())
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+
+
+def _scrape_worker_settings(share):
+    """
+    Settings a spawned scrape worker copies from this process. Each
+    endpoint family's rate (current adapted rate if a limiter exists) and
+    burst are divided by share, so the workers together stay within one
+    process's budget.
+    """
+    limits = {}
+    for family, spec in RATE_LIMITS.items():
+        limiter = _rate_limiters.get(family)
+        rate = limiter.rate if limiter else spec["rate"]
+        limits[family] = dict(spec, rate=rate / share, burst=max(1, spec["burst"] // share),
+                              min_rate=spec["min_rate"] / share, max_rate=spec["max_rate"] / share)
+    return {
+        "rate_limits": limits,
+        "host_concurrency": dict(HOST_CONCURRENCY),
+        "default_host_concurrency": DEFAULT_HOST_CONCURRENCY,
+        "http_cache": HTTP_CACHE_ENABLED,
+        "checkpoints": CHECKPOINTS_ENABLED,
+        "store_traffic": _store_traffic,
+        "state_dir": _state_dir,
+    }
+
+
+def _init_scrape_worker(settings):
+    """Process-pool initializer: apply _scrape_worker_settings() in a fresh worker"""
+    global DEFAULT_HOST_CONCURRENCY, HTTP_CACHE_ENABLED, CHECKPOINTS_ENABLED
+    RATE_LIMITS.update(settings["rate_limits"])
+    HOST_CONCURRENCY.update(settings["host_concurrency"])
+    DEFAULT_HOST_CONCURRENCY = settings["default_host_concurrency"]
+    HTTP_CACHE_ENABLED = settings["http_cache"]
+    CHECKPOINTS_ENABLED = settings["checkpoints"]
+    if settings["state_dir"]:
+        use_state_dir(settings["state_dir"])
+    if settings["store_traffic"]:
+        _install_store_traffic(*settings["store_traffic"])
+
+
+def _scrape_in_worker(task):
+    """Process-pool entry point: task is (iter_pages, country, options); returns a ScrapeResult"""
+    iter_pages, country, options = task
+    return collect_pages(iter_pages, country, **options)
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+# Token bucket per endpoint family: starting rate (requests/second), burst
+# size, and the range the rate adapts within
+RATE_LIMITS = {
+    "itunes_rss": {"rate": 4.0, "burst": 4, "min_rate": 0.2, "max_rate": 20.0},
+    "itunes_lookup": {"rate": 2.0, "burst": 2, "min_rate": 0.2, "max_rate": 10.0},
+    "itunes_customer_reviews": {"rate": 2.0, "burst": 2, "min_rate": 0.2, "max_rate": 10.0},
+    "play": {"rate": 4.0, "burst": 4, "min_rate": 0.2, "max_rate": 20.0},
+}
+
+# Responses that mean "slow down", retried after a pause
+THROTTLE_STATUSES = {429, 503}
+MAX_RETRIES = 5
+
+# Exponential backoff when the server gives no Retry-After
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Multiplicative decrease on a throttle; increase after a run of healthy responses
+RATE_DECREASE = 0.7
+RATE_INCREASE = 1.5
+RAMP_UP_AFTER = 5
+
+# Throttles closer together than this (e.g. from several threads) are one signal
+THROTTLE_WINDOW = 1.0
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket for one endpoint family.
+
+    acquire() blocks until a request may be sent. A throttled response
+    cuts the rate (RATE_DECREASE) and pauses the whole family for Retry-After (or an
+    exponential backoff); every RAMP_UP_AFTER healthy responses raise the
+    rate again, up to max_rate.
+    """
+
+    def __init__(self, rate, burst=1, min_rate=0.2, max_rate=20.0):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.throttles = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cut_until = 0.0
+        self._healthy = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait for a token"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def succeeded(self):
+        """Record a healthy response"""
+        with self._lock:
+            self._healthy += 1
+            if self._healthy >= RAMP_UP_AFTER:
+                self._healthy = 0
+                self.rate = min(self.max_rate, self.rate * RATE_INCREASE)
+
+    def throttled(self, attempt, retry_after=None):
+        """Record a 429/503: slow down and pause. Returns the pause in seconds."""
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        with self._lock:
+            now = time.monotonic()
+            self.throttles += 1
+            self._healthy = 0
+            # Threads throttled during the same episode count as one signal
+            if now >= self._cut_until:
+                self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+                self._cut_until = now + max(delay, THROTTLE_WINDOW)
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, now + delay)
+        return delay
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def rate_limiter(family):
+    """Shared RateLimiter for an endpoint family (see RATE_LIMITS)"""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(family)
+        if limiter is None:
+            limiter = RateLimiter(**RATE_LIMITS[family])
+            _rate_limiters[family] = limiter
+    return limiter
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with jitter for retry number attempt (0-based)"""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# google_play_scraper re-raises urllib HTTP errors as its own exceptions,
+# with the status only in the message ("... Status code 429 returned.")
+_STATUS_IN_MESSAGE = re.compile(r"status code:? (\d{3})\b", re.IGNORECASE)
+
+
+def _error_chain(error):
+    """error, then the exceptions it was raised from or while handling"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _throttle_info(error):
+    """
+    (status, Retry-After seconds) for an HTTP error from requests, urllib or
+    google_play_scraper; status is None if the error carries none.
+    """
+    for err in _error_chain(error):
+        response = getattr(err, "response", None)
+        if response is not None:
+            return response.status_code, parse_retry_after(response.headers.get("Retry-After"))
+        status = getattr(err, "code", None)
+        if isinstance(status, int):
+            headers = getattr(err, "headers", None)
+            retry_after = (parse_retry_after(headers.get("Retry-After"))
+                           if headers is not None else None)
+            return status, retry_after
+    for err in _error_chain(error):
+        match = _STATUS_IN_MESSAGE.search(str(err))
+        if match:
+            return int(match.group(1)), None
+    return None, None
+
+
+def _dropped_connection(error):
+    """True for a connection reset, refusal or timeout from requests, urllib or sockets"""
+    for err in _error_chain(error):
+        if isinstance(err, urllib.error.HTTPError):
+            return False
+        if isinstance(err, (requests.ConnectionError, requests.Timeout, urllib.error.URLError,
+                            ConnectionError, TimeoutError)):
+            return True
+    return False
+
+
+def rate_limited_call(family, call, host=None):
+    """
+    Run call() under the family's token bucket (and the host's concurrency
+    slot). Throttling errors (429/503) and dropped connections are retried
+    with backoff up to MAX_RETRIES times, then re-raised. Errors are
+    recognised through the requests, urllib and google_play_scraper
+    exceptions wrapping them (see _throttle_info).
+    """
+    limiter = rate_limiter(family)
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            if host is None:
+                result = call()
+            else:
+                with host_slot(host):
+                    result = call()
+        except Exception as e:
+            if attempt == MAX_RETRIES:
+                raise
+            status, retry_after = _throttle_info(e)
+            if status in THROTTLE_STATUSES:
+                delay = limiter.throttled(attempt, retry_after)
+                print(f"  Throttled ({status}) by {family}, retrying in {delay:.1f}s")
+                continue
+            if status is None and _dropped_connection(e):
+                time.sleep(backoff_delay(attempt))
+                continue
+            raise
+        limiter.succeeded()
+        return result
+
+
+# ============================================================================
+# STORE HTTP CLIENT
+# ============================================================================
+
+# Headers sent with every store request
+STORE_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# (connect, read) timeouts in seconds per endpoint family
+REQUEST_TIMEOUTS = {
+    "itunes_rss": (10, 15),
+    "itunes_lookup": (10, 30),
+    "itunes_customer_reviews": (10, 30),
+}
+DEFAULT_TIMEOUT = (10, 30)
+
+# Seconds a cached response is served without contacting the store;
+# after that it is revalidated with a conditional GET
+CACHE_TTLS = {
+    "itunes_rss": 6 * 3600,
+    "itunes_lookup": 3600,
+    "itunes_customer_reviews": 6 * 3600,
+}
+
+# Entries not refreshed for this long are dropped when the cache opens
+CACHE_MAX_AGE = 7 * 86400
+
+# Request headers that select a different response for the same URL
+CACHE_VARY_HEADERS = ("X-Apple-Store-Front", "Accept", "Accept-Language")
+
+# Response headers kept with a cached body (the body is stored decoded)
+_CACHED_RESPONSE_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date", "Cache-Control")
+
+
+class ResponseCache:
+    """
+    On-disk cache of successful store responses.
+
+    Entries are keyed by URL plus the storefront-selecting request headers
+    (CACHE_VARY_HEADERS). Within its family's TTL an entry is served with
+    no network request at all; after that it is revalidated with
+    If-None-Match / If-Modified-Since, and a 304 renews it. Safe to share
+    between scraping threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM responses WHERE fetched_at < ?",
+                           (time.time() - CACHE_MAX_AGE,))
+        self._conn.commit()
+
+    @staticmethod
+    def key(url, headers=None):
+        """Cache key for a URL and its request headers"""
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        vary = [f"{name}={headers.get(name.lower(), '')}" for name in CACHE_VARY_HEADERS]
+        return hashlib.sha256("\n".join([url] + vary).encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """Cached entry as a dict, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, fetched_at"
+                " FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        url, status, headers, body, etag, last_modified, fetched_at = row
+        return {"url": url, "status": status, "headers": json.loads(headers), "body": body,
+                "etag": etag, "last_modified": last_modified, "fetched_at": fetched_at}
+
+    def store(self, key, resp):
+        """Save a 200 response"""
+        headers = {name: resp.headers[name] for name in _CACHED_RESPONSE_HEADERS
+                   if name in resp.headers}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, url, status, headers, body, etag, last_modified, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, resp.url, resp.status_code, json.dumps(headers), resp.content,
+                 resp.headers.get("ETag"), resp.headers.get("Last-Modified"), time.time()))
+            self._conn.commit()
+
+    def renew(self, key):
+        """Mark an entry as fresh again after a 304"""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE key = ?",
+                               (time.time(), key))
+            self._conn.commit()
+
+    def count(self, outcome):
+        """Add one to the hits, revalidated or misses counter (scraping threads share them)"""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    @staticmethod
+    def response(entry):
+        """Rebuild a requests.Response from a cached entry"""
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp.url = entry["url"]
+        resp.headers.update(entry["headers"])
+        resp._content = entry["body"]
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers) or "utf-8"
+        return resp
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StoreClient:
+    """
+    Pooled HTTP client for the store endpoints.
+
+    One requests.Session keeps connections alive across pages, countries
+    and fetchers, so each host costs a TLS handshake per pooled connection
+    instead of per request. Responses are gzip-encoded on the wire and
+    every get() goes through the family's rate limiter (see
+    rate_limited_call). With a ResponseCache, fresh cached responses skip
+    the network and stale ones are revalidated conditionally.
+    """
+
+    def __init__(self, headers=None, pool_size=None, cache=None):
+        self.cache = cache
+        if pool_size is None:
+            pool_size = max([DEFAULT_HOST_CONCURRENCY, SCRAPE_WORKERS] +
+                            list(HOST_CONCURRENCY.values()))
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.session.headers.update(STORE_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+        # Retries are handled by the rate limiter, not urllib3
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, family, url, headers=None, timeout=None):
+        """
+        Rate-limited GET. A 429/503 that persists after the retries raises
+        requests.HTTPError instead of looking like an empty page.
+        """
+        if timeout is None:
+            timeout = REQUEST_TIMEOUTS.get(family, DEFAULT_TIMEOUT)
+
+        cache = self.cache
+        entry = None
+        request_headers = dict(headers or {})
+        if cache is not None:
+            key = cache.key(url, headers)
+            entry = cache.lookup(key)
+            if entry is not None:
+                if time.time() - entry["fetched_at"] < CACHE_TTLS.get(family, 0):
+                    cache.count("hits")
+                    return cache.response(entry)
+                if entry["etag"]:
+                    request_headers["If-None-Match"] = entry["etag"]
+                if entry["last_modified"]:
+                    request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        def get():
+            resp = self.session.get(url, headers=request_headers, timeout=timeout)
+            if resp.status_code in THROTTLE_STATUSES:
+                resp.raise_for_status()
+            return resp
+
+        resp = rate_limited_call(family, get, host=url)
+
+        if cache is not None:
+            if resp.status_code == 304 and entry is not None:
+                cache.count("revalidated")
+                cache.renew(key)
+                return cache.response(entry)
+            cache.count("misses")
+            if resp.status_code == 200:
+                cache.store(key, resp)
+        return resp
+
+    def get_json(self, family, url, headers=None, timeout=None):
+        """GET and decode JSON, raising requests.HTTPError on any non-2xx status"""
+        resp = self.get(family, url, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Set to False (--no-http-cache) to always go to the network
+HTTP_CACHE_ENABLED = True
+
+_store_client = None
+_store_client_lock = threading.Lock()
+
+
+def store_client():
+    """The process-wide StoreClient (with the on-disk ResponseCache), created on first use"""
+    global _store_client
+    with _store_client_lock:
+        if _store_client is None:
+            cache = ResponseCache(HTTP_CACHE_FILE) if HTTP_CACHE_ENABLED else None
+            _store_client = StoreClient(cache=cache)
+    return _store_client
+
+
+# ============================================================================
+# INCREMENTAL SCRAPING (WATERMARKS)
+# ============================================================================
+
+# Pages are only treated as "already stored" when older than the watermark
+# by this much, so late-published reviews just below the mark are still read
+WATERMARK_OVERLAP = 86400
+
+
+class ScrapeResult(list):
+    """
+    Reviews returned by a scraper, plus per-storefront bookkeeping.
+
+    watermarks maps each storefront that was read without error to the
+    newest review epoch seen there; complete is False if any storefront
+    stopped on an error (its watermark is then left alone, so the next run
+    does not skip the reviews that were missed). activity maps the same
+    storefronts to the reviews per day observed in this scrape.
+    """
+
+    def __init__(self, reviews=(), complete=True, watermarks=None, checkpoints=None,
+                 activity=None):
+        super().__init__(reviews)
+        self.complete = complete
+        self.watermarks = dict(watermarks or {})
+        self.checkpoints = list(checkpoints or [])
+        self.activity = dict(activity or {})
+
+    def absorb(self, other):
+        """Append another result's reviews and merge its bookkeeping"""
+        self.extend(other)
+        self.complete = self.complete and getattr(other, "complete", True)
+        self.watermarks.update(getattr(other, "watermarks", {}))
+        self.checkpoints.extend(getattr(other, "checkpoints", []))
+        self.activity.update(getattr(other, "activity", {}))
+        return self
+
+    def bookkeeping(self):
+        """A copy of the bookkeeping without the reviews"""
+        return ScrapeResult(complete=self.complete, watermarks=self.watermarks,
+                            checkpoints=self.checkpoints, activity=self.activity)
+
+
+def _review_epochs(reviews):
+    from CustomerInsight_Review_Agent import review_date_epoch
+    return [review_date_epoch(r) for r in reviews]
+
+
+def page_before_watermark(page, since):
+    """True if every review on a page is older than the watermark (minus the overlap)"""
+    if since is None or not page:
+        return False
+    cutoff = since - WATERMARK_OVERLAP
+    return all(epoch is not None and epoch < cutoff for epoch in _review_epochs(page))
+
+
+class ReviewTally:
+    """Running count and date range of one storefront's reviews, added page by page"""
+
+    def __init__(self):
+        self.reviews = 0
+        self.dated = 0
+        self.newest = None
+        self.oldest = None
+
+    def add(self, page):
+        self.reviews += len(page)
+        epochs = [e for e in _review_epochs(page) if e is not None]
+        if epochs:
+            self.dated += len(epochs)
+            self.newest = max(epochs) if self.newest is None else max(self.newest, *epochs)
+            self.oldest = min(epochs) if self.oldest is None else min(self.oldest, *epochs)
+        return self
+
+    def result(self, country, complete, checkpoint=None, reviews=()):
+        """
+        ScrapeResult for the storefront, recording its watermark and observed
+        velocity if it completed. Velocity is the dated reviews read divided
+        by the days from the oldest of them to now (at least an hour); the
+        newest reviews are always read first, so this holds whether paging
+        stopped at the depth limit, the watermark or the end of the feed.
+        """
+        watermarks, activity = {}, {}
+        if complete:
+            activity[country] = 0.0
+            if self.dated:
+                watermarks[country] = self.newest
+                days = max(3600, time.time() - self.oldest) / 86400
+                activity[country] = self.dated / days
+        return ScrapeResult(reviews, complete=complete, watermarks=watermarks,
+                            checkpoints=[checkpoint] if checkpoint else None, activity=activity)
+
+
+def scrape_result(reviews, country, complete, checkpoint=None):
+    """Wrap one storefront's reviews with their bookkeeping (see ReviewTally.result)"""
+    return ReviewTally().add(reviews).result(country, complete, checkpoint, reviews)
+
+
+def collect_pages(iter_pages, country, max_reviews=500, since=None):
+    """Run a page generator to the end; its reviews and bookkeeping as one ScrapeResult"""
+    scraped = ScrapeResult()
+    for page in iter_pages(country, max_reviews=max_reviews, since=since, result=scraped):
+        scraped.extend(page)
+    return scraped
+
+
+# ============================================================================
+# SCRAPE CHECKPOINTS
+# ============================================================================
+
+# Checkpoints older than this are stale (the feed has moved on) and dropped
+CHECKPOINT_MAX_AGE = 2 * 86400
+
+# Set to False to keep checkpoints in memory only
+CHECKPOINTS_ENABLED = True
+
+
+class ScrapeCheckpoints:
+    """
+    Per-storefront scrape progress, written page by page.
+
+    A checkpoint is keyed by (platform, storefront) and holds the depth
+    being scraped, the cursor for the next request (iTunes page number or
+    Play continuation token) and the reviews fetched so far. A scraper that
+    is interrupted resumes from its cursor on the next run, even if the
+    fetch plan gives the storefront a different depth then; one that
+    finished is marked done and returns its saved reviews without fetching
+    (see resume()), until release() is called once those reviews have been
+    ingested. Safe to share between scraping threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                key TEXT PRIMARY KEY,
+                cursor BLOB,
+                done INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                depth INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_pages (
+                key TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                reviews TEXT NOT NULL,
+                PRIMARY KEY (key, seq)
+            );
+        """)
+        self._migrate()
+        stale = [row[0] for row in self._conn.execute(
+            "SELECT key FROM checkpoints WHERE updated_at < ?",
+            (time.time() - CHECKPOINT_MAX_AGE,))]
+        self.release(stale)
+
+    def _migrate(self):
+        """
+        Add the depth column to databases created before it. Their
+        checkpoints were keyed by depth as well and can never be matched
+        again, so they are dropped (those storefronts restart once).
+        """
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(checkpoints)")]
+        if "depth" in columns:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE checkpoints ADD COLUMN depth INTEGER")
+            self._conn.execute("DELETE FROM checkpoints")
+            self._conn.execute("DELETE FROM checkpoint_pages")
+
+    @staticmethod
+    def key(platform, storefront):
+        return f"{platform}|{storefront}"
+
+    def load(self, key):
+        """
+        {"cursor", "done", "saved", "depth"} for a checkpoint, or None;
+        saved counts its reviews
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor, done, depth FROM checkpoints WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            pages = self._conn.execute(
+                "SELECT reviews FROM checkpoint_pages WHERE key = ? ORDER BY seq", (key,))
+            saved = sum(len(json.loads(page)) for (page,) in pages)
+        cursor = pickle.loads(row[0]) if row[0] is not None else None
+        return {"cursor": cursor, "done": bool(row[1]), "saved": saved, "depth": row[2]}
+
+    def resume(self, key, depth):
+        """
+        load() for a scrape to the given depth. A finished checkpoint that
+        stopped at a shallower depth (rather than at the end of the feed or
+        the watermark) cannot serve it: it is dropped and None returned, so
+        the storefront is read again from the top.
+        """
+        state = self.load(key)
+        if (state and state["done"] and state["depth"] is not None
+                and state["saved"] >= state["depth"] and state["depth"] < depth):
+            self.release([key])
+            return None
+        return state
+
+    def pages(self, key):
+        """Yield the saved pages of a checkpoint in order, one at a time"""
+        seq = 0
+        while True:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT reviews FROM checkpoint_pages WHERE key = ? AND seq = ?",
+                    (key, seq)).fetchone()
+            if row is None:
+                return
+            yield json.loads(row[0])
+            seq += 1
+
+    def save(self, key, cursor, page_reviews, depth=None):
+        """Append one page of reviews of a scrape to depth and move the cursor past it"""
+        with self._lock, self._conn:
+            seq = self._conn.execute(
+                "SELECT COUNT(*) FROM checkpoint_pages WHERE key = ?", (key,)).fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO checkpoint_pages (key, seq, reviews) VALUES (?, ?, ?)",
+                (key, seq, json.dumps(page_reviews, ensure_ascii=False, default=str)))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (key, cursor, done, updated_at, depth)"
+                " VALUES (?, ?, 0, ?, ?)", (key, pickle.dumps(cursor), time.time(), depth))
+
+    def finish(self, key, depth=None):
+        """Mark a storefront as fully scraped to depth"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (key, cursor, done, updated_at, depth)"
+                " VALUES (?, NULL, 1, ?, ?)", (key, time.time(), depth))
+
+    def release(self, keys):
+        """Drop checkpoints whose reviews are safely stored"""
+        keys = list(keys)
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM checkpoints WHERE key = ?", [(k,) for k in keys])
+            self._conn.executemany("DELETE FROM checkpoint_pages WHERE key = ?",
+                                   [(k,) for k in keys])
+
+    def clear(self):
+        """Drop every checkpoint"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoints")
+            self._conn.execute("DELETE FROM checkpoint_pages")
+
+    def close(self):
+        self._conn.close()
+
+
+_scrape_checkpoints = None
+_scrape_checkpoints_lock = threading.Lock()
+
+
+def scrape_checkpoints():
+    """The process-wide ScrapeCheckpoints (in memory when CHECKPOINTS_ENABLED is False)"""
+    global _scrape_checkpoints
+    with _scrape_checkpoints_lock:
+        if _scrape_checkpoints is None:
+            _scrape_checkpoints = ScrapeCheckpoints(
+                CHECKPOINT_FILE if CHECKPOINTS_ENABLED else ":memory:")
+    return _scrape_checkpoints
+
+
 # ============================================================================
 # iOS SCRAPERS
 # ============================================================================
 
-def scrape_ios_reviews(country="us", max_reviews=500):
-    """Scrape iOS App Store reviews using Apple iTunes RSS API.
+def iter_ios_review_pages(country="us", max_reviews=500, since=None, result=None):
+    """Scrape iOS App Store reviews using Apple iTunes RSS API, page by page.
 
     The app-store-scraper library (v0.3.5) is broken since Jan 2026 — Apple
     changed their amp-api auth flow. This uses the public iTunes RSS feed
     which returns up to 500 reviews (10 pages × 50) per country storefront.
+
+    Generator yielding one list of reviews per page, newest first.
+    since: watermark epoch; paging stops after the first page whose
+    reviews are all older than it. Progress is checkpointed per page, and
+    an interrupted scrape resumes at the next page (the pages saved before
+    the interruption are yielded first). Once exhausted, the storefront's
+    bookkeeping is absorbed into result (a ScrapeResult).
     """
     print(f"\n  Scraping iOS reviews for {country.upper()}...")
 
+    result = ScrapeResult() if result is None else result
     app_id = APP_CONFIG["ios"]["app_id"]
-    fetched = []
+    checkpoints = scrape_checkpoints()
+    key = checkpoints.key("iOS App Store", country)
+    state = checkpoints.resume(key, max_reviews)
+    tally = ReviewTally()
+    fetched = state["saved"] if state else 0
+    first_page = state["cursor"] if state and state["cursor"] else 1
+    if state:
+        for page_reviews in checkpoints.pages(key):
+            tally.add(page_reviews)
+            yield page_reviews
+        if state["done"]:
+            print(f"  Using {fetched} iOS reviews from {country.upper()} checkpoint")
+            result.absorb(tally.result(country, complete=True, checkpoint=key))
+            return
+        print(f"  Resuming {country.upper()} at page {first_page} ({fetched} reviews saved)")
 
     try:
-        for page in range(1, 11):  # pages 1-10, 50 reviews each = 500 max
-            if len(fetched) >= max_reviews:
+        for page in range(first_page, 11):  # pages 1-10, 50 reviews each = 500 max
+            if fetched >= max_reviews:
                 break
             url = (
                 f"https://itunes.apple.com/{country}/rss/customerreviews"
                 f"/page={page}/id={app_id}/sortBy=mostRecent/json"
             )
-            resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
-            if resp.status_code != 200 or not resp.text.strip():
+            resp = store_client().get("itunes_rss", url)
+            if resp.status_code != 200:
+                # Past the first page an error status is a failed scrape, not
+                # the end of the feed: finishing here would advance the
+                # watermark over the pages that were never read
+                if page > 1:
+                    raise requests.HTTPError(
+                        f"HTTP {resp.status_code} on page {page}", response=resp)
+                break
+            if not resp.text.strip():
                 break
             data = resp.json()
             entries = data.get("feed", {}).get("entry", [])
             if not entries:
                 break
-            for entry in entries:
-                if len(fetched) >= max_reviews:
-                    break
-                fetched.append({
+            page_reviews = []
+            for entry in entries[:max_reviews - fetched]:
+                page_reviews.append({
                     "id": str(entry.get("id", {}).get("label", "")),
                     "author": entry.get("author", {}).get("name", {}).get("label", "Unknown"),
                     "rating": int(entry.get("im:rating", {}).get("label", 0)),
@@ -932,31 +2314,61 @@ def scrape_ios_reviews(country="us", max_reviews=500):
                     "vote_count": int(entry.get("im:voteCount", {}).get("label", 0)),
                     "vote_sum": int(entry.get("im:voteSum", {}).get("label", 0)),
                 })
-            time.sleep(0.5)
+            fetched += len(page_reviews)
+            checkpoints.save(key, page + 1, page_reviews, max_reviews)
+            tally.add(page_reviews)
+            yield page_reviews
+            if page_before_watermark(page_reviews, since):
+                print(f"  Reached stored reviews for {country.upper()} at page {page}")
+                break
 
-        print(f"  Fetched {len(fetched)} iOS reviews from {country.upper()}")
-        return fetched
+        checkpoints.finish(key, max_reviews)
+        print(f"  Fetched {tally.reviews} iOS reviews from {country.upper()}")
+        result.absorb(tally.result(country, complete=True, checkpoint=key))
 
     except Exception as e:
         print(f"  Error scraping iOS {country}: {e}")
-        return fetched
+        result.absorb(tally.result(country, complete=False))
+
+
+def scrape_ios_reviews(country="us", max_reviews=500, since=None):
+    """Scrape one iOS storefront into a ScrapeResult (see iter_ios_review_pages)"""
+    return collect_pages(iter_ios_review_pages, country, max_reviews, since)
+
 
+def iter_ios_all_countries(max_reviews_per_country=500, workers=SCRAPE_WORKERS,
+                           watermarks=None, depths=None, result=None):
+    """
+    Generator form of scrape_ios_all_countries: yields pages of reviews
+    tagged 'global' in storefront order, holding at most a few pages per
+    worker in memory (see stream_storefronts). result absorbs the
+    bookkeeping of every storefront.
+    """
+    countries = ALL_COUNTRIES if depths is None else list(depths)
+    for page in stream_storefronts(iter_ios_review_pages, countries, max_reviews_per_country,
+                                   workers, watermarks, depths=depths, result=result):
+        for r in page:
+            r['country'] = 'global'
+        yield page
 
-def scrape_ios_all_countries(max_reviews_per_country=500):
+
+def scrape_ios_all_countries(max_reviews_per_country=500, workers=SCRAPE_WORKERS,
+                             watermarks=None, depths=None):
     """Scrape iOS reviews from all configured countries.
 
     Country tag is set to 'global' since the iTunes RSS API country param
     selects the storefront, not the reviewer's actual location — same
     caveat as Android's google_play_scraper.
-    """
-    all_reviews = []
-
-    for country in ALL_COUNTRIES:
-        reviews = scrape_ios_reviews(country, max_reviews=max_reviews_per_country)
-        for r in reviews:
-            r['country'] = 'global'
-        all_reviews.extend(reviews)
 
+    Storefronts are fetched on up to `workers` threads; the result is in
+    ALL_COUNTRIES order, as with a serial scrape. watermarks maps
+    storefront -> epoch for incremental scraping. depths ({storefront:
+    max reviews}, e.g. from FetchPlan.claim) replaces the country list.
+    """
+    all_reviews = ScrapeResult()
+    for page in iter_ios_all_countries(max_reviews_per_country, workers, watermarks, depths,
+                                       result=all_reviews):
+        all_reviews.extend(page)
     return all_reviews
 
 
@@ -964,39 +2376,61 @@ def scrape_ios_all_countries(max_reviews_per_country=500):
 # ANDROID SCRAPERS
 # ============================================================================
 
-def scrape_android_reviews(country="us", max_reviews=500):
-    """Scrape Google Play Store reviews"""
+def iter_android_review_pages(country="us", max_reviews=500, since=None, result=None):
+    """
+    Scrape Google Play Store reviews, one list per batch, newest first.
+    since: watermark epoch; paging stops after the first batch older than
+    it. The continuation token is checkpointed after every batch, so an
+    interrupted scrape resumes where it stopped (saved batches are yielded
+    first). Once exhausted, the storefront's bookkeeping is absorbed into
+    result (a ScrapeResult).
+    """
     print(f"\n  Scraping Android reviews for {country.upper()}...")
 
+    result = ScrapeResult() if result is None else result
     try:
         from google_play_scraper import reviews, Sort
     except ImportError:
         print("  ERROR: google-play-scraper not installed")
-        return []
+        result.absorb(ScrapeResult(complete=False))
+        return
 
     lang = COUNTRY_LANGUAGE_MAP.get(country, "en")
-    all_reviews = []
-    continuation_token = None
+    checkpoints = scrape_checkpoints()
+    key = checkpoints.key("Google Play", country)
+    state = checkpoints.resume(key, max_reviews)
+    tally = ReviewTally()
+    fetched = state["saved"] if state else 0
+    continuation_token = state["cursor"] if state else None
     batch_size = 100
+    if state:
+        for batch in checkpoints.pages(key):
+            tally.add(batch)
+            yield batch
+        if state["done"]:
+            print(f"  Using {fetched} Android reviews from {country.upper()} checkpoint")
+            result.absorb(tally.result(country, complete=True, checkpoint=key))
+            return
+        print(f"  Resuming {country.upper()} after {fetched} saved reviews")
 
     try:
-        fetched = 0
         while fetched < max_reviews:
-            result, continuation_token = reviews(
+            page, continuation_token = rate_limited_call("play", lambda: reviews(
                 APP_CONFIG["android"]["package_id"],
                 lang=lang,
                 country=country,
                 sort=Sort.NEWEST,
                 count=min(batch_size, max_reviews - fetched),
                 continuation_token=continuation_token
-            )
+            ), host=PLAY_STORE_HOST)
 
-            if not result:
+            if not page:
                 break
 
-            for review in result:
+            batch = []
+            for review in page:
                 review_date = review.get('at')
-                all_reviews.append({
+                batch.append({
                     "id": review.get("reviewId", ""),
                     "author": review.get("userName", "Unknown"),
                     "rating": review.get("score", 0),
@@ -1010,58 +2444,285 @@ def scrape_android_reviews(country="us", max_reviews=500):
                     "reply_content": review.get("replyContent", ""),
                 })
 
-            fetched += len(result)
+            fetched += len(page)
+            checkpoints.save(key, continuation_token, batch, max_reviews)
+            tally.add(batch)
+            yield batch
 
             if continuation_token is None:
                 break
+            if page_before_watermark(batch, since):
+                print(f"  Reached stored reviews for {country.upper()}")
+                break
 
-        print(f"  Fetched {len(all_reviews)} Android reviews from {country.upper()}")
-        return all_reviews
+        checkpoints.finish(key, max_reviews)
+        print(f"  Fetched {tally.reviews} Android reviews from {country.upper()}")
+        result.absorb(tally.result(country, complete=True, checkpoint=key))
 
     except Exception as e:
         print(f"  Error scraping Android {country}: {e}")
-        return all_reviews
+        result.absorb(tally.result(country, complete=False))
+
+
+def scrape_android_reviews(country="us", max_reviews=500, since=None):
+    """Scrape one Google Play storefront into a ScrapeResult (see iter_android_review_pages)"""
+    return collect_pages(iter_android_review_pages, country, max_reviews, since)
 
 
-def scrape_android_all_countries(max_reviews_per_country=500):
+def iter_android_all_countries(max_reviews_per_country=500, workers=SCRAPE_WORKERS,
+                               watermarks=None, processes=False, depths=None, result=None):
+    """
+    Generator form of scrape_android_all_countries: yields batches of
+    reviews tagged 'global' in storefront order, holding at most a few
+    batches per worker in memory (see stream_storefronts; with
+    processes=True whole storefronts are held instead). result absorbs
+    the bookkeeping of every storefront.
+    """
+    countries = ALL_COUNTRIES if depths is None else list(depths)
+    if processes:
+        workers = min(workers, HOST_CONCURRENCY.get(PLAY_STORE_HOST, DEFAULT_HOST_CONCURRENCY))
+
+    for batch in stream_storefronts(iter_android_review_pages, countries, max_reviews_per_country,
+                                    workers, watermarks, processes, depths, result):
+        for r in batch:
+            r['country'] = 'global'
+        yield batch
+
+
+def scrape_android_all_countries(max_reviews_per_country=500, workers=SCRAPE_WORKERS,
+                                 watermarks=None, processes=False, depths=None):
     """Scrape Android reviews from all configured countries.
     Country tag is set to 'global' since google_play_scraper does not
     reflect the reviewer's actual location — only the storefront scraped.
+    Storefronts are fetched on up to `workers` threads, merged in
+    ALL_COUNTRIES order. watermarks maps storefront -> epoch.
+    processes=True runs each (country, lang) storefront in its own worker
+    process instead, so google_play_scraper's blocking calls and parsing
+    overlap; workers is then capped at the Play host's concurrency limit.
+    depths ({storefront: max reviews}) replaces the country list.
     """
-    all_reviews = []
+    all_reviews = ScrapeResult()
+    for batch in iter_android_all_countries(max_reviews_per_country, workers, watermarks,
+                                            processes, depths, result=all_reviews):
+        all_reviews.extend(batch)
+    return all_reviews
 
-    for country in ALL_COUNTRIES:
-        reviews = scrape_android_reviews(country, max_reviews=max_reviews_per_country)
-        for r in reviews:
-            r['country'] = 'global'
-        all_reviews.extend(reviews)
 
-    return all_reviews
+# ============================================================================
+# FETCH PLAN
+# ============================================================================
+
+# Storefront reads behind the weekly datasets: (ingest key, platform,
+# storefronts, depth). US appears in both the US and AllCountries steps.
+WEEKLY_FETCHES = [
+    ("ios_us", "iOS App Store", ["us"], 3000),
+    ("ios_all", "iOS App Store", ALL_COUNTRIES, 500),
+    ("android_us", "Google Play", ["us"], 3000),
+    ("android_all", "Google Play", ALL_COUNTRIES, 500),
+]
+
+
+# Reviews per request, and the deepest a storefront can be read (the iTunes
+# RSS feed stops after 10 pages)
+PAGE_SIZES = {"iOS App Store": 50, "Google Play": 100}
+MAX_DEPTHS = {"iOS App Store": 500, "Google Play": 5000}
+
+# Adaptive depth covers this many days of a storefront's observed velocity,
+# with headroom for bursts
+DEPTH_HORIZON_DAYS = 30
+DEPTH_HEADROOM = 1.5
+
+# A storefront is polled once about this many new reviews are expected,
+# and at least every MAX_POLL_INTERVAL seconds
+POLL_MIN_NEW = 5
+MAX_POLL_INTERVAL = 21 * 86400
+
+# Review pages one run may plan (counted from the depths; retries of
+# throttled or failed requests are not counted)
+REQUEST_BUDGET = 400
+
+
+class FetchPlan:
+    """
+    The storefront reads a run needs, with each (platform, storefront)
+    fetched once.
+
+    Every storefront is fetched at the deepest depth any step asks for, by
+    the first step that claims it; later steps skip it and read those
+    reviews from the review store, which every dataset is queried from.
+    schedule() adapts the depths to each storefront's review velocity,
+    defers storefronts that are not due, and fits the run into a request
+    budget.
+    """
+
+    def __init__(self, fetches=WEEKLY_FETCHES):
+        self.steps = {}
+        self.depths = {}
+        self.requested = 0
+        self.deferred = {}
+        self.budget = None
+        self.pages = None
+        for key, platform, storefronts, depth in fetches:
+            self.steps[key] = (platform, list(storefronts))
+            for storefront in storefronts:
+                target = (platform, storefront)
+                self.depths[target] = max(depth, self.depths.get(target, 0))
+                self.requested += 1
+        self._claimed = set()
+
+    def schedule(self, activity, budget=REQUEST_BUDGET, now=None):
+        """
+        Set depths and polling from activity ({(platform, storefront):
+        (reviews per day, last polled epoch)}, see ReviewStore.activity).
+
+        A storefront with history is read deep enough for DEPTH_HORIZON_DAYS
+        of reviews (whole pages, at least one, at most MAX_DEPTHS) and is
+        deferred while fewer than POLL_MIN_NEW new reviews are expected,
+        up to MAX_POLL_INTERVAL. Storefronts without history keep their
+        planned depth and rank as if that many new reviews were expected,
+        so a busy known storefront can outrank an unseen minor one. The
+        budget (in pages) is then shared out in that order: one page each,
+        so a tight budget reads the newest reviews everywhere before going
+        deep anywhere, then the rest of each depth. Storefronts left
+        without a page are deferred. The budget counts planned pages;
+        retries after throttling or dropped connections come on top.
+        """
+        now = time.time() if now is None else now
+        candidates = []
+        for target, depth in self.depths.items():
+            platform = target[0]
+            page = PAGE_SIZES.get(platform, 100)
+            ceiling = MAX_DEPTHS.get(platform, depth)
+            if target not in activity:
+                # No velocity yet: rank by the most reviews it could return
+                depth = min(depth, ceiling)
+                candidates.append((depth, target, depth, page))
+                continue
+            rate, polled_at = activity[target]
+            elapsed = max(0.0, now - polled_at)
+            expected = rate * elapsed / 86400
+            if expected < POLL_MIN_NEW and elapsed < MAX_POLL_INTERVAL:
+                self.deferred[target] = "not due"
+                continue
+            pages = math.ceil(rate * DEPTH_HORIZON_DAYS * DEPTH_HEADROOM / page)
+            candidates.append((expected, target, min(max(pages, 1) * page, ceiling), page))
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        admitted = []
+        for expected, target, depth, page in candidates:
+            if len(admitted) < budget:
+                admitted.append((target, depth, page))
+            else:
+                self.deferred[target] = "over budget"
+        spent = len(admitted)
+        for target, depth, page in admitted:
+            extra = min(math.ceil(depth / page) - 1, budget - spent)
+            self.depths[target] = min(depth, (1 + extra) * page)
+            spent += extra
+        for target in self.deferred:
+            self.depths.pop(target, None)
+        self.budget, self.pages = budget, spent
+        return self
+
+    def claim(self, key):
+        """{storefront: depth} step key still has to fetch, in its storefront order"""
+        platform, storefronts = self.steps[key]
+        todo = {}
+        for storefront in storefronts:
+            target = (platform, storefront)
+            if target in self.depths and target not in self._claimed:
+                self._claimed.add(target)
+                todo[storefront] = self.depths[target]
+        return todo
+
+    def describe(self):
+        text = (f"{len(self.depths)} storefront fetches for {self.requested} requested "
+                f"({self.requested - len(self.depths) - len(self.deferred)} shared")
+        if self.deferred:
+            text += f", {len(self.deferred)} deferred"
+        if self.budget is not None:
+            text += f"; at most {self.pages} of {self.budget} budgeted pages"
+        return text + ")"
 
 
 # ============================================================================
 # INSIGHTS AGENT
 # ============================================================================
 
-def run_insights_agent(reviews_file, output_name):
+def run_insights_agent(reviews_file, output_name, workers=1):
     """Run the CustomerInsight_Review_Agent on a data file"""
     print(f"\n  Running Insights Agent on {os.path.basename(reviews_file)}...")
 
     # Import the agent
-    sys.path.insert(0, PROJECT_ROOT)
     try:
-        from CustomerInsight_Review_Agent import load_reviews, analyze_reviews, save_insights_json
+        from CustomerInsight_Review_Agent import analyze_review_file, ClassificationCache
     except ImportError:
         print("  ERROR: CustomerInsight_Review_Agent not found")
         return None
 
-    # Load and analyze
-    reviews = load_reviews(reviews_file)
-    if not reviews:
+    # Stream (JSON) or column-load (CSV) and analyze
+    with ClassificationCache(CLASSIFICATION_CACHE_FILE) as cache:
+        analysis = analyze_review_file(reviews_file, workers=workers, cache=cache)
+    if not analysis["total_reviews"]:
         print("  No reviews to analyze")
         return None
+    print(f"  Classification cache: {cache.hits} hits, {cache.misses} classified")
 
-    analysis = analyze_reviews(reviews)
+    save_insights_reports(analysis, reviews_file, output_name)
+    return analysis
+
+
+def run_insights_for_datasets(datasets, workers=1):
+    """
+    Run the insights agent on several overlapping datasets.
+
+    The datasets share most of their reviews (the Combined files are
+    concatenations of the others), so every distinct review is classified
+    once in a shared enrichment stage and each report is then aggregated
+    from those results. Sources are streamed in both passes.
+
+    datasets: list of (source, output_name). A source is a data file
+    (missing files are skipped) or a callable returning an iterable of
+    reviews, e.g. a review store query.
+    Returns {output_name: analysis}.
+    """
+    try:
+        from CustomerInsight_Review_Agent import (
+            iter_reviews, analyze_reviews, ClassificationCache, SharedClassifications
+        )
+    except ImportError:
+        print("  ERROR: CustomerInsight_Review_Agent not found")
+        return {}
+
+    def open_source(source):
+        return source() if callable(source) else iter_reviews(source)
+
+    datasets = [(src, name) for src, name in datasets if callable(src) or os.path.exists(src)]
+
+    results = {}
+    with ClassificationCache(CLASSIFICATION_CACHE_FILE) as cache:
+        shared = SharedClassifications(backing=cache)
+        unique = shared.enrich((open_source(src) for src, _ in datasets), workers=workers)
+        print(f"\n  Shared enrichment: {unique} unique reviews across {len(datasets)} datasets "
+              f"({cache.hits} cached, {cache.misses} classified)")
+
+        for source, output_name in datasets:
+            source_file = REVIEW_STORE_FILE if callable(source) else source
+            label = output_name if callable(source) else os.path.basename(source)
+            print(f"\n  Running Insights Agent on {label}...")
+            analysis = analyze_reviews(open_source(source), cache=shared)
+            if not analysis["total_reviews"]:
+                print("  No reviews to analyze")
+                continue
+            save_insights_reports(analysis, source_file, output_name)
+            results[output_name] = analysis
+
+    return results
+
+
+def save_insights_reports(analysis, reviews_file, output_name):
+    """Write the insights JSON and markdown report for one dataset"""
+    from CustomerInsight_Review_Agent import save_insights_json
 
     # Save insights JSON
     json_output = os.path.join(REPORTS_DIR, f"{output_name}_Insights.json")
@@ -1071,8 +2732,6 @@ def run_insights_agent(reviews_file, output_name):
     md_output = os.path.join(INSIGHTS_DIR, f"{output_name}_Insights.md")
     generate_insights_markdown(analysis, reviews_file, md_output, output_name)
 
-    return analysis
-
 
 def generate_insights_markdown(analysis, source_file, output_file, title):
     """Generate a markdown insights report"""
@@ -1095,9 +2754,9 @@ def generate_insights_markdown(analysis, source_file, output_file, title):
     # Get current app store rating and trend
     current_ratings = {}
     rating_trend = None
-    if os.path.exists(os.path.join(DATA_DIR, "current_app_ratings.json")):
+    if os.path.exists(CURRENT_RATINGS_FILE):
         try:
-            with open(os.path.join(DATA_DIR, "current_app_ratings.json"), 'r') as f:
+            with open(CURRENT_RATINGS_FILE, 'r') as f:
                 current_ratings = json.load(f)
         except (json.JSONDecodeError, IOError):
             pass
@@ -1724,10 +3383,25 @@ def generate_combined_sentiment_view(current_ratings):
 # MAIN WEEKLY SCRAPER
 # ============================================================================
 
-def run_weekly_scrape():
+def run_weekly_scrape(workers=1, export=True, columnar=False, scrape_workers=SCRAPE_WORKERS,
+                      incremental=True, restart=False, play_processes=False,
+                      request_budget=REQUEST_BUDGET):
     """
     Main weekly scraping function.
 
+    New reviews are upserted into the review store and every dataset is
+    published from it. export=False skips the per-dataset JSON/CSV files
+    (analytics files are always written); columnar=True also writes each
+    dataset as a memory-mappable review corpus directory. scrape_workers
+    is the number of storefronts scraped at once in the AllCountries steps;
+    play_processes=True scrapes the Play storefronts in worker processes.
+    With incremental=True each storefront is only paged back to its stored
+    watermark, and the fetch plan is scheduled from each storefront's
+    review velocity within request_budget (see FetchPlan.schedule);
+    incremental=False re-reads every storefront to full depth.
+    Storefronts finished by an interrupted earlier run are taken from their
+    checkpoints unless restart=True.
+
     Collects:
     1. iOS US - Last 30 days rolling
     2. iOS All Countries - Last 30 days rolling
@@ -1751,7 +3425,37 @@ def run_weekly_scrape():
     print("  [0/7] Recording App Store Ratings (iOS & Android)")
     print("-"*70)
 
-    current_ratings = record_app_ratings()
+    current_ratings = record_app_ratings(reuse_within=RATINGS_REUSE_AGE)
+
+    store = open_review_store()
+    plan = FetchPlan()
+    if incremental:
+        plan.schedule(store.activity(), budget=request_budget)
+    print(f"\n  Fetch plan: {plan.describe()}")
+    for (platform, storefront), reason in plan.deferred.items():
+        print(f"    deferred {platform} {storefront.upper()}: {reason}")
+    specs = {spec["key"]: spec for spec in STORE_DATASETS}
+    ingest = {}
+    if restart:
+        scrape_checkpoints().clear()
+
+    def watermarks(platform):
+        return store.watermarks(platform) if incremental else {}
+
+    def ingest_scrape(key, platform, pages, scraped):
+        """
+        Upsert a scrape page by page as it streams in, then advance its
+        watermarks. scraped is the ScrapeResult the scraper fills with
+        bookkeeping. False if nothing usable came back.
+        """
+        stats = store.upsert(review for page in pages for review in page)
+        if not (stats["added"] or stats["skipped"] or stats["updated"]) and not scraped.complete:
+            return False
+        ingest[key] = stats
+        store.advance_watermarks(platform, scraped.watermarks)
+        store.record_activity(platform, scraped.activity)
+        scrape_checkpoints().release(scraped.checkpoints)
+        return True
 
     # -------------------------------------------------------------------------
     # 1. iOS US - Last 30 Days Rolling
@@ -1760,23 +3464,17 @@ def run_weekly_scrape():
     print("  [1/7] iOS US - Last 30 Days Rolling")
     print("-"*70)
 
-    ios_us_30d_file = os.path.join(IOS_DATA_DIR, "HP_App_iOS_US_Last30Days.json")
-    existing_ios_us_30d = load_existing_reviews(ios_us_30d_file)
-
-    new_ios_us = scrape_ios_reviews(country="us", max_reviews=3000)
+    # Pages go straight from the scraper into the store
+    depths = plan.claim('ios_us')
+    ios_us = ScrapeResult()
+    pages = ()
+    if depths:
+        pages = iter_ios_review_pages(country="us", max_reviews=depths["us"],
+                                      since=watermarks("iOS App Store").get("us"), result=ios_us)
 
-    if new_ios_us:
-        # Deduplicate
-        merged = deduplicate_reviews(existing_ios_us_30d, new_ios_us)
-        # Filter to last 30 days
-        filtered = filter_reviews_by_date(merged, 30)
-        # Save
-        save_reviews(filtered, ios_us_30d_file)
-        save_to_csv(filtered, ios_us_30d_file.replace('.json', '.csv'))
-        # Analytics
-        analytics = generate_analytics(filtered, "iOS App Store", "US", days=30)
-        save_reviews(analytics, ios_us_30d_file.replace('.json', '_Analytics.json'))
-        results['ios_us_30d'] = len(filtered)
+    ios_us_ok = ingest_scrape('ios_us', "iOS App Store", pages, ios_us)
+    if ios_us_ok:
+        results['ios_us_30d'] = len(publish_dataset(store, specs['ios_us_30d'], export, columnar))
 
     # -------------------------------------------------------------------------
     # 2. iOS All Countries - Last 30 Days Rolling
@@ -1785,19 +3483,13 @@ def run_weekly_scrape():
     print("  [2/7] iOS All Countries - Last 30 Days Rolling")
     print("-"*70)
 
-    ios_all_30d_file = os.path.join(IOS_DATA_DIR, "HP_App_iOS_AllCountries_Last30Days.json")
-    existing_ios_all_30d = load_existing_reviews(ios_all_30d_file)
-
-    new_ios_all = scrape_ios_all_countries(max_reviews_per_country=500)
+    # US was fetched at full depth in step 1; its reviews are read from the store
+    ios_all = ScrapeResult()
+    pages = iter_ios_all_countries(workers=scrape_workers, watermarks=watermarks("iOS App Store"),
+                                   depths=plan.claim('ios_all'), result=ios_all)
 
-    if new_ios_all:
-        merged = deduplicate_reviews(existing_ios_all_30d, new_ios_all)
-        filtered = filter_reviews_by_date(merged, 30)
-        save_reviews(filtered, ios_all_30d_file)
-        save_to_csv(filtered, ios_all_30d_file.replace('.json', '.csv'))
-        analytics = generate_analytics(filtered, "iOS App Store", "AllCountries", days=30)
-        save_reviews(analytics, ios_all_30d_file.replace('.json', '_Analytics.json'))
-        results['ios_all_30d'] = len(filtered)
+    if ingest_scrape('ios_all', "iOS App Store", pages, ios_all):
+        results['ios_all_30d'] = len(publish_dataset(store, specs['ios_all_30d'], export, columnar))
 
     # -------------------------------------------------------------------------
     # 3. iOS US - Last 500 Reviews
@@ -1806,19 +3498,9 @@ def run_weekly_scrape():
     print("  [3/7] iOS US - Last 500 Reviews")
     print("-"*70)
 
-    ios_us_500_file = os.path.join(IOS_DATA_DIR, "HP_App_iOS_US_Last500.json")
-    existing_ios_500 = load_existing_reviews(ios_us_500_file)
-
-    # Use reviews already fetched in step 1
-    if new_ios_us:
-        merged = deduplicate_reviews(existing_ios_500, new_ios_us)
-        # Keep only latest 500
-        latest_500 = merged[:500]
-        save_reviews(latest_500, ios_us_500_file)
-        save_to_csv(latest_500, ios_us_500_file.replace('.json', '.csv'))
-        analytics = generate_analytics(latest_500, "iOS App Store", "US")
-        save_reviews(analytics, ios_us_500_file.replace('.json', '_Analytics.json'))
-        results['ios_us_500'] = len(latest_500)
+    # Reviews fetched in step 1 are already in the store
+    if ios_us_ok:
+        results['ios_us_500'] = len(publish_dataset(store, specs['ios_us_500'], export, columnar))
 
     # -------------------------------------------------------------------------
     # 4. Android US - Last 30 Days Rolling
@@ -1827,19 +3509,17 @@ def run_weekly_scrape():
     print("  [4/7] Android US - Last 30 Days Rolling")
     print("-"*70)
 
-    android_us_30d_file = os.path.join(ANDROID_DATA_DIR, "HP_App_Android_US_Last30Days.json")
-    existing_android_us_30d = load_existing_reviews(android_us_30d_file)
-
-    new_android_us = scrape_android_reviews(country="us", max_reviews=3000)
+    depths = plan.claim('android_us')
+    android_us = ScrapeResult()
+    pages = ()
+    if depths:
+        pages = iter_android_review_pages(country="us", max_reviews=depths["us"],
+                                          since=watermarks("Google Play").get("us"),
+                                          result=android_us)
 
-    if new_android_us:
-        merged = deduplicate_reviews(existing_android_us_30d, new_android_us)
-        filtered = filter_reviews_by_date(merged, 30)
-        save_reviews(filtered, android_us_30d_file)
-        save_to_csv(filtered, android_us_30d_file.replace('.json', '.csv'))
-        analytics = generate_analytics(filtered, "Google Play", "US", days=30)
-        save_reviews(analytics, android_us_30d_file.replace('.json', '_Analytics.json'))
-        results['android_us_30d'] = len(filtered)
+    android_us_ok = ingest_scrape('android_us', "Google Play", pages, android_us)
+    if android_us_ok:
+        results['android_us_30d'] = len(publish_dataset(store, specs['android_us_30d'], export, columnar))
 
     # -------------------------------------------------------------------------
     # 5. Android All Countries - Last 30 Days Rolling
@@ -1848,19 +3528,15 @@ def run_weekly_scrape():
     print("  [5/7] Android All Countries - Last 30 Days Rolling")
     print("-"*70)
 
-    android_all_30d_file = os.path.join(ANDROID_DATA_DIR, "HP_App_Android_AllCountries_Last30Days.json")
-    existing_android_all_30d = load_existing_reviews(android_all_30d_file)
+    # US was fetched at full depth in step 4; its reviews are read from the store
+    android_all = ScrapeResult()
+    pages = iter_android_all_countries(workers=scrape_workers,
+                                       watermarks=watermarks("Google Play"),
+                                       processes=play_processes,
+                                       depths=plan.claim('android_all'), result=android_all)
 
-    new_android_all = scrape_android_all_countries(max_reviews_per_country=500)
-
-    if new_android_all:
-        merged = deduplicate_reviews(existing_android_all_30d, new_android_all)
-        filtered = filter_reviews_by_date(merged, 30)
-        save_reviews(filtered, android_all_30d_file)
-        save_to_csv(filtered, android_all_30d_file.replace('.json', '.csv'))
-        analytics = generate_analytics(filtered, "Google Play", "AllCountries", days=30)
-        save_reviews(analytics, android_all_30d_file.replace('.json', '_Analytics.json'))
-        results['android_all_30d'] = len(filtered)
+    if ingest_scrape('android_all', "Google Play", pages, android_all):
+        results['android_all_30d'] = len(publish_dataset(store, specs['android_all_30d'], export, columnar))
 
     # -------------------------------------------------------------------------
     # 6. Android US - Last 500 Reviews
@@ -1869,18 +3545,9 @@ def run_weekly_scrape():
     print("  [6/7] Android US - Last 500 Reviews")
     print("-"*70)
 
-    android_us_500_file = os.path.join(ANDROID_DATA_DIR, "HP_App_Android_US_Last500.json")
-    existing_android_500 = load_existing_reviews(android_us_500_file)
-
-    # Use reviews already fetched in step 4
-    if new_android_us:
-        merged = deduplicate_reviews(existing_android_500, new_android_us)
-        latest_500 = merged[:500]
-        save_reviews(latest_500, android_us_500_file)
-        save_to_csv(latest_500, android_us_500_file.replace('.json', '.csv'))
-        analytics = generate_analytics(latest_500, "Google Play", "US")
-        save_reviews(analytics, android_us_500_file.replace('.json', '_Analytics.json'))
-        results['android_us_500'] = len(latest_500)
+    # Reviews fetched in step 4 are already in the store
+    if android_us_ok:
+        results['android_us_500'] = len(publish_dataset(store, specs['android_us_500'], export, columnar))
 
     # -------------------------------------------------------------------------
     # 7. Run Insights Agent on All Data
@@ -1889,54 +3556,34 @@ def run_weekly_scrape():
     print("  [7/7] Running CustomerInsight_Review_Agent")
     print("-"*70)
 
-    # Run insights on each dataset
-    # iOS datasets
-    if os.path.exists(ios_us_30d_file):
-        run_insights_agent(ios_us_30d_file, "HP_App_iOS_US_Last30Days")
-
-    if os.path.exists(ios_all_30d_file):
-        run_insights_agent(ios_all_30d_file, "HP_App_iOS_AllCountries_Last30Days")
-
-    if os.path.exists(ios_us_500_file):
-        run_insights_agent(ios_us_500_file, "HP_App_iOS_US_Last500")
-
-    # Android datasets
-    if os.path.exists(android_us_30d_file):
-        run_insights_agent(android_us_30d_file, "HP_App_Android_US_Last30Days")
-
-    if os.path.exists(android_all_30d_file):
-        run_insights_agent(android_all_30d_file, "HP_App_Android_AllCountries_Last30Days")
-
-    if os.path.exists(android_us_500_file):
-        run_insights_agent(android_us_500_file, "HP_App_Android_US_Last500")
-
-    # Combined iOS + Android US analysis (using 30-day rolling data)
-    combined_file = os.path.join(DATA_DIR, "HP_App_Combined_US_Last30Days.json")
-    combined_reviews = []
-
-    if os.path.exists(ios_us_30d_file):
-        combined_reviews.extend(load_existing_reviews(ios_us_30d_file))
-    if os.path.exists(android_us_30d_file):
-        combined_reviews.extend(load_existing_reviews(android_us_30d_file))
-
-    if combined_reviews:
-        save_reviews(combined_reviews, combined_file)
-        run_insights_agent(combined_file, "HP_App_Combined_US_Last30Days")
-        results['combined_us_30d'] = len(combined_reviews)
-
-    # Combined All Countries analysis
-    combined_all_file = os.path.join(DATA_DIR, "HP_App_Combined_AllCountries_Last30Days.json")
-    combined_all_reviews = []
-
-    if os.path.exists(ios_all_30d_file):
-        combined_all_reviews.extend(load_existing_reviews(ios_all_30d_file))
-    if os.path.exists(android_all_30d_file):
-        combined_all_reviews.extend(load_existing_reviews(android_all_30d_file))
+    # Combined iOS + Android (using 30-day rolling data)
+    combined = [
+        ("HP_App_Combined_US_Last30Days", "combined_us_30d", ["ios_us_30d", "android_us_30d"]),
+        ("HP_App_Combined_AllCountries_Last30Days", "combined_all_30d",
+         ["ios_all_30d", "android_all_30d"]),
+    ]
+    insight_sources = {spec["name"]: [spec] for spec in STORE_DATASETS}
+    for name, key, parts in combined:
+        reviews = [r for part in parts for r in store.query_dataset(specs[part])]
+        if reviews:
+            if export:
+                save_reviews(reviews, os.path.join(DATA_DIR, f"{name}.json"))
+            results[key] = len(reviews)
+            insight_sources[name] = [specs[part] for part in parts]
+
+    # Run insights on every dataset; each review is classified once.
+    # Exports are read back as files; otherwise the store is queried directly.
+    insight_datasets = []
+    for name, parts in insight_sources.items():
+        if export:
+            data_dir = parts[0]["dir"] if len(parts) == 1 else DATA_DIR
+            insight_datasets.append((os.path.join(data_dir, f"{name}.json"), name))
+        else:
+            insight_datasets.append(
+                (lambda parts=parts: (r for p in parts for r in store.query_dataset(p)), name))
 
-    if combined_all_reviews:
-        save_reviews(combined_all_reviews, combined_all_file)
-        run_insights_agent(combined_all_file, "HP_App_Combined_AllCountries_Last30Days")
-        results['combined_all_30d'] = len(combined_all_reviews)
+    run_insights_for_datasets(insight_datasets, workers=workers)
+    store.close()
 
     # -------------------------------------------------------------------------
     # Summary
@@ -1949,6 +3596,17 @@ def run_weekly_scrape():
     for key, count in results.items():
         print(f"    {key}: {count} reviews")
 
+    if ingest:
+        print("\n  Ingest Summary:")
+        for key, stats in ingest.items():
+            print(f"    {key}: {stats['added']} added, {stats['skipped']} skipped, "
+                  f"{stats['updated']} updated")
+
+    cache = store_client().cache
+    if cache is not None:
+        print(f"\n  HTTP Cache: {cache.hits} served locally, {cache.revalidated} revalidated, "
+              f"{cache.misses} fetched")
+
     # Print current ratings
     if current_ratings:
         print("\n  App Store Ratings:")
@@ -1969,6 +3627,7 @@ def run_weekly_scrape():
     summary = {
         "scrape_date": datetime.now().isoformat(),
         "results": results,
+        "ingest": ingest,
         "total_reviews": sum(results.values()),
         "app_ratings": {
             "ios_us": current_ratings.get("ios", {}).get("us", {}).get("rating") if current_ratings else None,
@@ -2102,6 +3761,106 @@ def run_accuracy_tests():
         return None
 
 
+# ============================================================================
+# OFFLINE RECORD / REPLAY
+# ============================================================================
+
+# The harness itself (fixtures, stand-in server, google_play_scraper
+# stand-ins) lives in store_replay.py and is only imported for --record
+# and --replay.
+
+# ("record", fixture_dir) or ("replay", stand-in base URL) once set up, so
+# scrape worker processes can install the same hooks
+_store_traffic = None
+
+# Directory holding this run's files instead of data/ and output/ (see use_state_dir)
+_state_dir = None
+
+
+def use_state_dir(state_dir):
+    """
+    Keep every file a run writes under state_dir instead of data/ and
+    output/: the review store, scrape checkpoints, rating history, current
+    ratings snapshot, HTTP and classification caches and the dataset
+    exports and analytics directly in it, and the reports under
+    state_dir/output. A replayed run therefore cannot touch the real (and
+    committed) files. A new store there is seeded from exports already in
+    state_dir, so a fresh state directory starts empty.
+    """
+    global _state_dir, DATA_DIR, IOS_DATA_DIR, ANDROID_DATA_DIR, OUTPUT_DIR, INSIGHTS_DIR
+    global REPORTS_DIR, VISUALIZATIONS_DIR, REVIEW_STORE_FILE, CHECKPOINT_FILE
+    global RATING_HISTORY_FILE, CURRENT_RATINGS_FILE, HTTP_CACHE_FILE, CLASSIFICATION_CACHE_FILE
+    global STORE_DATASETS
+    _state_dir = state_dir
+    DATA_DIR = state_dir
+    IOS_DATA_DIR = os.path.join(DATA_DIR, "ios")
+    ANDROID_DATA_DIR = os.path.join(DATA_DIR, "googleplay")
+    OUTPUT_DIR = os.path.join(state_dir, "output")
+    INSIGHTS_DIR = os.path.join(OUTPUT_DIR, "insights")
+    REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
+    VISUALIZATIONS_DIR = os.path.join(OUTPUT_DIR, "visualizations")
+    REVIEW_STORE_FILE = os.path.join(DATA_DIR, "reviews.sqlite")
+    CHECKPOINT_FILE = os.path.join(DATA_DIR, "scrape_checkpoints.sqlite")
+    RATING_HISTORY_FILE = os.path.join(DATA_DIR, "app_rating_history.json")
+    CURRENT_RATINGS_FILE = os.path.join(DATA_DIR, "current_app_ratings.json")
+    HTTP_CACHE_FILE = os.path.join(DATA_DIR, "http_cache.sqlite")
+    CLASSIFICATION_CACHE_FILE = os.path.join(DATA_DIR, "classification_cache.sqlite")
+    STORE_DATASETS = [dict(spec, dir=IOS_DATA_DIR if spec["platform"] == "iOS App Store"
+                           else ANDROID_DATA_DIR) for spec in STORE_DATASETS]
+    for d in [IOS_DATA_DIR, ANDROID_DATA_DIR, INSIGHTS_DIR, REPORTS_DIR, VISUALIZATIONS_DIR]:
+        os.makedirs(d, exist_ok=True)
+
+
+def _install_store_traffic(mode, target):
+    """Hook this process's store traffic up to the recorder (fixture dir) or the stand-in (URL)"""
+    import store_replay
+
+    if mode == "record":
+        return store_replay.install_recorder(store_client(), store_replay.StoreFixtures(target),
+                                             ResponseCache.key)
+    store_replay.install_stand_in(store_client(), target, ResponseCache.key, DEFAULT_TIMEOUT)
+    return True
+
+
+def record_store_traffic(fixture_dir):
+    """
+    Record every store response of this process into fixture_dir: iTunes
+    requests through the StoreClient, and google_play_scraper reviews()/app()
+    calls. The HTTP cache is bypassed so every response is captured.
+    """
+    global _store_traffic
+    if not _install_store_traffic("record", fixture_dir):
+        print("  WARNING: google-play-scraper not installed; Play calls are not recorded")
+    _store_traffic = ("record", fixture_dir)
+    print(f"  Recording store traffic to {fixture_dir}")
+
+
+def replay_store_traffic(fixture_dir, state_dir=None, **options):
+    """
+    Serve all store traffic of this process from fixture_dir through a
+    store_replay.StoreStandIn (options: latency, jitter, error_rate,
+    error_status, retry_after, seed). google_play_scraper is replaced by a
+    stand-in module, so it does not need to be installed. Returns the
+    running StoreStandIn; its counters report requests, injected errors
+    and missing fixtures.
+
+    The HTTP cache is bypassed, and everything the run writes goes to
+    state_dir (a new temporary directory by default; see use_state_dir),
+    so replays neither read nor modify the real data/ and output/ files.
+    """
+    from store_replay import StoreStandIn
+
+    global _store_traffic, HTTP_CACHE_ENABLED
+    HTTP_CACHE_ENABLED = False
+    use_state_dir(state_dir or tempfile.mkdtemp(prefix="store-replay-"))
+    standin = StoreStandIn(fixture_dir, **options)
+    base_url = standin.start()
+    _install_store_traffic("replay", base_url)
+    _store_traffic = ("replay", base_url)
+    print(f"  Replaying store traffic from {fixture_dir} via {base_url} (state in {_state_dir})")
+    return standin
+
+
 # ============================================================================
 # CLI
 # ============================================================================
@@ -2119,8 +3878,53 @@ if __name__ == "__main__":
     parser.add_argument("--run-tests", action="store_true", help="Run test suite before scraping")
     parser.add_argument("--tests-only", action="store_true", help="Run test suite only (no scraping)")
     parser.add_argument("--accuracy-only", action="store_true", help="Run accuracy evaluation only")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for insights analysis")
+    parser.add_argument("--no-export", action="store_true",
+                        help="Keep datasets in the review store only (skip JSON/CSV exports)")
+    parser.add_argument("--columnar", action="store_true",
+                        help="Also write each dataset as a columnar review corpus (.columns)")
+    parser.add_argument("--scrape-workers", type=int, default=SCRAPE_WORKERS,
+                        help=f"Storefronts scraped concurrently (default: {SCRAPE_WORKERS}, 1 = serial)")
+    parser.add_argument("--play-processes", action="store_true",
+                        help="Scrape Google Play storefronts in worker processes instead of threads "
+                             "(each storefront is held in memory whole, not streamed page by page)")
+    parser.add_argument("--host-limit", type=int, default=None,
+                        help="Max concurrent requests per store host, for this run "
+                             "(replaces every HOST_CONCURRENCY entry and the default)")
+    parser.add_argument("--full-scrape", action="store_true",
+                        help="Ignore stored watermarks and page every storefront to full depth")
+    parser.add_argument("--request-budget", type=int, default=REQUEST_BUDGET,
+                        help=f"Max review pages planned per run, not counting retries "
+                             f"(default: {REQUEST_BUDGET})")
+    parser.add_argument("--restart", action="store_true",
+                        help="Discard checkpoints from an interrupted scrape and start over")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="Ignore cached store responses and always refetch")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Record every store response to fixture directory DIR")
+    parser.add_argument("--replay", metavar="DIR",
+                        help="Serve store responses from fixture directory DIR (no network)")
+    parser.add_argument("--replay-state", metavar="DIR",
+                        help="Write a replayed run's store, checkpoints, datasets and reports to DIR "
+                             "(default: a new temporary directory)")
+    parser.add_argument("--replay-latency", type=float, default=0.0,
+                        help="Seconds of simulated latency per replayed request")
+    parser.add_argument("--replay-error-rate", type=float, default=0.0,
+                        help="Fraction of replayed requests answered with 503")
 
     args = parser.parse_args()
+    if args.no_http_cache:
+        HTTP_CACHE_ENABLED = False
+    if args.record:
+        record_store_traffic(args.record)
+    elif args.replay:
+        replay_store_traffic(args.replay, state_dir=args.replay_state,
+                             latency=args.replay_latency, error_rate=args.replay_error_rate,
+                             retry_after=1)
+    if args.host_limit:
+        for host in list(HOST_CONCURRENCY):
+            set_host_concurrency(args.host_limit, host)
+        set_host_concurrency(args.host_limit)
 
     if args.tests_only:
         # Run test suite only
@@ -2169,10 +3973,10 @@ if __name__ == "__main__":
             os.path.join(DATA_DIR, "HP_App_Combined_US_Last30Days.json"),
             os.path.join(DATA_DIR, "HP_App_Combined_AllCountries_Last30Days.json"),
         ]
-        for data_file in data_files:
-            if os.path.exists(data_file):
-                name = os.path.basename(data_file).replace('.json', '')
-                run_insights_agent(data_file, name)
+        run_insights_for_datasets(
+            [(data_file, os.path.basename(data_file).replace('.json', '')) for data_file in data_files],
+            workers=args.workers,
+        )
         # Also generate rating history report
         generate_rating_history_report()
     elif args.run_tests:
@@ -2181,7 +3985,13 @@ if __name__ == "__main__":
         test_success = run_tests(verbose=True)
         if not test_success:
             print("\n  WARNING: Some tests failed. Continuing with scrape anyway...")
-        run_weekly_scrape()
+        run_weekly_scrape(workers=args.workers, export=not args.no_export, columnar=args.columnar,
+                          scrape_workers=args.scrape_workers, incremental=not args.full_scrape,
+                          restart=args.restart, play_processes=args.play_processes,
+                          request_budget=args.request_budget)
     else:
         # Run full weekly scrape
-        run_weekly_scrape()
+        run_weekly_scrape(workers=args.workers, export=not args.no_export, columnar=args.columnar,
+                          scrape_workers=args.scrape_workers, incremental=not args.full_scrape,
+                          restart=args.restart, play_processes=args.play_processes,
+                          request_budget=args.request_budget)
@@ -0,0 +1,106 @@
+"""
+Unit tests for the streaming ReviewAnalysisAccumulator
+"""
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CustomerInsight_Review_Agent import ReviewAnalysisAccumulator, analyze_reviews
+
+
+def as_json(analysis):
+    """Serialize an analysis dict preserving key order"""
+    return json.dumps(analysis, default=dict)
+
+
+@pytest.fixture
+def golden_reviews(golden_dataset):
+    """Golden dataset reviews repeated so categories overflow the sample cap"""
+    return golden_dataset * 3
+
+
+class TestStreaming:
+    """Tests for update() over iterators"""
+
+    def test_same_as_analyze_reviews(self, golden_reviews):
+        """Result matches analyze_reviews exactly"""
+        acc = ReviewAnalysisAccumulator().update(iter(golden_reviews))
+        assert as_json(acc.result()) == as_json(analyze_reviews(golden_reviews))
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64])
+    def test_chunk_size_does_not_change_result(self, golden_reviews, chunk_size):
+        """Small chunks give the same answer as one big chunk"""
+        acc = ReviewAnalysisAccumulator(chunk_size=chunk_size).update(golden_reviews)
+        assert as_json(acc.result()) == as_json(analyze_reviews(golden_reviews))
+
+    def test_generator_input(self, sample_reviews_list):
+        """Generators are consumed without needing len()"""
+        acc = ReviewAnalysisAccumulator().update(r for r in sample_reviews_list)
+        assert acc.result()["total_reviews"] == len(sample_reviews_list)
+
+    def test_empty(self):
+        """Empty accumulator matches analyze_reviews([])"""
+        assert as_json(ReviewAnalysisAccumulator().result()) == as_json(analyze_reviews([]))
+
+    def test_incremental_updates(self, golden_reviews):
+        """Several update() calls equal one call over the concatenation"""
+        acc = ReviewAnalysisAccumulator()
+        acc.update(golden_reviews[:10])
+        acc.update(golden_reviews[10:])
+        assert as_json(acc.result()) == as_json(analyze_reviews(golden_reviews))
+
+
+class TestMerge:
+    """Tests for merge() of partial results"""
+
+    @pytest.mark.parametrize("split", [0, 1, 13, 50])
+    def test_merge_in_order(self, golden_reviews, split):
+        """Merging ordered partials equals a sequential pass"""
+        left = ReviewAnalysisAccumulator().update(golden_reviews[:split])
+        right = ReviewAnalysisAccumulator().update(golden_reviews[split:])
+        assert as_json(left.merge(right).result()) == as_json(analyze_reviews(golden_reviews))
+
+    def test_merge_many_shards(self, golden_reviews):
+        """Merging many shards equals a sequential pass"""
+        total = ReviewAnalysisAccumulator()
+        for i in range(0, len(golden_reviews), 9):
+            total.merge(ReviewAnalysisAccumulator().update(golden_reviews[i:i + 9]))
+        assert as_json(total.result()) == as_json(analyze_reviews(golden_reviews))
+
+    def test_sample_cap_after_merge(self):
+        """Merged samples never exceed five per category"""
+        reviews = [{"content": f"WiFi review {i}", "rating": 3} for i in range(4)]
+        acc = ReviewAnalysisAccumulator().update(reviews)
+        acc.merge(ReviewAnalysisAccumulator().update(reviews))
+        assert len(acc.result()["category_reviews"]["connectivity"]) == 5
+        assert acc.result()["category_counts"]["connectivity"] == 8
+
+    def test_result_is_a_snapshot(self, sample_reviews_list):
+        """Later updates do not mutate a previously returned result"""
+        acc = ReviewAnalysisAccumulator().update(sample_reviews_list)
+        before = acc.result()
+        acc.update(sample_reviews_list)
+        assert before["total_reviews"] == len(sample_reviews_list)
+        assert before["sentiment_counts"] != acc.result()["sentiment_counts"]
+
+
+class TestShardedAnalysis:
+    """Tests for analyze_reviews(workers=N)"""
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_workers_match_single_process(self, golden_reviews, workers):
+        """Sharded result is identical to the single-process result"""
+        assert as_json(analyze_reviews(golden_reviews, workers=workers)) == \
+            as_json(analyze_reviews(golden_reviews))
+
+    def test_more_workers_than_reviews(self, sample_reviews_list):
+        """Tiny inputs still produce the full result"""
+        result = analyze_reviews(sample_reviews_list[:2], workers=8)
+        assert result["total_reviews"] == 2
+
+    def test_empty_with_workers(self):
+        """Empty input with workers returns the empty analysis"""
+        assert as_json(analyze_reviews([], workers=4)) == as_json(analyze_reviews([]))
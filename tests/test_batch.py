@@ -0,0 +1,111 @@
+"""
+Unit tests for the NumPy batch classification API
+"""
+import pytest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CustomerInsight_Review_Agent import (
+    analyze_sentiment,
+    categorize_review,
+    analyze_sentiment_batch,
+    categorize_reviews_batch,
+    classify_reviews_batch,
+    analyze_reviews,
+    SENTIMENT_CODES,
+    SENTIMENT_LABELS,
+    INSIGHT_CATEGORIES,
+)
+
+
+def mask_to_categories(mask):
+    """Expand a uint16 mask into the categorize_review() list"""
+    cats = [cat_id for bit, cat_id in enumerate(INSIGHT_CATEGORIES) if int(mask) >> bit & 1]
+    return cats if cats else ["uncategorized"]
+
+
+class TestSentimentBatch:
+    """Tests for analyze_sentiment_batch"""
+
+    def test_dtype_and_shape(self):
+        """Returns an int8 array with one label per text"""
+        labels = analyze_sentiment_batch(["Love it", "Terrible", "It exists"])
+        assert labels.dtype == np.int8
+        assert labels.shape == (3,)
+
+    def test_codes(self):
+        """Labels use SENTIMENT_CODES"""
+        labels = analyze_sentiment_batch(["Love it", "Terrible", "It exists"])
+        assert list(labels) == [SENTIMENT_CODES["positive"],
+                                SENTIMENT_CODES["negative"],
+                                SENTIMENT_CODES["neutral"]]
+
+    def test_empty_batch(self):
+        """Empty input returns an empty array"""
+        assert analyze_sentiment_batch([]).shape == (0,)
+
+    def test_matches_per_string(self, golden_dataset):
+        """Batch labels equal analyze_sentiment on every golden review"""
+        texts = [f"{r['title']} {r['content']}" for r in golden_dataset]
+        labels = analyze_sentiment_batch(texts)
+        assert [SENTIMENT_LABELS[int(x)] for x in labels] == [analyze_sentiment(t) for t in texts]
+
+
+class TestCategoryBatch:
+    """Tests for categorize_reviews_batch"""
+
+    def test_dtype(self):
+        """Returns a uint16 bitmask array"""
+        masks = categorize_reviews_batch(["WiFi issues"])
+        assert masks.dtype == np.uint16
+
+    def test_uncategorized_is_zero(self):
+        """Reviews without category keywords get a zero mask"""
+        assert int(categorize_reviews_batch(["zzz"])[0]) == 0
+
+    def test_matches_per_string(self, golden_dataset):
+        """Batch masks equal categorize_review on every golden review"""
+        texts = [f"{r['title']} {r['content']}" for r in golden_dataset]
+        masks = categorize_reviews_batch(texts)
+        assert [mask_to_categories(m) for m in masks] == [categorize_review(t) for t in texts]
+
+    def test_classify_returns_both(self):
+        """classify_reviews_batch returns labels and masks together"""
+        labels, masks = classify_reviews_batch(["Love the wifi", "zzz"])
+        assert len(labels) == len(masks) == 2
+
+
+class TestAnalyzeReviewsOnBatch:
+    """analyze_reviews built on array reductions keeps its output"""
+
+    def test_plain_python_values(self, sample_reviews_list):
+        """Counters hold Python ints, not NumPy scalars"""
+        result = analyze_reviews(sample_reviews_list)
+        for key, value in result["rating_distribution"].items():
+            assert type(key) is int and type(value) is int
+        for value in result["category_counts"].values():
+            assert type(value) is int
+        for samples in result["category_reviews"].values():
+            assert all(type(s["rating"]) is int for s in samples)
+
+    def test_first_seen_order(self):
+        """Categories appear in first-occurrence order, like Counter increments"""
+        reviews = [
+            {"content": "zzz", "rating": 3},
+            {"content": "refund the subscription", "rating": 1},
+            {"content": "wifi", "rating": 2},
+        ]
+        result = analyze_reviews(reviews)
+        assert list(result["category_counts"]) == ["uncategorized", "value", "connectivity"]
+        assert list(result["rating_distribution"]) == [3, 1, 2]
+
+    def test_samples_follow_review_order(self):
+        """Category samples are the first five matching reviews"""
+        reviews = [{"content": f"WiFi review {i}", "rating": 3} for i in range(8)]
+        result = analyze_reviews(reviews)
+        snippets = [s["snippet"] for s in result["category_reviews"]["connectivity"]]
+        assert snippets == [f"WiFi review {i}" for i in range(5)]
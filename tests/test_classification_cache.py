@@ -0,0 +1,166 @@
+"""
+Unit tests for the persistent classification cache
+"""
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CustomerInsight_Review_Agent as agent
+from CustomerInsight_Review_Agent import (
+    ClassificationCache,
+    SharedClassifications,
+    analyze_reviews,
+    taxonomy_fingerprint,
+)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Path for a throwaway cache database"""
+    return str(tmp_path / "classification_cache.sqlite")
+
+
+@pytest.fixture
+def id_reviews(golden_dataset):
+    """Golden reviews with stable ids"""
+    return [dict(r) for r in golden_dataset]
+
+
+def as_json(analysis):
+    """Serialize an analysis dict preserving key order"""
+    return json.dumps(analysis, default=dict)
+
+
+class TestCacheHits:
+    """Tests for cache hits and misses"""
+
+    def test_first_run_classifies_everything(self, cache_path, id_reviews):
+        """An empty cache misses every review"""
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(id_reviews, cache=cache)
+            assert cache.hits == 0
+            assert cache.misses == len(id_reviews)
+
+    def test_second_run_hits(self, cache_path, id_reviews):
+        """A rerun is served entirely from the cache"""
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(id_reviews, cache=cache)
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(id_reviews, cache=cache)
+            assert cache.hits == len(id_reviews)
+            assert cache.misses == 0
+
+    def test_cached_result_identical(self, cache_path, id_reviews):
+        """Results from the cache equal a fresh analysis"""
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(id_reviews, cache=cache)
+        with ClassificationCache(cache_path) as cache:
+            cached = analyze_reviews(id_reviews, cache=cache)
+        assert as_json(cached) == as_json(analyze_reviews(id_reviews))
+
+    def test_edited_review_reclassified(self, cache_path, id_reviews):
+        """Changing a review's text invalidates its cached row"""
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(id_reviews, cache=cache)
+        id_reviews[0]["content"] = "Terrible, awful, useless"
+        with ClassificationCache(cache_path) as cache:
+            result = analyze_reviews(id_reviews, cache=cache)
+            assert cache.misses == 1
+        assert as_json(result) == as_json(analyze_reviews(id_reviews))
+
+    def test_reviews_without_id_not_cached(self, cache_path):
+        """Reviews without an id are always classified"""
+        reviews = [{"content": "Love it", "rating": 5}]
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(reviews, cache=cache)
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(reviews, cache=cache)
+            assert cache.hits == 0
+
+    def test_cache_with_workers(self, cache_path, id_reviews):
+        """Sharded runs read and fill the same cache"""
+        with ClassificationCache(cache_path) as cache:
+            result = analyze_reviews(id_reviews, workers=2, cache=cache)
+            assert cache.misses == len(id_reviews)
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(id_reviews, workers=2, cache=cache)
+            assert cache.hits == len(id_reviews)
+        assert as_json(result) == as_json(analyze_reviews(id_reviews))
+
+
+class TestTaxonomyFingerprint:
+    """Tests for automatic invalidation on keyword table edits"""
+
+    def test_fingerprint_stable(self):
+        """Same tables give the same fingerprint"""
+        assert taxonomy_fingerprint() == taxonomy_fingerprint()
+
+    def test_keyword_edit_invalidates(self, cache_path, id_reviews, monkeypatch):
+        """Editing SENTIMENT_KEYWORDS discards cached rows"""
+        with ClassificationCache(cache_path) as cache:
+            analyze_reviews(id_reviews, cache=cache)
+
+        edited = dict(agent.SENTIMENT_KEYWORDS)
+        edited["positive"] = edited["positive"] + ["stellar"]
+        monkeypatch.setattr(agent, "SENTIMENT_KEYWORDS", edited)
+        agent.get_keyword_matcher(rebuild=True)
+        try:
+            with ClassificationCache(cache_path) as cache:
+                analyze_reviews(id_reviews, cache=cache)
+                assert cache.hits == 0
+        finally:
+            monkeypatch.undo()
+            agent.get_keyword_matcher(rebuild=True)
+
+
+class TestSharedClassifications:
+    """Tests for the shared enrichment stage across overlapping datasets"""
+
+    def test_union_classified_once(self, id_reviews):
+        """Overlapping datasets are enriched by distinct review"""
+        shared = SharedClassifications()
+        unique = shared.enrich([id_reviews[:20], id_reviews[10:], id_reviews])
+        assert unique == len({f"{r['title']} {r['content']}" for r in id_reviews})
+
+    def test_aggregation_needs_no_classification(self, id_reviews):
+        """After enrich(), every dataset is aggregated from shared results"""
+        shared = SharedClassifications()
+        shared.enrich([id_reviews[:20], id_reviews])
+        analyze_reviews(id_reviews[:20], cache=shared)
+        analyze_reviews(id_reviews, cache=shared)
+        assert shared.misses == 0
+
+    def test_results_match_fresh_analysis(self, id_reviews):
+        """Per-dataset results equal independent analyses"""
+        subsets = [id_reviews[:15], id_reviews[5:], id_reviews[:15] + id_reviews[5:]]
+        shared = SharedClassifications()
+        shared.enrich(subsets)
+        for subset in subsets:
+            assert as_json(analyze_reviews(subset, cache=shared)) == as_json(analyze_reviews(subset))
+
+    def test_reviews_without_id_shared(self):
+        """Reviews without ids are still shared by text"""
+        reviews = [{"content": "Love it", "rating": 5}]
+        shared = SharedClassifications()
+        shared.enrich([reviews, reviews])
+        analyze_reviews(reviews, cache=shared)
+        assert shared.hits == 1
+
+    def test_backed_by_disk_cache(self, cache_path, id_reviews):
+        """Enrichment reads and fills the on-disk cache"""
+        with ClassificationCache(cache_path) as cache:
+            SharedClassifications(backing=cache).enrich([id_reviews])
+        with ClassificationCache(cache_path) as cache:
+            SharedClassifications(backing=cache).enrich([id_reviews])
+            assert cache.misses == 0
+
+    def test_enrich_with_workers(self, id_reviews):
+        """Worker processes give the same shared results"""
+        serial = SharedClassifications()
+        serial.enrich([id_reviews])
+        parallel = SharedClassifications()
+        parallel.enrich([id_reviews], workers=2)
+        assert parallel.results == serial.results
@@ -7,9 +7,18 @@ import csv
 import os
 import sys
 
+import numpy as np
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from CustomerInsight_Review_Agent import load_reviews
+from CustomerInsight_Review_Agent import (
+    load_reviews,
+    iter_reviews,
+    iter_json_array,
+    load_review_columns,
+    analyze_reviews,
+    analyze_review_file,
+)
 
 
 class TestLoadJSON:
@@ -191,3 +200,126 @@ class TestLargeFiles:
                 writer.writerow({"content": f"Review {i}", "rating": (i % 5) + 1})
         reviews = load_reviews(str(filepath))
         assert len(reviews) == 100
+
+
+class TestStreamingLoader:
+    """Tests for iter_json_array / iter_reviews"""
+
+    @pytest.mark.parametrize("read_size", [1, 3, 17, 65536])
+    def test_matches_json_load(self, tmp_path, read_size):
+        """Streamed elements equal json.load at any block size"""
+        data = [
+            {"content": f"Review {i} with \"quotes\" and \\ slashes", "rating": (i % 5) + 1,
+             "nested": {"a": [1, 2, {"b": None}]}}
+            for i in range(25)
+        ] + [12345, -0.5e3, "text", True, None, []]
+        filepath = tmp_path / "stream.json"
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        assert list(iter_json_array(str(filepath), read_size=read_size)) == data
+
+    def test_real_dataset(self):
+        """Streaming a checked-in dataset equals load_reviews"""
+        filepath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "data", "ios", "HP_App_iOS_US_Last500.json")
+        assert list(iter_reviews(filepath)) == load_reviews(filepath)
+
+    def test_empty_array(self, temp_empty_json):
+        """Empty array yields nothing"""
+        assert list(iter_reviews(temp_empty_json)) == []
+
+    def test_is_lazy(self, temp_json_file):
+        """Reviews are yielded one at a time"""
+        stream = iter_reviews(temp_json_file)
+        first = next(stream)
+        assert first["title"] == "Great"
+
+    def test_csv_stream(self, temp_csv_file):
+        """CSV files stream as row dicts"""
+        assert list(iter_reviews(temp_csv_file)) == load_reviews(temp_csv_file)
+
+    def test_missing_file_raises_immediately(self):
+        """Missing file raises before iteration starts"""
+        with pytest.raises(FileNotFoundError):
+            iter_reviews("/nonexistent/path/reviews.json")
+
+    def test_truncated_file_raises(self, tmp_path):
+        """Truncated arrays raise JSONDecodeError"""
+        filepath = tmp_path / "truncated.json"
+        filepath.write_text('[{"content": "a"}, {"content": ', encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(str(filepath), read_size=4))
+
+    def test_not_an_array_raises(self, tmp_path):
+        """Top-level objects are rejected"""
+        filepath = tmp_path / "object.json"
+        filepath.write_text('{"content": "a"}', encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(str(filepath)))
+
+    def test_stream_into_analysis(self, temp_json_file, sample_reviews_list):
+        """Streamed reviews analyze the same as a loaded list"""
+        streamed = analyze_reviews(iter_reviews(temp_json_file))
+        assert streamed["sentiment_counts"] == analyze_reviews(sample_reviews_list)["sentiment_counts"]
+        assert streamed["total_reviews"] == len(sample_reviews_list)
+
+
+class TestColumnarCSV:
+    """Tests for the columnar CSV fast path"""
+
+    def test_projection(self, temp_csv_file):
+        """Only the requested columns are returned"""
+        columns = load_review_columns(temp_csv_file, columns=["content", "rating"])
+        assert set(columns) == {"content", "rating"}
+        assert len(columns["content"]) == 10
+
+    def test_rating_coerced_once(self, temp_csv_file):
+        """Ratings come back as an int64 array"""
+        columns = load_review_columns(temp_csv_file)
+        assert columns["rating"].dtype == np.int64
+        assert list(columns["rating"][:3]) == [5, 1, 3]
+
+    def test_missing_columns_blank(self, temp_csv_file):
+        """Columns absent from the file are blank strings"""
+        columns = load_review_columns(temp_csv_file)
+        assert columns["platform"] == [""] * 10
+
+    def test_blank_rating_defaults_to_3(self, tmp_path):
+        """Empty rating cells default to 3"""
+        filepath = tmp_path / "blank.csv"
+        filepath.write_text("content,rating\nGreat,\nBad,1\n", encoding="utf-8")
+        assert list(load_review_columns(str(filepath))["rating"]) == [3, 1]
+
+    def test_review_column_fallback(self, tmp_path):
+        """Legacy 'review' column fills empty content"""
+        filepath = tmp_path / "legacy.csv"
+        filepath.write_text("review,rating\nGreat app,5\n", encoding="utf-8")
+        assert load_review_columns(str(filepath))["content"] == ["Great app"]
+
+    def test_short_rows_padded(self, tmp_path):
+        """Cells missing from short rows read as blank"""
+        filepath = tmp_path / "ragged.csv"
+        filepath.write_text("title,content,rating\nHi,Good,4\nOnly title\n", encoding="utf-8")
+        columns = load_review_columns(str(filepath), columns=["content", "rating"])
+        assert columns["content"] == ["Good", ""]
+        assert list(columns["rating"]) == [4, 3]
+
+    def test_empty_csv(self, temp_empty_csv):
+        """Header-only CSV gives empty columns"""
+        columns = load_review_columns(temp_empty_csv)
+        assert len(columns["rating"]) == 0
+        assert columns["content"] == []
+
+    def test_analysis_matches_dict_path(self, temp_csv_file):
+        """Columnar analysis equals analyze_reviews on DictReader rows"""
+        expected = analyze_reviews(load_reviews(temp_csv_file))
+        assert json.dumps(analyze_review_file(temp_csv_file), default=dict) == \
+            json.dumps(expected, default=dict)
+
+    def test_saved_export_round_trip(self):
+        """A checked-in save_to_csv export analyzes like its rows"""
+        filepath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "data", "ios", "HP_App_iOS_US_Last500.csv")
+        expected = analyze_reviews(load_reviews(filepath))
+        assert json.dumps(analyze_review_file(filepath), default=dict) == \
+            json.dumps(expected, default=dict)
@@ -0,0 +1,252 @@
+"""
+Unit tests for the scraper's weekly fetch plan
+"""
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import (
+    FetchPlan,
+    ReviewStore,
+    ReviewTally,
+    WEEKLY_FETCHES,
+    ALL_COUNTRIES,
+    MAX_DEPTHS,
+    MAX_POLL_INTERVAL,
+)
+
+IOS = "iOS App Store"
+PLAY = "Google Play"
+NOW = 1_780_000_000
+DAY = 86400
+
+
+def plan_for(platform, storefronts, depth=500):
+    """FetchPlan with one step reading storefronts at depth"""
+    return FetchPlan([("step", platform, storefronts, depth)])
+
+
+def polled(rate, days_ago):
+    """Activity entry: rate reviews/day, last polled days_ago days before NOW"""
+    return (rate, NOW - days_ago * DAY)
+
+
+class TestClaim:
+    """Tests for handing each storefront to exactly one step"""
+
+    def test_us_fetched_once_at_deepest_depth(self):
+        """US is planned once per platform, at the US step's depth"""
+        plan = FetchPlan()
+        assert plan.depths[(IOS, "us")] == 3000
+        assert plan.depths[(PLAY, "us")] == 3000
+        assert plan.depths[(IOS, "gb")] == 500
+
+    def test_depth_is_max_of_steps(self):
+        """A storefront wanted at several depths is planned at the largest"""
+        plan = FetchPlan([("a", IOS, ["us", "gb"], 200), ("b", IOS, ["us"], 800),
+                          ("c", IOS, ["us"], 100)])
+        assert plan.depths == {(IOS, "us"): 800, (IOS, "gb"): 200}
+        assert plan.claim("a") == {"us": 800, "gb": 200}
+
+    def test_all_countries_skips_claimed_us(self):
+        """The AllCountries step does not re-fetch US"""
+        plan = FetchPlan()
+        assert plan.claim("ios_us") == {"us": 3000}
+        ios_all = plan.claim("ios_all")
+        assert "us" not in ios_all
+        assert list(ios_all) == [c for c in ALL_COUNTRIES if c != "us"]
+        assert set(ios_all.values()) == {500}
+
+    def test_first_claimer_fetches(self):
+        """Whichever step claims first fetches, at the merged depth"""
+        plan = FetchPlan()
+        assert plan.claim("android_all")["us"] == 3000
+        assert plan.claim("android_us") == {}
+
+    def test_platforms_independent(self):
+        """Claiming iOS US leaves Play US to its own steps"""
+        plan = FetchPlan()
+        plan.claim("ios_us")
+        assert plan.claim("android_all")["us"] == 3000
+
+    def test_claim_twice(self):
+        """A step's storefronts are handed out only once"""
+        plan = FetchPlan()
+        plan.claim("ios_all")
+        assert plan.claim("ios_all") == {}
+
+    def test_every_storefront_claimed_once(self):
+        """Over all steps each (platform, storefront) is fetched exactly once"""
+        plan = FetchPlan()
+        claimed = []
+        for key, platform, _, _ in WEEKLY_FETCHES:
+            claimed += [(platform, storefront) for storefront in plan.claim(key)]
+        assert len(claimed) == len(set(claimed)) == 2 * len(ALL_COUNTRIES)
+
+    def test_describe_counts_shared(self):
+        plan = FetchPlan()
+        assert plan.describe() == (f"{2 * len(ALL_COUNTRIES)} storefront fetches for "
+                                   f"{2 * len(ALL_COUNTRIES) + 2} requested (2 shared)")
+
+
+class TestScheduleDepth:
+    """Tests for depths derived from review velocity"""
+
+    def test_depth_rounded_up_to_pages(self):
+        """Depth covers the horizon with headroom, in whole pages"""
+        plan = plan_for(PLAY, ["gb"]).schedule({(PLAY, "gb"): polled(10, 7)}, now=NOW)
+        assert plan.depths[(PLAY, "gb")] == 500      # 10/day * 30 * 1.5 = 450 -> 5 pages
+        plan = plan_for(IOS, ["gb"]).schedule({(IOS, "gb"): polled(3, 7)}, now=NOW)
+        assert plan.depths[(IOS, "gb")] == 150       # 135 -> 3 pages of 50
+
+    def test_depth_clamped(self):
+        """Busy storefronts stop at the platform's MAX_DEPTHS"""
+        plan = FetchPlan([("ios", IOS, ["us"], 3000), ("play", PLAY, ["us"], 3000)])
+        plan.schedule({(IOS, "us"): polled(96, 7), (PLAY, "us"): polled(400, 7)}, now=NOW)
+        assert plan.depths[(IOS, "us")] == MAX_DEPTHS[IOS]
+        assert plan.depths[(PLAY, "us")] == MAX_DEPTHS[PLAY]
+
+    def test_at_least_one_page(self):
+        """A storefront due for a poll reads at least one page"""
+        plan = plan_for(PLAY, ["se"]).schedule(
+            {(PLAY, "se"): polled(0.01, MAX_POLL_INTERVAL / DAY)}, now=NOW)
+        assert plan.depths[(PLAY, "se")] == 100
+
+    def test_unseen_keeps_planned_depth(self):
+        """Without history the step's depth is used, within MAX_DEPTHS"""
+        plan = FetchPlan([("ios", IOS, ["us"], 3000), ("play", PLAY, ["us"], 3000)])
+        plan.schedule({}, now=NOW)
+        assert plan.depths == {(IOS, "us"): 500, (PLAY, "us"): 3000}
+
+
+class TestSchedulePolling:
+    """Tests for deferring storefronts that are not due or over budget"""
+
+    def test_quiet_storefront_not_due(self):
+        """Fewer than POLL_MIN_NEW expected reviews defers the storefront"""
+        plan = plan_for(IOS, ["se", "de"]).schedule(
+            {(IOS, "se"): polled(0.3, 7), (IOS, "de"): polled(2, 7)}, now=NOW)
+        assert plan.deferred == {(IOS, "se"): "not due"}
+        assert plan.claim("step") == {"de": 100}
+
+    def test_poll_interval_forces_poll(self):
+        """Even a silent storefront is read every MAX_POLL_INTERVAL"""
+        plan = plan_for(IOS, ["se"])
+        plan.schedule({(IOS, "se"): polled(0.0, MAX_POLL_INTERVAL / DAY)}, now=NOW)
+        assert plan.deferred == {}
+        assert plan.depths == {(IOS, "se"): 50}
+
+    def test_over_budget_deferred(self):
+        """Past the budget, the storefronts with fewest expected reviews wait"""
+        plan = plan_for(PLAY, ["us", "gb", "de"]).schedule(
+            {(PLAY, "us"): polled(50, 7), (PLAY, "gb"): polled(5, 7), (PLAY, "de"): polled(20, 7)},
+            budget=2, now=NOW)
+        assert plan.deferred == {(PLAY, "gb"): "over budget"}
+        assert set(plan.claim("step")) == {"us", "de"}
+
+    def test_busy_known_outranks_unseen(self):
+        """A busy storefront with history is not starved by unseen minor ones"""
+        plan = FetchPlan([("ios_us", IOS, ["us"], 3000), ("ios_all", IOS, ALL_COUNTRIES, 500)])
+        plan.schedule({(IOS, "us"): polled(96, 7)}, budget=5, now=NOW)
+        assert (IOS, "us") not in plan.deferred
+        assert plan.claim("ios_us") == {"us": 50}
+
+    def test_unseen_ranked_by_planned_depth(self):
+        """Among unseen storefronts the deeper planned read goes first"""
+        plan = FetchPlan([("all", PLAY, ["gb", "de"], 500), ("us", PLAY, ["us"], 3000)])
+        plan.schedule({}, budget=1, now=NOW)
+        assert list(plan.depths) == [(PLAY, "us")]
+
+
+class TestSchedulePages:
+    """Tests for sharing the page budget"""
+
+    def test_one_page_each_then_depth(self):
+        """Every admitted storefront gets a page before any goes deeper"""
+        plan = plan_for(PLAY, ["us", "gb"]).schedule(
+            {(PLAY, "us"): polled(8, 7), (PLAY, "gb"): polled(7, 7)}, budget=6, now=NOW)
+        # Both want 4 pages (360 and 315 reviews); us gets its 4, gb the remaining 2
+        assert plan.depths == {(PLAY, "us"): 400, (PLAY, "gb"): 200}
+        assert plan.pages == 6
+
+    def test_budget_not_reached(self):
+        """A roomy budget leaves every depth as computed"""
+        plan = plan_for(PLAY, ["us", "gb"]).schedule(
+            {(PLAY, "us"): polled(8, 7), (PLAY, "gb"): polled(7, 7)}, budget=100, now=NOW)
+        assert plan.depths == {(PLAY, "us"): 400, (PLAY, "gb"): 400}
+        assert plan.pages == 8
+
+    def test_describe_reports_pages(self):
+        plan = plan_for(PLAY, ["us"]).schedule({(PLAY, "us"): polled(8, 7)}, budget=10, now=NOW)
+        assert plan.describe().endswith("; at most 4 of 10 budgeted pages)")
+
+
+class FixedTime:
+    """Stand-in for the time module with a fixed clock"""
+
+    @staticmethod
+    def time():
+        return NOW
+
+
+def review_at(epoch):
+    return {"id": str(epoch), "date": datetime.fromtimestamp(epoch, timezone.utc).isoformat()}
+
+
+class TestReviewVelocity:
+    """Tests for the reviews per day a storefront scrape observes"""
+
+    @pytest.fixture(autouse=True)
+    def fixed_now(self, monkeypatch):
+        monkeypatch.setattr(scraper, "time", FixedTime)
+
+    def test_velocity_over_span_to_now(self):
+        """Dated reviews divided by the days from the oldest to now"""
+        page = [review_at(NOW - i * DAY // 5) for i in range(11)]   # 11 reviews over 2 days
+        result = ReviewTally().add(page).result("us", complete=True)
+        assert result.activity == {"us": pytest.approx(5.5)}
+        assert result.watermarks == {"us": NOW}
+
+    def test_pages_accumulate(self):
+        """Pages added one at a time give the same tally"""
+        tally = ReviewTally()
+        for i in range(4):
+            tally.add([review_at(NOW - i * DAY)])
+        assert tally.result("gb", complete=True).activity == {"gb": pytest.approx(4 / 3)}
+
+    def test_hour_floor(self):
+        """A burst within the last minutes is spread over at least an hour"""
+        page = [review_at(NOW - 60), review_at(NOW - 30), review_at(NOW)]
+        assert ReviewTally().add(page).result("us", True).activity == {"us": pytest.approx(72.0)}
+
+    def test_undated_not_counted(self):
+        page = [review_at(NOW - DAY), {"id": "x", "date": ""}]
+        assert ReviewTally().add(page).result("us", True).activity == {"us": pytest.approx(1.0)}
+
+    def test_empty_storefront(self):
+        """A complete scrape with no reviews records zero velocity and no watermark"""
+        result = ReviewTally().result("se", complete=True)
+        assert result.activity == {"se": 0.0}
+        assert result.watermarks == {}
+
+    def test_incomplete_records_nothing(self):
+        """A storefront that stopped on an error keeps its old estimates"""
+        result = ReviewTally().add([review_at(NOW)]).result("us", complete=False)
+        assert result.activity == {}
+        assert result.watermarks == {}
+
+    def test_store_smooths_estimates(self, tmp_path):
+        """Stored velocity is an exponentially smoothed average"""
+        with ReviewStore(str(tmp_path / "reviews.sqlite")) as store:
+            store.record_activity(PLAY, {"us": 10.0}, polled_at=NOW - DAY)
+            store.record_activity(PLAY, {"us": 20.0}, polled_at=NOW)
+            rate, polled_at = store.activity()[(PLAY, "us")]
+        assert rate == pytest.approx(scraper.ACTIVITY_SMOOTHING * 20 +
+                                     (1 - scraper.ACTIVITY_SMOOTHING) * 10)
+        assert polled_at == NOW
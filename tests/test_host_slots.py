@@ -0,0 +1,104 @@
+"""
+Unit tests for the scraper's per-host concurrency limits
+"""
+import threading
+import time
+import pytest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import host_slot, rate_limited_call, set_host_concurrency
+
+HOST = "itunes.apple.com"
+URL = f"https://{HOST}/us/rss/customerreviews/page=1/id=1/sortby=mostrecent/json"
+
+
+@pytest.fixture(autouse=True)
+def fresh_slots(monkeypatch):
+    """Own copies of the host limits and no semaphores from other tests"""
+    monkeypatch.setattr(scraper, "HOST_CONCURRENCY", {HOST: 2, "play.google.com": 4})
+    monkeypatch.setattr(scraper, "DEFAULT_HOST_CONCURRENCY", 1)
+    monkeypatch.setattr(scraper, "_host_slots", {})
+    monkeypatch.setattr(scraper, "_rate_limiters", {})
+
+
+def capacity(slot):
+    """How many holders a semaphore admits right now"""
+    held = 0
+    while slot.acquire(blocking=False):
+        held += 1
+    for _ in range(held):
+        slot.release()
+    return held
+
+
+def peak_in_flight(call, threads=8):
+    """Run call(enter) on several threads at once; the most inside enter() at one time"""
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def enter():
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.02)
+        with lock:
+            state["now"] -= 1
+
+    workers = [threading.Thread(target=call, args=(enter,)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return state["peak"]
+
+
+class TestHostSlot:
+    """Tests for bounding requests in flight per host"""
+
+    def test_limits_concurrent_calls(self):
+        """No more than the host's limit run inside its slot at once"""
+        def call(enter):
+            with host_slot(URL):
+                enter()
+        assert peak_in_flight(call) == 2
+
+    def test_rate_limited_call_uses_slot(self, monkeypatch):
+        """Calls given a host are bounded by its slot"""
+        monkeypatch.setitem(scraper.RATE_LIMITS, "test",
+                            {"rate": 1000.0, "burst": 100, "min_rate": 0.2, "max_rate": 1000.0})
+        assert peak_in_flight(lambda enter: rate_limited_call("test", enter, host=URL)) == 2
+
+    def test_url_and_host_share_slot(self):
+        assert host_slot(URL) is host_slot(HOST)
+        assert host_slot(URL) is not host_slot("play.google.com")
+
+    def test_unlisted_host_uses_default(self):
+        assert capacity(host_slot("example.com")) == 1
+        assert capacity(host_slot(HOST)) == 2
+
+
+class TestSetHostConcurrency:
+    """Tests for changing the limits"""
+
+    def test_one_host(self):
+        """A host's new limit applies to slots handed out afterwards"""
+        before = host_slot(HOST)
+        set_host_concurrency(3, HOST)
+        assert scraper.HOST_CONCURRENCY[HOST] == 3
+        assert host_slot(HOST) is not before
+        assert capacity(host_slot(HOST)) == 3
+        assert capacity(host_slot("play.google.com")) == 4
+
+    def test_default_keeps_per_host_limits(self):
+        """Without a host only the default for unlisted hosts changes"""
+        set_host_concurrency(5)
+        assert scraper.DEFAULT_HOST_CONCURRENCY == 5
+        assert scraper.HOST_CONCURRENCY == {HOST: 2, "play.google.com": 4}
+        assert capacity(host_slot("example.com")) == 5
+        assert capacity(host_slot(HOST)) == 2
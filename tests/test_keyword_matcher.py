@@ -0,0 +1,114 @@
+"""
+Unit tests for the single-pass keyword matcher
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CustomerInsight_Review_Agent import (
+    KeywordMatcher,
+    get_keyword_matcher,
+    classify_review,
+    analyze_sentiment,
+    categorize_review,
+    SENTIMENT_KEYWORDS,
+    INSIGHT_CATEGORIES,
+)
+
+
+def naive_match(text):
+    """Reference implementation: one substring scan per keyword"""
+    text_lower = text.lower()
+    pos = sum(1 for word in SENTIMENT_KEYWORDS["positive"] if word in text_lower)
+    neg = sum(1 for word in SENTIMENT_KEYWORDS["negative"] if word in text_lower)
+    cats = [cat_id for cat_id, info in INSIGHT_CATEGORIES.items()
+            if any(kw in text_lower for kw in info["keywords"])]
+    return pos, neg, cats
+
+
+class TestKeywordMatcherScan:
+    """Tests for the Aho-Corasick scan itself"""
+
+    def test_overlapping_keywords(self):
+        """Keywords nested inside other keywords are all reported"""
+        matcher = KeywordMatcher({"positive": ["print", "printing", "int"]}, {})
+        hits = matcher.scan("printing")
+        assert {matcher.keywords[i] for i in hits} == {"print", "printing", "int"}
+
+    def test_suffix_keyword_via_failure_link(self):
+        """A keyword that is a suffix of a partial match is found"""
+        matcher = KeywordMatcher({"negative": ["crash", "ash"]}, {})
+        hits = matcher.scan("crass ash")
+        assert {matcher.keywords[i] for i in hits} == {"ash"}
+
+    def test_no_hits(self):
+        """Text without keywords returns an empty set"""
+        matcher = KeywordMatcher({"positive": ["love"]}, {})
+        assert matcher.scan("nothing here") == set()
+
+    def test_repeated_keyword_counted_once(self):
+        """A keyword occurring twice counts once, like `in`"""
+        matcher = KeywordMatcher({"positive": ["love"], "negative": []}, {})
+        pos, neg, _ = matcher.match("love love love")
+        assert pos == 1
+        assert neg == 0
+
+    def test_category_mask_bits(self):
+        """Category bits follow table order"""
+        categories = {
+            "a": {"keywords": ["alpha"]},
+            "b": {"keywords": ["beta"]},
+        }
+        matcher = KeywordMatcher({}, categories)
+        _, _, mask = matcher.match("Beta only")
+        assert mask == 0b10
+        assert matcher.categories_from_mask(mask) == ["b"]
+
+
+class TestMatcherEquivalence:
+    """Matcher results equal the per-keyword substring scans"""
+
+    @pytest.mark.parametrize("text", [
+        "",
+        "Love this app, works great!",
+        "WiFi setup was easy but the app crashes when I try to scan",
+        "Doesn't work after update, terrible and slow",
+        "PRINTING IS FAST",
+        "Café – wi-fi ok, pdf scan fine",
+    ])
+    def test_matches_naive(self, text):
+        """Counts and categories match the reference implementation"""
+        pos, neg, mask = get_keyword_matcher().match(text)
+        ref_pos, ref_neg, ref_cats = naive_match(text)
+        assert (pos, neg) == (ref_pos, ref_neg)
+        assert get_keyword_matcher().categories_from_mask(mask) == ref_cats
+
+    def test_golden_dataset_equivalence(self, golden_dataset):
+        """Every golden review classifies the same as the reference"""
+        for item in golden_dataset:
+            text = f"{item.get('title', '')} {item.get('content', '')}"
+            ref_pos, ref_neg, ref_cats = naive_match(text)
+            pos, neg, mask = get_keyword_matcher().match(text)
+            assert (pos, neg) == (ref_pos, ref_neg), item["id"]
+            assert get_keyword_matcher().categories_from_mask(mask) == ref_cats, item["id"]
+
+
+class TestClassifyReview:
+    """Tests for the combined classify_review helper"""
+
+    def test_equals_separate_calls(self, sample_multi_category_review):
+        """classify_review matches analyze_sentiment + categorize_review"""
+        text = f"{sample_multi_category_review['title']} {sample_multi_category_review['content']}"
+        assert classify_review(text) == (analyze_sentiment(text), categorize_review(text))
+
+    def test_uncategorized(self):
+        """Text with no category keywords is uncategorized"""
+        sentiment, categories = classify_review("zzz")
+        assert sentiment == "neutral"
+        assert categories == ["uncategorized"]
+
+    def test_matcher_is_cached(self):
+        """The shared matcher is built once"""
+        assert get_keyword_matcher() is get_keyword_matcher()
@@ -0,0 +1,124 @@
+"""
+Unit tests for MinHash/LSH near-duplicate detection
+"""
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CustomerInsight_Review_Agent import (
+    NearDuplicateIndex,
+    ReviewAnalysisAccumulator,
+    find_near_duplicates,
+    iter_distinct_reviews,
+    normalize_review_text,
+    analyze_reviews,
+    analyze_review_file,
+    save_review_corpus,
+    load_review_corpus,
+)
+
+BOT_TEXT = "This printer app is the best app ever, it connects to my printer every single time"
+
+
+def as_json(analysis):
+    """Serialize an analysis dict preserving key order"""
+    return json.dumps(analysis, default=dict)
+
+
+@pytest.fixture
+def reviews_with_copies(golden_dataset):
+    """Golden reviews with pasted copies of a bot review spread through them"""
+    reviews = list(golden_dataset)
+    copies = [BOT_TEXT, BOT_TEXT.upper() + "!!!", BOT_TEXT.replace("best", "BEST ..."),
+              "  " + BOT_TEXT + " :)"]
+    for i, text in enumerate(copies):
+        reviews.insert(i * 7, {"id": f"bot{i}", "rating": 5, "title": "", "content": text})
+    return reviews
+
+
+def distinct(reviews):
+    """Reviews with near-duplicates removed, in input order"""
+    return list(iter_distinct_reviews(reviews))
+
+
+class TestNearDuplicateIndex:
+    """Tests for NearDuplicateIndex and find_near_duplicates"""
+
+    def test_normalize(self):
+        """Normalization lowercases and strips punctuation"""
+        assert normalize_review_text("  Great -- APP!!\n") == "great app"
+
+    def test_copies_cluster_together(self):
+        """Punctuation and case variants join the first review's cluster"""
+        texts = [BOT_TEXT, "WiFi keeps dropping every time I try to print a photo",
+                 BOT_TEXT.upper() + "!!!", BOT_TEXT.replace("best", "BEST ...")]
+        assert find_near_duplicates(texts) == [0, 1, 0, 0]
+
+    def test_small_edit_still_duplicate(self):
+        """Appending a word to a long review keeps it in the cluster"""
+        edited = BOT_TEXT + " thanks"
+        assert find_near_duplicates([BOT_TEXT, edited]) == [0, 0]
+
+    def test_different_reviews_not_clustered(self, golden_dataset):
+        """Distinct golden reviews each start their own cluster"""
+        texts = [f"{r['title']} {r['content']}" for r in golden_dataset]
+        assert find_near_duplicates(texts) == list(range(len(texts)))
+
+    def test_short_reviews_never_clustered(self):
+        """Reviews below min_words are left alone even when identical"""
+        assert find_near_duplicates(["Love it", "Love it", "love it!"]) == [0, 1, 2]
+
+    def test_counts(self):
+        """The index counts reviews added and duplicates found"""
+        index = NearDuplicateIndex()
+        for text in [BOT_TEXT, BOT_TEXT, "Great"]:
+            index.add(text)
+        assert (index.count, index.duplicates) == (3, 1)
+
+    def test_deterministic(self):
+        """Signatures do not depend on the index instance"""
+        assert (NearDuplicateIndex().signature(BOT_TEXT) ==
+                NearDuplicateIndex().signature(BOT_TEXT)).all()
+
+    def test_bands_must_divide_permutations(self):
+        """num_perm has to split evenly into bands"""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_perm=100, bands=32)
+
+
+class TestCollapsedAnalysis:
+    """Tests for analyze_reviews(collapse_near_duplicates=True)"""
+
+    def test_counts_each_cluster_once(self, reviews_with_copies, golden_dataset):
+        """Collapsing equals analyzing the reviews without the copies"""
+        result = analyze_reviews(reviews_with_copies, collapse_near_duplicates=True)
+        expected = analyze_reviews(distinct(reviews_with_copies))
+        assert result.pop("near_duplicates_collapsed") == 3
+        assert as_json(result) == as_json(expected)
+        assert result["total_reviews"] == len(golden_dataset) + 1
+
+    def test_off_by_default(self, reviews_with_copies):
+        """Without the option every review counts and no key is added"""
+        result = analyze_reviews(reviews_with_copies)
+        assert "near_duplicates_collapsed" not in result
+        assert result["total_reviews"] == len(reviews_with_copies)
+
+    def test_workers_match_single_process(self, reviews_with_copies):
+        """Clusters spanning shards are collapsed the same way"""
+        assert as_json(analyze_reviews(reviews_with_copies, workers=2,
+                                       collapse_near_duplicates=True)) == \
+            as_json(analyze_reviews(reviews_with_copies, collapse_near_duplicates=True))
+
+    @pytest.mark.parametrize("chunk_size", [1, 5])
+    def test_columns_across_chunks(self, tmp_path, reviews_with_copies, chunk_size):
+        """The columnar path collapses copies that fall in different chunks"""
+        save_review_corpus(reviews_with_copies, tmp_path / "c")
+        result = analyze_review_file(str(tmp_path / "c"), collapse_near_duplicates=True)
+        assert as_json(result) == \
+            as_json(analyze_reviews(reviews_with_copies, collapse_near_duplicates=True))
+        acc = ReviewAnalysisAccumulator(chunk_size=chunk_size, near_duplicates=NearDuplicateIndex())
+        assert as_json(acc.update_corpus(load_review_corpus(tmp_path / "c")).result()) == \
+            as_json(result)
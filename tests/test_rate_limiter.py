@@ -0,0 +1,330 @@
+"""
+Unit tests for the scraper's adaptive rate limiter
+"""
+import math
+import pytest
+import sys
+import os
+import urllib.error
+from datetime import datetime, timedelta, timezone
+from email.message import Message
+from email.utils import format_datetime
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import (
+    RateLimiter,
+    parse_retry_after,
+    rate_limited_call,
+    RATE_DECREASE,
+    RATE_INCREASE,
+    RAMP_UP_AFTER,
+    THROTTLE_WINDOW,
+)
+
+
+class FakeTime:
+    """Stand-in for the time module: a manual clock that sleep() advances"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # Always move forward, as the real clock does, even for sub-ulp sleeps
+        self.sleeps.append(seconds)
+        self.now = max(self.now + seconds, math.nextafter(self.now, math.inf))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the scraper's clock with a manual one"""
+    fake = FakeTime()
+    monkeypatch.setattr(scraper, "time", fake)
+    return fake
+
+
+def http_error(status, retry_after=None):
+    """requests.HTTPError carrying a response with the given status"""
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class TestRateAdaptation:
+    """Tests for multiplicative decrease and stepwise ramp-up"""
+
+    def test_throttle_cuts_rate(self, clock):
+        """A throttle multiplies the rate by RATE_DECREASE"""
+        limiter = RateLimiter(4.0, burst=4)
+        limiter.throttled(0, retry_after=2.0)
+        assert limiter.rate == pytest.approx(4.0 * RATE_DECREASE)
+        assert limiter.throttles == 1
+
+    def test_rate_floor(self, clock):
+        """The rate never drops below min_rate"""
+        limiter = RateLimiter(1.0, min_rate=0.5)
+        for _ in range(10):
+            limiter.throttled(0, retry_after=0.0)
+            clock.now += THROTTLE_WINDOW
+        assert limiter.rate == 0.5
+
+    def test_simultaneous_throttles_cut_once(self, clock):
+        """Throttles inside one episode count as a single signal"""
+        limiter = RateLimiter(4.0)
+        for _ in range(4):
+            limiter.throttled(0, retry_after=2.0)
+        assert limiter.rate == pytest.approx(4.0 * RATE_DECREASE)
+        assert limiter.throttles == 4
+
+    def test_throttle_after_episode_cuts_again(self, clock):
+        """A throttle once the episode has passed is a new signal"""
+        limiter = RateLimiter(4.0)
+        limiter.throttled(0, retry_after=2.0)
+        clock.now += 2.0
+        limiter.throttled(0, retry_after=2.0)
+        assert limiter.rate == pytest.approx(4.0 * RATE_DECREASE ** 2)
+
+    def test_ramp_up_after_healthy_run(self, clock):
+        """Every RAMP_UP_AFTER healthy responses raise the rate"""
+        limiter = RateLimiter(2.0)
+        for _ in range(RAMP_UP_AFTER - 1):
+            limiter.succeeded()
+        assert limiter.rate == 2.0
+        limiter.succeeded()
+        assert limiter.rate == pytest.approx(2.0 * RATE_INCREASE)
+
+    def test_ramp_capped(self, clock):
+        """The rate never exceeds max_rate"""
+        limiter = RateLimiter(2.0, max_rate=3.0)
+        for _ in range(RAMP_UP_AFTER * 5):
+            limiter.succeeded()
+        assert limiter.rate == 3.0
+
+    def test_throttle_resets_healthy_run(self, clock):
+        """Healthy responses before a throttle do not count toward ramp-up"""
+        limiter = RateLimiter(2.0)
+        for _ in range(RAMP_UP_AFTER - 1):
+            limiter.succeeded()
+        limiter.throttled(0, retry_after=0.0)
+        cut = limiter.rate
+        limiter.succeeded()
+        assert limiter.rate == cut
+
+
+class TestPacing:
+    """Tests for token-bucket waits and throttle pauses"""
+
+    def test_burst_then_rate(self, clock):
+        """A full bucket serves the burst at once, then one token per 1/rate"""
+        limiter = RateLimiter(2.0, burst=3)
+        for _ in range(3):
+            limiter.acquire()
+        assert clock.sleeps == []
+        limiter.acquire()
+        assert sum(clock.sleeps) == pytest.approx(0.5)
+
+    def test_pause_honoured(self, clock):
+        """After a throttle no token is handed out before the pause ends"""
+        limiter = RateLimiter(10.0, burst=5)
+        start = clock.now
+        limiter.throttled(0, retry_after=3.0)
+        limiter.acquire()
+        assert clock.now - start >= 3.0
+
+    def test_retry_after_overrides_backoff(self, clock):
+        """throttled() returns Retry-After when given, else a jittered backoff"""
+        limiter = RateLimiter(2.0)
+        assert limiter.throttled(3, retry_after=7.0) == 7.0
+        delay = limiter.throttled(2)
+        assert scraper.BACKOFF_BASE * 2 <= delay <= scraper.BACKOFF_BASE * 4
+
+
+class TestParseRetryAfter:
+    """Tests for Retry-After header parsing"""
+
+    def test_seconds(self):
+        assert parse_retry_after("12") == 12.0
+        assert parse_retry_after("1.5") == 1.5
+
+    def test_negative_seconds_clamped(self):
+        assert parse_retry_after("-3") == 0.0
+
+    def test_http_date(self):
+        """An HTTP date gives the seconds until then"""
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 25 <= parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+    def test_past_http_date(self):
+        when = datetime.now(timezone.utc) - timedelta(minutes=5)
+        assert parse_retry_after(format_datetime(when, usegmt=True)) == 0.0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+        assert parse_retry_after("soon") is None
+
+
+class TestRateLimitedCall:
+    """Tests for retrying calls under a family's limiter"""
+
+    @pytest.fixture
+    def family(self, monkeypatch, clock):
+        monkeypatch.setitem(scraper.RATE_LIMITS, "test",
+                            {"rate": 4.0, "burst": 4, "min_rate": 0.2, "max_rate": 20.0})
+        monkeypatch.setattr(scraper, "_rate_limiters", {})
+        return "test"
+
+    def test_retries_throttle_then_succeeds(self, family, clock):
+        """A 429 is retried after its Retry-After and the result returned"""
+        outcomes = [http_error(429, "4"), http_error(503), "ok"]
+
+        def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert rate_limited_call(family, call) == "ok"
+        limiter = scraper.rate_limiter(family)
+        assert limiter.throttles == 2
+        assert pytest.approx(4.0) in clock.sleeps
+
+    def test_other_errors_not_retried(self, family):
+        """Non-throttling HTTP errors propagate on the first attempt"""
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise http_error(404)
+
+        with pytest.raises(requests.HTTPError):
+            rate_limited_call(family, call)
+        assert len(calls) == 1
+
+    def test_gives_up_after_max_retries(self, family):
+        """Persistent throttling is re-raised after MAX_RETRIES retries"""
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise http_error(429, "0")
+
+        with pytest.raises(requests.HTTPError):
+            rate_limited_call(family, call)
+        assert len(calls) == scraper.MAX_RETRIES + 1
+
+    def test_connection_errors_retried(self, family):
+        """Dropped connections are retried with backoff"""
+        outcomes = [requests.ConnectionError("reset"), "ok"]
+
+        def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert rate_limited_call(family, call) == "ok"
+
+
+class ExtraHTTPError(Exception):
+    """Like google_play_scraper's own HTTP error: the status is only in the message"""
+
+
+def play_error(status, retry_after=None, chained=True):
+    """
+    Error as google_play_scraper raises it: an ExtraHTTPError raised while
+    handling urllib's HTTPError (or, with chained=False, on its own)
+    """
+    headers = Message()
+    if retry_after is not None:
+        headers["Retry-After"] = retry_after
+    cause = urllib.error.HTTPError("https://play.google.com/_/PlayStoreUi/data/batchexecute",
+                                   status, "error", headers, None)
+    try:
+        try:
+            raise cause
+        except urllib.error.HTTPError:
+            raise ExtraHTTPError(f"App not found. Status code {status} returned.")
+    except ExtraHTTPError as error:
+        if not chained:
+            error.__context__ = None
+        return error
+
+
+class TestPlayErrors:
+    """Tests for retrying google_play_scraper's urllib-based errors"""
+
+    @pytest.fixture(autouse=True)
+    def fresh(self, monkeypatch, clock):
+        monkeypatch.setattr(scraper, "_rate_limiters", {})
+
+    def calls(self, *outcomes):
+        """call() raising or returning each outcome in turn, and its call log"""
+        outcomes, log = list(outcomes), []
+
+        def call():
+            log.append(1)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return call, log
+
+    def test_throttle_retried_with_retry_after(self, clock):
+        """A Play 429 backs off for its Retry-After and is retried"""
+        call, log = self.calls(play_error(429, "7"), "ok")
+        assert rate_limited_call("play", call) == "ok"
+        assert scraper.rate_limiter("play").throttles == 1
+        assert pytest.approx(7.0) in clock.sleeps
+        assert len(log) == 2
+
+    def test_status_read_from_message(self):
+        """Without the chained urllib error the status comes from the message"""
+        call, log = self.calls(play_error(503, chained=False), "ok")
+        assert rate_limited_call("play", call) == "ok"
+        assert scraper.rate_limiter("play").throttles == 1
+
+    def test_not_found_not_retried(self):
+        call, log = self.calls(play_error(404))
+        with pytest.raises(ExtraHTTPError):
+            rate_limited_call("play", call)
+        assert len(log) == 1
+
+    def test_server_error_not_retried(self):
+        """A urllib HTTPError is an HTTP response, not a dropped connection"""
+        call, log = self.calls(play_error(500).__context__)
+        with pytest.raises(urllib.error.HTTPError):
+            rate_limited_call("play", call)
+        assert len(log) == 1
+
+    @pytest.mark.parametrize("error", [
+        urllib.error.URLError(ConnectionResetError(104, "reset")),
+        ConnectionResetError(104, "reset"),
+        TimeoutError("timed out"),
+    ])
+    def test_dropped_connection_retried(self, error):
+        """urllib and socket connection failures are retried with backoff"""
+        call, log = self.calls(error, "ok")
+        assert rate_limited_call("play", call) == "ok"
+        assert len(log) == 2
+        assert scraper.rate_limiter("play").throttles == 0
+
+    def test_persistent_throttle_raised(self):
+        call, log = self.calls(*[play_error(429, "0")] * (scraper.MAX_RETRIES + 1))
+        with pytest.raises(ExtraHTTPError):
+            rate_limited_call("play", call)
+        assert len(log) == scraper.MAX_RETRIES + 1
@@ -0,0 +1,111 @@
+"""
+Unit tests for the scraper's app rating history
+"""
+import json
+import pytest
+import sys
+import os
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import load_rating_history, save_rating_history
+
+
+@pytest.fixture
+def rating_files(tmp_path, monkeypatch):
+    """Point the rating history and snapshot at a temporary directory"""
+    monkeypatch.setattr(scraper, "RATING_HISTORY_FILE", str(tmp_path / "app_rating_history.json"))
+    monkeypatch.setattr(scraper, "CURRENT_RATINGS_FILE", str(tmp_path / "current_app_ratings.json"))
+    return tmp_path
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    """Rating fetchers that return fixed values and count their calls"""
+    calls = []
+
+    def ios(country="us"):
+        calls.append("ios")
+        return {"rating": 4.7, "rating_count": 1000}
+
+    def android(country="us"):
+        calls.append("android")
+        return {"rating": 4.1, "rating_count": 2000}
+
+    monkeypatch.setattr(scraper, "fetch_ios_app_rating", ios)
+    monkeypatch.setattr(scraper, "fetch_android_app_rating", android)
+    monkeypatch.setattr(scraper, "fetch_ios_all_time_histogram", lambda country="us": None)
+    return calls
+
+
+def entry(date, timestamp, rating, country="us"):
+    return {"date": date, "timestamp": timestamp, "country": country, "rating": rating}
+
+
+class TestOneEntryPerDay:
+    """Tests for deduplicating same-day rating entries"""
+
+    def test_same_day_keeps_latest(self, rating_files):
+        """Two entries for one day collapse to the later one"""
+        save_rating_history({"ios": [
+            entry("2026-07-02", "2026-07-02T16:00:05", 4.6),
+            entry("2026-07-03", "2026-07-03T16:00:04", 4.7),
+            entry("2026-07-03", "2026-07-03T16:00:09", 4.8),
+        ], "android": []})
+        history = load_rating_history()
+        assert [(e["date"], e["rating"]) for e in history["ios"]] == \
+            [("2026-07-02", 4.6), ("2026-07-03", 4.8)]
+
+    def test_order_kept(self, rating_files):
+        """Days stay in recorded order"""
+        days = [entry(f"2026-07-{d:02d}", f"2026-07-{d:02d}T16:00:00", 4.0 + d / 100)
+                for d in range(1, 8)]
+        save_rating_history({"ios": days, "android": []})
+        assert load_rating_history()["ios"] == days
+
+    def test_countries_kept_apart(self, rating_files):
+        """Entries for different storefronts on one day are both kept"""
+        save_rating_history({"ios": [entry("2026-07-03", "2026-07-03T16:00:00", 4.7),
+                                     entry("2026-07-03", "2026-07-03T16:00:01", 4.2, "gb")],
+                             "android": []})
+        assert len(load_rating_history()["ios"]) == 2
+
+    def test_two_recordings_same_day(self, rating_files, fake_store):
+        """The daily and weekly jobs recording on one Friday leave one entry per platform"""
+        scraper.record_app_ratings()
+        scraper.record_app_ratings()
+        history = load_rating_history()
+        today = datetime.now().strftime('%Y-%m-%d')
+        assert [e["date"] for e in history["ios"]] == [today]
+        assert [e["date"] for e in history["android"]] == [today]
+        assert len(fake_store) == 4
+
+
+class TestReuseRatings:
+    """Tests for reusing a same-day snapshot within one runner"""
+
+    def test_recent_snapshot_reused(self, rating_files, fake_store):
+        """A snapshot recorded moments ago is reused without fetching"""
+        first = scraper.record_app_ratings()
+        again = scraper.record_app_ratings(reuse_within=scraper.RATINGS_REUSE_AGE)
+        assert again == json.loads(json.dumps(first, default=str))
+        assert len(fake_store) == 2
+        assert len(load_rating_history()["ios"]) == 1
+
+    def test_old_snapshot_refetched(self, rating_files, fake_store):
+        """A snapshot older than reuse_within is refreshed"""
+        scraper.record_app_ratings()
+        with open(scraper.CURRENT_RATINGS_FILE, encoding="utf-8") as f:
+            current = json.load(f)
+        current["timestamp"] = current["date"] + "T00:00:00"
+        with open(scraper.CURRENT_RATINGS_FILE, "w", encoding="utf-8") as f:
+            json.dump(current, f)
+        scraper.record_app_ratings(reuse_within=1)
+        assert len(fake_store) == 4
+
+    def test_missing_snapshot(self, rating_files):
+        assert scraper.load_recent_ratings(3600) is None
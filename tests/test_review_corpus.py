@@ -0,0 +1,191 @@
+"""
+Unit tests for the columnar review corpus
+"""
+import json
+import pytest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CustomerInsight_Review_Agent as agent
+from CustomerInsight_Review_Agent import (
+    save_review_corpus,
+    load_review_corpus,
+    review_epoch,
+    analyze_reviews,
+    analyze_review_file,
+    NO_DATE,
+)
+
+
+@pytest.fixture
+def scraped_reviews():
+    """Reviews shaped like the iOS and Android scraper output"""
+    return [
+        {"id": "1", "author": "Ann", "rating": 5, "title": "Great", "content": "Love the scanner",
+         "version": "9.1", "date": "2026-06-24T23:14:30-07:00", "country": "us",
+         "platform": "iOS App Store", "vote_count": 2, "vote_sum": 3},
+        {"id": "g1", "author": "Bo", "rating": 1, "title": "", "content": "WiFi keeps dropping",
+         "version": None, "date": "2026-06-25T17:40:25", "country": "global",
+         "platform": "Google Play", "vote_count": 0, "reply_content": None},
+        {"id": "3", "author": "Café", "rating": 3, "title": "Ok – fine", "content": "",
+         "version": "9.1", "date": "", "country": "us",
+         "platform": "iOS App Store", "vote_count": 0, "vote_sum": 0},
+    ]
+
+
+def as_json(analysis):
+    """Serialize an analysis dict preserving key order"""
+    return json.dumps(analysis, default=dict)
+
+
+class TestRoundTrip:
+    """Tests for save_review_corpus / load_review_corpus"""
+
+    def test_reviews_round_trip(self, tmp_path, scraped_reviews):
+        """Iterating the corpus gives back the saved dicts, key order included"""
+        save_review_corpus(scraped_reviews, tmp_path / "corpus")
+        back = list(load_review_corpus(tmp_path / "corpus"))
+        assert back == scraped_reviews
+        assert [list(r) for r in back] == [list(r) for r in scraped_reviews]
+
+    def test_returns_count(self, tmp_path, scraped_reviews):
+        """save_review_corpus returns the number of reviews written"""
+        assert save_review_corpus(iter(scraped_reviews), tmp_path / "c") == 3
+
+    def test_numeric_columns_are_memory_mapped(self, tmp_path, scraped_reviews):
+        """Fixed-width columns load as read-only memmaps"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+        corpus = load_review_corpus(tmp_path / "c")
+        assert isinstance(corpus.rating, np.memmap)
+        assert list(corpus.rating) == [5, 1, 3]
+        assert corpus.date_day.tolist() == [20260624, 20260625, 0]
+
+    def test_dictionary_codes(self, tmp_path, scraped_reviews):
+        """Low-cardinality fields are stored as codes into a dictionary"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+        corpus = load_review_corpus(tmp_path / "c")
+        assert corpus.dictionaries["platform"] == ["iOS App Store", "Google Play"]
+        assert corpus.codes["platform"].tolist() == [0, 1, 0]
+        assert corpus.values("version") == ["9.1", None, "9.1"]
+
+    def test_text_blob(self, tmp_path, scraped_reviews):
+        """Text columns decode from the UTF-8 blob and offsets"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+        corpus = load_review_corpus(tmp_path / "c")
+        assert corpus.text("author") == ["Ann", "Bo", "Café"]
+        assert corpus.text("reply_content") == ["", "", ""]
+
+    def test_empty_corpus(self, tmp_path):
+        """An empty corpus loads and iterates"""
+        save_review_corpus([], tmp_path / "c")
+        corpus = load_review_corpus(tmp_path / "c")
+        assert len(corpus) == 0
+        assert list(corpus) == []
+
+    def test_overwrite_replaces_corpus(self, tmp_path, scraped_reviews):
+        """Saving over a corpus replaces it and leaves no staging directories"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+        save_review_corpus(scraped_reviews[:1], tmp_path / "c")
+        assert list(load_review_corpus(tmp_path / "c")) == scraped_reviews[:1]
+        assert os.listdir(tmp_path) == ["c"]
+
+    def test_failed_save_keeps_old_corpus(self, tmp_path, scraped_reviews, monkeypatch):
+        """A save that fails while writing columns leaves the previous corpus intact"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(agent.np, "save", fail)
+        with pytest.raises(OSError):
+            save_review_corpus(scraped_reviews[:1], tmp_path / "c")
+        monkeypatch.undo()
+        assert list(load_review_corpus(tmp_path / "c")) == scraped_reviews
+        assert os.listdir(tmp_path) == ["c"]
+
+    def test_failed_swap_restores_old_corpus(self, tmp_path, scraped_reviews, monkeypatch):
+        """If the new corpus cannot be moved into place the retired one is put back"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+        target = str(tmp_path / "c")
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if str(dst) == target and ".old." not in str(src):
+                raise OSError("rename failed")
+            real_replace(src, dst)
+
+        monkeypatch.setattr(agent.os, "replace", replace)
+        with pytest.raises(OSError):
+            save_review_corpus(scraped_reviews[:1], tmp_path / "c")
+        monkeypatch.undo()
+        assert list(load_review_corpus(tmp_path / "c")) == scraped_reviews
+        assert os.listdir(tmp_path) == ["c"]
+
+    def test_unknown_format_rejected(self, tmp_path, scraped_reviews):
+        """A corpus with another format number raises ValueError"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+        meta_file = tmp_path / "c" / "meta.json"
+        meta = json.loads(meta_file.read_text())
+        meta["format"] = 99
+        meta_file.write_text(json.dumps(meta))
+        with pytest.raises(ValueError):
+            load_review_corpus(tmp_path / "c")
+
+
+class TestReviewEpoch:
+    """Tests for review_epoch"""
+
+    def test_offset_honoured(self):
+        """Timestamps with an offset convert to UTC"""
+        assert review_epoch("2026-01-01T00:00:00-08:00") == review_epoch("2026-01-01T08:00:00Z")
+
+    def test_naive_is_utc(self):
+        """Naive timestamps are taken as UTC"""
+        assert review_epoch("1970-01-02T00:00:00") == 86400
+
+    def test_date_only(self):
+        """Plain dates are midnight UTC"""
+        assert review_epoch("1970-01-02") == 86400
+
+    @pytest.mark.parametrize("value", ["", None, "yesterday"])
+    def test_missing(self, value):
+        """Empty or unparseable dates return None"""
+        assert review_epoch(value) is None
+
+    def test_missing_stored_as_sentinel(self, tmp_path, scraped_reviews):
+        """Reviews without a date get NO_DATE in the epoch column"""
+        save_review_corpus(scraped_reviews, tmp_path / "c")
+        assert load_review_corpus(tmp_path / "c").date_epoch[2] == NO_DATE
+
+
+class TestCorpusAnalysis:
+    """Analysis over a corpus matches analysis over the dicts"""
+
+    def test_analyze_corpus_directory(self, tmp_path, golden_dataset):
+        """analyze_review_file on a corpus equals analyze_reviews on the dicts"""
+        save_review_corpus(golden_dataset, tmp_path / "c")
+        assert as_json(analyze_review_file(str(tmp_path / "c"))) == \
+            as_json(analyze_reviews(golden_dataset))
+
+    def test_stored_classifications_used(self, tmp_path, golden_dataset, monkeypatch):
+        """A fresh corpus is analyzed without running the classifier"""
+        save_review_corpus(golden_dataset, tmp_path / "c")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("classifier should not run")
+
+        monkeypatch.setattr(agent, "classify_reviews_cached", fail)
+        assert analyze_review_file(str(tmp_path / "c"))["total_reviews"] == len(golden_dataset)
+
+    def test_stale_taxonomy_reclassifies(self, tmp_path, golden_dataset):
+        """A corpus saved under another taxonomy is classified again"""
+        save_review_corpus(golden_dataset, tmp_path / "c")
+        corpus = load_review_corpus(tmp_path / "c")
+        corpus.taxonomy = "stale"
+        assert corpus.classified() is None
+        result = agent.ReviewAnalysisAccumulator().update_corpus(corpus).result()
+        assert as_json(result) == as_json(analyze_reviews(golden_dataset))
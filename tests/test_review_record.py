@@ -0,0 +1,146 @@
+"""
+Unit tests for the compact Review record
+"""
+import json
+import pickle
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CustomerInsight_Review_Agent import (
+    Review,
+    iter_reviews,
+    load_reviews,
+    analyze_reviews,
+    extract_review_text,
+    review_epoch,
+    review_sort_key,
+)
+
+
+@pytest.fixture
+def ios_review():
+    """A review dict shaped like the iOS scraper output"""
+    return {"id": "1", "author": "Ann", "rating": 5, "title": "Great", "content": "Love it",
+            "version": "9.1", "date": "2026-06-24T23:14:30-07:00", "country": "us",
+            "platform": "iOS App Store", "vote_count": 2, "vote_sum": 3}
+
+
+def as_json(analysis):
+    """Serialize an analysis dict preserving key order"""
+    return json.dumps(analysis, default=dict)
+
+
+class TestReviewRecord:
+    """Tests for the dict-like behaviour of Review"""
+
+    def test_round_trip_keeps_key_order(self, ios_review):
+        """to_dict() gives back the original dict, key order included"""
+        record = Review.from_dict(ios_review)
+        assert list(record.to_dict().items()) == list(ios_review.items())
+
+    def test_slots_no_instance_dict(self, ios_review):
+        """Records have no per-instance __dict__"""
+        assert not hasattr(Review.from_dict(ios_review), "__dict__")
+
+    def test_get_and_getitem(self, ios_review):
+        """get() and [] follow dict semantics for missing fields"""
+        record = Review.from_dict(ios_review)
+        assert record.get("rating") == 5
+        assert record.get("reply_content", "none") == "none"
+        assert "reply_content" not in record
+        with pytest.raises(KeyError):
+            record["reply_content"]
+
+    def test_missing_attribute_is_none(self, ios_review):
+        """Absent known fields read as None through attributes"""
+        assert Review.from_dict(ios_review).reply_content is None
+
+    def test_unknown_keys_kept(self):
+        """Keys outside the known fields survive the round trip"""
+        data = {"id": "x", "review": "old format", "expected_sentiment": "neutral"}
+        assert Review.from_dict(data).to_dict() == data
+
+    def test_categoricals_interned(self, ios_review):
+        """Equal platform strings from separate decodes share one object"""
+        first = Review.from_dict(json.loads(json.dumps(ios_review)))
+        second = Review.from_dict(json.loads(json.dumps(ios_review)))
+        assert first.platform is second.platform
+        assert first.country is second.country
+
+    def test_key_layout_shared(self, ios_review):
+        """Reviews with the same fields share one key tuple"""
+        assert Review.from_dict(ios_review).keys() is Review.from_dict(dict(ios_review)).keys()
+
+    def test_setitem(self, ios_review):
+        """Assigning a field updates it, adding new keys at the end"""
+        record = Review.from_dict(ios_review)
+        record["country"] = "global"
+        record["note"] = 1
+        assert record.country == "global"
+        assert list(record.to_dict())[-1] == "note"
+
+    def test_equality_with_dict(self, ios_review):
+        """Records compare equal to the dict they came from"""
+        assert Review.from_dict(ios_review) == ios_review
+
+    def test_pickle(self, ios_review):
+        """Records pickle for worker processes"""
+        record = Review.from_dict(ios_review)
+        assert pickle.loads(pickle.dumps(record)) == record
+
+    def test_text_matches_extract(self):
+        """Review.text() matches extract_review_text on the dict"""
+        data = {"title": None, "review": "legacy content"}
+        assert Review.from_dict(data).text() == extract_review_text(data)
+
+
+class TestReviewDates:
+    """Tests for date normalization on records"""
+
+    def test_date_epoch_is_utc(self, ios_review):
+        """date_epoch converts the review's offset to UTC"""
+        assert Review.from_dict(ios_review).date_epoch == review_epoch("2026-06-25T06:14:30Z")
+
+    def test_date_epoch_follows_date(self, ios_review):
+        """Assigning a new date resets the parsed epoch"""
+        record = Review.from_dict(ios_review)
+        record.date_epoch
+        record["date"] = "1970-01-01T00:01:00Z"
+        assert record.date_epoch == 60
+
+    def test_known_epoch_not_reparsed(self, ios_review):
+        """from_fields keeps a stored epoch instead of parsing the date"""
+        record = Review.from_fields(ios_review.keys(), ios_review.values(), date_epoch=7)
+        assert record.date_epoch == 7
+
+    def test_sort_key_orders_across_timezones(self):
+        """Sorting by review_sort_key orders by instant, undated last"""
+        reviews = [{"date": ""}, {"date": "2026-01-01T10:00:00-07:00"},
+                   {"date": "2026-01-01T12:00:00Z"}, {"date": "junk"}]
+        ordered = sorted(reviews, key=review_sort_key, reverse=True)
+        assert [r["date"] for r in ordered[:2]] == ["2026-01-01T10:00:00-07:00",
+                                                   "2026-01-01T12:00:00Z"]
+        assert review_sort_key(reviews[0]) == review_sort_key(reviews[3]) == float("-inf")
+
+
+class TestRecordLoading:
+    """Tests for loading and analyzing records"""
+
+    def test_iter_reviews_records(self, temp_json_file):
+        """records=True yields Review objects equal to the dicts"""
+        records = list(iter_reviews(temp_json_file, records=True))
+        assert all(type(r) is Review for r in records)
+        assert records == load_reviews(temp_json_file)
+
+    def test_analysis_matches_dicts(self, golden_dataset):
+        """analyze_reviews gives the same result for records and dicts"""
+        records = [Review.from_dict(r) for r in golden_dataset]
+        assert as_json(analyze_reviews(records)) == as_json(analyze_reviews(golden_dataset))
+
+    def test_sharded_analysis_of_records(self, golden_dataset):
+        """Records cross process boundaries in sharded analysis"""
+        records = [Review.from_dict(r) for r in golden_dataset]
+        assert as_json(analyze_reviews(records, workers=2)) == as_json(analyze_reviews(golden_dataset))
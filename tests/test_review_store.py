@@ -0,0 +1,326 @@
+"""
+Unit tests for the scraper's SQLite review store
+"""
+import json
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import ReviewStore, publish_dataset
+
+IOS = "iOS App Store"
+PLAY = "Google Play"
+
+
+def dated(days_ago, hours=0):
+    """ISO timestamp (UTC) the given number of days before now"""
+    when = datetime.now(timezone.utc) - timedelta(days=days_ago, hours=hours)
+    return when.isoformat(timespec="seconds")
+
+
+def make_review(review_id, days_ago=1, platform=IOS, country="us", rating=5, **fields):
+    """A scraped review dated days_ago days back"""
+    review = {"id": review_id, "author": "User", "rating": rating, "title": "Title",
+              "content": f"Review {review_id}", "version": "1.0", "date": dated(days_ago),
+              "country": country, "platform": platform, "vote_count": 0}
+    review.update(fields)
+    return review
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty review store in a temporary directory"""
+    with ReviewStore(str(tmp_path / "reviews.sqlite")) as s:
+        yield s
+
+
+class TestUpsert:
+    """Tests for ingest by platform + review id"""
+
+    def test_inserts_new_reviews(self, store):
+        """Unknown reviews are added"""
+        stats = store.upsert([make_review("1"), make_review("2")])
+        assert stats == {"added": 2, "skipped": 0, "updated": 0, "total": 2}
+        assert len(store) == 2
+
+    def test_same_id_on_other_platform_is_distinct(self, store):
+        """The key is platform + id"""
+        store.upsert([make_review("1"), make_review("1", platform=PLAY)])
+        assert len(store) == 2
+
+    def test_generator_input(self, store, monkeypatch):
+        """Reviews may be a generator spanning several batches"""
+        monkeypatch.setattr(scraper, "STORE_BATCH_SIZE", 3)
+        stats = store.upsert(make_review(str(i)) for i in range(10))
+        assert stats["added"] == 10
+        assert len(store) == 10
+
+    def test_known_reviews_skipped(self, store):
+        """Re-ingesting stored reviews adds nothing"""
+        store.upsert([make_review("1"), make_review("2")])
+        stats = store.upsert([make_review("2"), make_review("3")])
+        assert stats == {"added": 1, "skipped": 1, "updated": 0, "total": 3}
+
+    def test_repeats_and_missing_ids_skipped(self, store):
+        """A repeated ID keeps the first; reviews without an ID are skipped"""
+        stats = store.upsert([make_review("1", title="first"), make_review("1", title="second"),
+                              make_review("")])
+        assert stats == {"added": 1, "skipped": 2, "updated": 0, "total": 1}
+        assert store.query(IOS)[0]["title"] == "first"
+
+    def test_repeat_in_later_batch_skipped(self, store, monkeypatch):
+        """A repeat in a later batch meets the stored row"""
+        monkeypatch.setattr(scraper, "STORE_BATCH_SIZE", 2)
+        stats = store.upsert([make_review("1"), make_review("2"), make_review("1")])
+        assert stats == {"added": 2, "skipped": 1, "updated": 0, "total": 2}
+
+    def test_existing_rows_not_overwritten(self, store):
+        """Without update=True a changed review keeps its stored fields"""
+        store.upsert([make_review("1", title="old")])
+        stats = store.upsert([make_review("1", title="new")])
+        assert stats["skipped"] == 1
+        assert store.query(IOS)[0]["title"] == "old"
+
+    def test_update_replaces_changed(self, store):
+        """update=True rewrites changed reviews and counts them"""
+        store.upsert([make_review("1", title="old"), make_review("2")])
+        stats = store.upsert([make_review("1", title="new"), make_review("2")], update=True)
+        assert stats == {"added": 0, "skipped": 1, "updated": 1, "total": 2}
+        assert store.query(IOS, limit=1)[0]["title"] == "new"
+
+    def test_update_keeps_country(self, store):
+        """update=True never changes the stored country tag"""
+        store.upsert([make_review("1", country="us", title="old")])
+        store.upsert([make_review("1", country="global", title="new")], update=True)
+        review = store.query(IOS)[0]
+        assert review["title"] == "new"
+        assert review["country"] == "us"
+
+    def test_rows_persist(self, tmp_path):
+        """A reopened store keeps its rows"""
+        path = str(tmp_path / "reviews.sqlite")
+        with ReviewStore(path) as s:
+            s.upsert([make_review("1")])
+        with ReviewStore(path) as s:
+            assert len(s) == 1
+            assert s.query(IOS)[0]["content"] == "Review 1"
+
+    def test_failed_input_keeps_earlier_batches(self, tmp_path, monkeypatch):
+        """Batches written before the input fails are committed, not rolled back"""
+        monkeypatch.setattr(scraper, "STORE_BATCH_SIZE", 2)
+        path = str(tmp_path / "reviews.sqlite")
+
+        def interrupted():
+            yield from (make_review(str(i)) for i in range(5))
+            raise ConnectionError("scrape failed")
+
+        with ReviewStore(path) as s:
+            with pytest.raises(ConnectionError):
+                s.upsert(interrupted())
+        with ReviewStore(path) as s:
+            assert len(s) == 4
+
+
+class TestRetag:
+    """Tests for replacing the all-countries 'global' tag"""
+
+    def test_global_replaced_by_storefront(self, store):
+        """A specific storefront replaces a stored 'global' tag"""
+        store.upsert([make_review("1", country="global")])
+        stats = store.upsert([make_review("1", country="us")])
+        assert stats == {"added": 0, "skipped": 0, "updated": 1, "total": 1}
+        assert [r["id"] for r in store.query(IOS, country="us")] == ["1"]
+
+    def test_storefront_not_replaced_by_global(self, store):
+        """A stored storefront tag survives a 'global' re-scrape"""
+        store.upsert([make_review("1", country="us")])
+        stats = store.upsert([make_review("1", country="global")])
+        assert stats["skipped"] == 1
+        assert store.query(IOS)[0]["country"] == "us"
+
+    def test_global_not_replaced_by_empty(self, store):
+        """An untagged review does not clear 'global'"""
+        store.upsert([make_review("1", country="global")])
+        store.upsert([make_review("1", country="")])
+        assert store.query(IOS)[0]["country"] == "global"
+
+    def test_retag_keeps_fields(self, store):
+        """Retagging without update=True changes only the country"""
+        store.upsert([make_review("1", country="global", title="old")])
+        store.upsert([make_review("1", country="de", title="new")])
+        review = store.query(IOS)[0]
+        assert review["country"] == "de"
+        assert review["title"] == "old"
+
+
+class TestQuery:
+    """Tests for dataset queries over the store"""
+
+    def test_newest_first(self, store):
+        """Results are ordered by date, newest first"""
+        store.upsert([make_review("old", 5), make_review("new", 1), make_review("mid", 3)])
+        assert [r["id"] for r in store.query(IOS)] == ["new", "mid", "old"]
+
+    def test_platform_filter(self, store):
+        """Only the requested platform is returned"""
+        store.upsert([make_review("1"), make_review("2", platform=PLAY)])
+        assert [r["id"] for r in store.query(PLAY)] == ["2"]
+
+    def test_country_filter(self, store):
+        """country selects one storefront; None selects all"""
+        store.upsert([make_review("1", country="us"), make_review("2", country="de")])
+        assert [r["id"] for r in store.query(IOS, country="de")] == ["2"]
+        assert len(store.query(IOS)) == 2
+
+    def test_days_window(self, store):
+        """days keeps reviews inside the window only"""
+        store.upsert([make_review("in", 10), make_review("out", 40)])
+        assert [r["id"] for r in store.query(IOS, days=30)] == ["in"]
+
+    def test_days_window_drops_undated(self, store):
+        """Undated reviews fall outside every window"""
+        store.upsert([make_review("dated", 1), make_review("undated", date="")])
+        assert [r["id"] for r in store.query(IOS, days=30)] == ["dated"]
+
+    def test_limit(self, store):
+        """limit keeps the newest N"""
+        store.upsert([make_review(str(i), i + 1) for i in range(5)])
+        assert [r["id"] for r in store.query(IOS, limit=2)] == ["0", "1"]
+
+    def test_limit_puts_undated_last(self, store):
+        """Undated reviews sort after every dated one"""
+        store.upsert([make_review("undated", date=""), make_review("dated", 3)])
+        assert [r["id"] for r in store.query(IOS, limit=2)] == ["dated", "undated"]
+
+    def test_tag_replaces_country(self, store):
+        """tag is written into the returned records"""
+        store.upsert([make_review("1", country="us"), make_review("2", country="de")])
+        assert {r["country"] for r in store.query(IOS, tag="global")} == {"global"}
+
+    def test_records_use_platform_fields(self, store):
+        """Records carry the platform's exported fields, in scraper order"""
+        store.upsert([make_review("1", vote_sum=4)])
+        record = store.query(IOS)[0].to_dict()
+        assert list(record) == scraper.REVIEW_FIELDS[IOS]
+        assert record["vote_sum"] == 4
+
+
+class TestPublishDataset:
+    """Tests for writing a dataset's exports and analytics"""
+
+    @pytest.fixture
+    def spec(self, tmp_path):
+        return {"name": "Test_US_Last30Days", "key": "test_us_30d", "dir": str(tmp_path),
+                "platform": IOS, "country": "us", "days": 30, "label": "US"}
+
+    def test_writes_exports_and_analytics(self, store, spec, tmp_path):
+        """JSON, CSV and analytics files hold the queried reviews"""
+        store.upsert([make_review("1", 1, rating=5), make_review("2", 2, rating=1),
+                      make_review("3", 45), make_review("4", 1, country="de")])
+        reviews = publish_dataset(store, spec)
+        assert [r["id"] for r in reviews] == ["1", "2"]
+
+        with open(tmp_path / "Test_US_Last30Days.json", encoding="utf-8") as f:
+            assert [r["id"] for r in json.load(f)] == ["1", "2"]
+        assert (tmp_path / "Test_US_Last30Days.csv").exists()
+        with open(tmp_path / "Test_US_Last30Days_Analytics.json", encoding="utf-8") as f:
+            analytics = json.load(f)
+        assert analytics["total_reviews"] == 2
+        assert analytics["avg_rating"] == 3.0
+        assert analytics["days"] == 30
+
+    def test_no_export(self, store, spec, tmp_path):
+        """export=False writes only the analytics"""
+        store.upsert([make_review("1")])
+        publish_dataset(store, spec, export=False)
+        assert not (tmp_path / "Test_US_Last30Days.json").exists()
+        assert (tmp_path / "Test_US_Last30Days_Analytics.json").exists()
+
+    def test_columnar_matches_rows(self, store, spec, tmp_path):
+        """Analytics reduced from the corpus equal the row-based ones"""
+        store.upsert([make_review(str(i), i % 20, rating=i % 5 + 1) for i in range(40)])
+        publish_dataset(store, spec)
+        with open(tmp_path / "Test_US_Last30Days_Analytics.json", encoding="utf-8") as f:
+            rows = json.load(f)
+        publish_dataset(store, spec, columnar=True)
+        assert (tmp_path / "Test_US_Last30Days.columns").is_dir()
+        with open(tmp_path / "Test_US_Last30Days_Analytics.json", encoding="utf-8") as f:
+            columns = json.load(f)
+        rows.pop("scrape_date")
+        columns.pop("scrape_date")
+        assert columns == rows
+
+
+class TestDateEpoch:
+    """Tests for dates normalized to UTC epoch seconds"""
+
+    def test_mixed_offsets_compared_in_utc(self, store):
+        """The window cut uses the instant, not the local date string"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+        # Local date reads as before the cutoff, but the instant is inside
+        inside = (cutoff + timedelta(hours=2)).astimezone(timezone(timedelta(hours=-9)))
+        # Local date reads as after the cutoff, but the instant is outside
+        outside = (cutoff - timedelta(hours=2)).astimezone(timezone(timedelta(hours=9)))
+        store.upsert([make_review("inside", date=inside.isoformat()),
+                      make_review("outside", date=outside.isoformat())])
+        assert [r["id"] for r in store.query(IOS, days=30)] == ["inside"]
+
+    def test_mixed_offsets_ordered_by_instant(self, store):
+        """Newest first follows UTC instants across offsets and naive dates"""
+        store.upsert([
+            make_review("a", date="2026-03-01T10:00:00+05:00"),  # 05:00 UTC
+            make_review("b", date="2026-03-01T00:30:00-07:00"),  # 07:30 UTC
+            make_review("c", date="2026-03-01T06:00:00"),        # naive, taken as UTC
+            make_review("d", date="2026-03-01"),                 # 00:00 UTC
+        ])
+        assert [r["id"] for r in store.query(IOS)] == ["b", "c", "a", "d"]
+
+    def test_unparseable_dates_outside_windows(self, store):
+        """Reviews whose date cannot be parsed are stored but never in a window"""
+        store.upsert([make_review("bad", date="yesterday"), make_review("good", 1)])
+        assert len(store) == 2
+        assert [r["id"] for r in store.query(IOS, days=30)] == ["good"]
+        assert [r["id"] for r in store.query(IOS)] == ["good", "bad"]
+
+    def test_migration_backfills_date_epoch(self, tmp_path):
+        """A store created before date_epoch gains the column, filled from its dates"""
+        path = str(tmp_path / "reviews.sqlite")
+        columns = scraper.STORE_COLUMNS
+        conn = scraper.sqlite3.connect(path)
+        conn.execute("CREATE TABLE reviews (platform TEXT NOT NULL, id TEXT NOT NULL, "
+                     + ", ".join(f"{c} TEXT" for c in columns[1:] if c != "platform")
+                     + ", PRIMARY KEY (platform, id))")
+        conn.execute("CREATE INDEX idx_reviews_date ON reviews (platform, date)")
+        rows = [make_review("recent", 2), make_review("old", 60),
+                make_review("offset", date=dated(5).replace("+00:00", "-08:00")),
+                make_review("undated", date="")]
+        conn.executemany(f"INSERT INTO reviews ({', '.join(columns)}) "
+                         f"VALUES ({', '.join('?' for _ in columns)})",
+                         [[r.get(c) for c in columns] for r in rows])
+        conn.commit()
+        conn.close()
+
+        with ReviewStore(path) as s:
+            epochs = dict(s.conn.execute("SELECT id, date_epoch FROM reviews"))
+            indexes = {row[1] for row in s.conn.execute("PRAGMA index_list(reviews)")}
+            assert [r["id"] for r in s.query(IOS, days=30)] == ["recent", "offset"]
+        assert epochs["undated"] is None
+        assert epochs["offset"] - epochs["recent"] == -3 * 86400 + 8 * 3600
+        assert "idx_reviews_date" not in indexes
+        assert "idx_reviews_window" in indexes
+
+    def test_migration_runs_once(self, tmp_path):
+        """Reopening a migrated store leaves date_epoch as stored"""
+        path = str(tmp_path / "reviews.sqlite")
+        with ReviewStore(path) as s:
+            s.upsert([make_review("1")])
+            s.conn.execute("UPDATE reviews SET date_epoch = 7")
+            s.conn.commit()
+        with ReviewStore(path) as s:
+            assert s.conn.execute("SELECT date_epoch FROM reviews").fetchone()[0] == 7
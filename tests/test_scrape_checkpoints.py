@@ -0,0 +1,202 @@
+"""
+Unit tests for the scraper's per-storefront checkpoints
+"""
+import pickle
+import pytest
+import sqlite3
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from weekly_friday_scraper import ScrapeCheckpoints, CHECKPOINT_MAX_AGE
+
+KEY = ScrapeCheckpoints.key("iOS App Store", "us")
+
+
+def page(*ids):
+    return [{"id": str(i), "content": f"Review {i}"} for i in ids]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "scrape_checkpoints.sqlite")
+
+
+@pytest.fixture
+def checkpoints(path):
+    """Empty checkpoint database in a temporary directory"""
+    cp = ScrapeCheckpoints(path)
+    yield cp
+    cp.close()
+
+
+def age_checkpoints(path, seconds):
+    """Make every checkpoint look last updated that many seconds earlier"""
+    cp = ScrapeCheckpoints(path)
+    with cp._conn:
+        cp._conn.execute("UPDATE checkpoints SET updated_at = updated_at - ?", (seconds,))
+    cp.close()
+
+
+class TestCheckpointLifecycle:
+    """Tests for save, load, finish and release"""
+
+    def test_unknown_key(self, checkpoints):
+        assert checkpoints.load(KEY) is None
+        assert list(checkpoints.pages(KEY)) == []
+
+    def test_key_is_storefront(self):
+        """One checkpoint per platform and storefront, whatever the depth"""
+        assert KEY == ScrapeCheckpoints.key("iOS App Store", "us")
+        assert KEY != ScrapeCheckpoints.key("iOS App Store", "gb")
+        assert KEY != ScrapeCheckpoints.key("Google Play", "us")
+
+    def test_save_and_load(self, checkpoints):
+        """Saved pages come back in order with the latest cursor"""
+        checkpoints.save(KEY, 2, page(1, 2), 500)
+        checkpoints.save(KEY, 3, page(3), 500)
+        assert checkpoints.load(KEY) == {"cursor": 3, "done": False, "saved": 3, "depth": 500}
+        assert list(checkpoints.pages(KEY)) == [page(1, 2), page(3)]
+
+    def test_cursor_round_trips_objects(self, checkpoints):
+        """Play continuation tokens are stored as objects, not strings"""
+        token = {"token": "abc", "count": 100, "filter": (None, 5)}
+        checkpoints.save(KEY, token, page(1))
+        assert checkpoints.load(KEY)["cursor"] == token
+
+    def test_finish_keeps_pages(self, checkpoints):
+        """A finished checkpoint is done, has no cursor and keeps its reviews"""
+        checkpoints.save(KEY, 2, page(1), 500)
+        checkpoints.finish(KEY, 500)
+        assert checkpoints.load(KEY) == {"cursor": None, "done": True, "saved": 1, "depth": 500}
+        assert list(checkpoints.pages(KEY)) == [page(1)]
+
+    def test_release(self, checkpoints):
+        """Released checkpoints are gone; others are kept"""
+        other = ScrapeCheckpoints.key("iOS App Store", "gb")
+        checkpoints.save(KEY, 2, page(1))
+        checkpoints.save(other, 2, page(2))
+        checkpoints.release([KEY])
+        assert checkpoints.load(KEY) is None
+        assert list(checkpoints.pages(KEY)) == []
+        assert checkpoints.load(other)["saved"] == 1
+
+    def test_clear(self, checkpoints):
+        checkpoints.save(KEY, 2, page(1))
+        checkpoints.clear()
+        assert checkpoints.load(KEY) is None
+
+    def test_survives_reopen(self, path):
+        """An interrupted scrape's progress is there on the next run"""
+        cp = ScrapeCheckpoints(path)
+        cp.save(KEY, 4, page(1, 2, 3), 500)
+        cp.close()
+        cp = ScrapeCheckpoints(path)
+        assert cp.load(KEY) == {"cursor": 4, "done": False, "saved": 3, "depth": 500}
+        cp.close()
+
+    def test_in_memory(self):
+        """CHECKPOINTS_ENABLED=False keeps checkpoints in memory"""
+        cp = ScrapeCheckpoints(":memory:")
+        cp.save(KEY, 2, page(1))
+        assert cp.load(KEY)["saved"] == 1
+        cp.close()
+
+
+class TestDepth:
+    """Tests for resuming across a change of planned depth"""
+
+    def test_partial_resumes_at_new_depth(self, checkpoints):
+        """An interrupted scrape resumes from its cursor whatever the new depth"""
+        checkpoints.save(KEY, 3, page(1, 2), 500)
+        for depth in (300, 1000):
+            assert checkpoints.resume(KEY, depth)["cursor"] == 3
+
+    def test_save_records_latest_depth(self, checkpoints):
+        checkpoints.save(KEY, 2, page(1), 500)
+        checkpoints.save(KEY, 3, page(2), 1000)
+        assert checkpoints.load(KEY)["depth"] == 1000
+        assert list(checkpoints.pages(KEY)) == [page(1), page(2)]
+
+    def test_finished_deep_enough_reused(self, checkpoints):
+        """A finished checkpoint at least as deep as the scrape serves it"""
+        checkpoints.save(KEY, 2, page(1, 2), 2)
+        checkpoints.finish(KEY, 2)
+        assert checkpoints.resume(KEY, 2)["done"]
+        assert checkpoints.resume(KEY, 1)["done"]
+
+    def test_finished_at_end_of_feed_reused(self, checkpoints):
+        """A checkpoint that ran out of reviews before its depth serves any depth"""
+        checkpoints.save(KEY, 2, page(1, 2), 500)
+        checkpoints.finish(KEY, 500)
+        assert checkpoints.resume(KEY, 3000)["done"]
+
+    def test_finished_too_shallow_dropped(self, checkpoints):
+        """A checkpoint that stopped at a shallower depth is read again from the top"""
+        checkpoints.save(KEY, 2, page(1, 2), 2)
+        checkpoints.finish(KEY, 2)
+        assert checkpoints.resume(KEY, 500) is None
+        assert checkpoints.load(KEY) is None
+        assert list(checkpoints.pages(KEY)) == []
+
+    def test_old_depth_keyed_database_migrated(self, path):
+        """Databases from before the depth column gain it and drop their old keys"""
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            CREATE TABLE checkpoints (key TEXT PRIMARY KEY, cursor BLOB,
+                                      done INTEGER NOT NULL DEFAULT 0, updated_at REAL NOT NULL);
+            CREATE TABLE checkpoint_pages (key TEXT NOT NULL, seq INTEGER NOT NULL,
+                                           reviews TEXT NOT NULL, PRIMARY KEY (key, seq));
+        """)
+        conn.execute("INSERT INTO checkpoints VALUES ('iOS App Store|us|500', ?, 0, 1e12)",
+                     (pickle.dumps(2),))
+        conn.execute("INSERT INTO checkpoint_pages VALUES ('iOS App Store|us|500', 0, '[]')")
+        conn.commit()
+        conn.close()
+        cp = ScrapeCheckpoints(path)
+        assert cp.load("iOS App Store|us|500") is None
+        cp.save(KEY, 2, page(1), 500)
+        assert cp.load(KEY)["depth"] == 500
+        cp.close()
+
+
+class TestStaleness:
+    """Tests for dropping checkpoints the feed has moved past"""
+
+    def test_stale_dropped_on_open(self, path):
+        """Checkpoints older than CHECKPOINT_MAX_AGE are released when opened"""
+        cp = ScrapeCheckpoints(path)
+        cp.save(KEY, 2, page(1))
+        cp.close()
+        age_checkpoints(path, CHECKPOINT_MAX_AGE + 60)
+        cp = ScrapeCheckpoints(path)
+        assert cp.load(KEY) is None
+        assert list(cp.pages(KEY)) == []
+        cp.close()
+
+    def test_recent_kept(self, path):
+        cp = ScrapeCheckpoints(path)
+        cp.save(KEY, 2, page(1))
+        cp.close()
+        age_checkpoints(path, CHECKPOINT_MAX_AGE - 60)
+        cp = ScrapeCheckpoints(path)
+        assert cp.load(KEY)["saved"] == 1
+        cp.close()
+
+    def test_save_refreshes_age(self, path):
+        """Each saved page restarts the checkpoint's clock"""
+        cp = ScrapeCheckpoints(path)
+        cp.save(KEY, 2, page(1))
+        cp.close()
+        age_checkpoints(path, CHECKPOINT_MAX_AGE - 60)
+        cp = ScrapeCheckpoints(path)
+        cp.save(KEY, 3, page(2))
+        cp.close()
+        age_checkpoints(path, 120)
+        cp = ScrapeCheckpoints(path)
+        assert cp.load(KEY)["cursor"] == 3
+        assert cp.load(KEY)["saved"] == 2
+        cp.close()
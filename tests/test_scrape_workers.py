@@ -0,0 +1,134 @@
+"""
+Unit tests for the settings handed to Google Play scrape worker processes
+"""
+import pickle
+import pytest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import RateLimiter, ScrapeResult, stream_storefronts, RATE_LIMITS
+
+
+def stub_pages(country, max_reviews=500, since=None, result=None):
+    """Module-level page iterator, so spawned workers can unpickle it"""
+    for n in range(2):
+        yield [{"id": f"{country}-{n}", "pid": os.getpid(), "depth": max_reviews,
+                "since": since}]
+    result.absorb(ScrapeResult(watermarks={country: (since or 0) + 1}, checkpoints=[country],
+                               activity={country: float(max_reviews)}))
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    """No adapted limiters from other tests"""
+    monkeypatch.setattr(scraper, "_rate_limiters", {})
+
+
+class TestWorkerBudgetSplit:
+    """Tests for dividing each family's rate budget between workers"""
+
+    @pytest.mark.parametrize("share", [1, 2, 4, 15])
+    def test_rates_divided(self, share):
+        """Workers together get one process's rate, range and (at least) burst"""
+        limits = scraper._scrape_worker_settings(share)["rate_limits"]
+        for family, spec in RATE_LIMITS.items():
+            split = limits[family]
+            assert split["rate"] * share == pytest.approx(spec["rate"])
+            assert split["min_rate"] * share == pytest.approx(spec["min_rate"])
+            assert split["max_rate"] * share == pytest.approx(spec["max_rate"])
+            assert split["burst"] == max(1, spec["burst"] // share)
+
+    def test_burst_at_least_one(self):
+        """Every worker can send a request"""
+        limits = scraper._scrape_worker_settings(100)["rate_limits"]
+        assert all(spec["burst"] == 1 for spec in limits.values())
+
+    def test_uses_adapted_rate(self, monkeypatch):
+        """A family already slowed down in this process starts its workers slowed down"""
+        limiter = RateLimiter(**RATE_LIMITS["play"])
+        limiter.rate = 1.0
+        monkeypatch.setitem(scraper._rate_limiters, "play", limiter)
+        limits = scraper._scrape_worker_settings(4)["rate_limits"]
+        assert limits["play"]["rate"] == pytest.approx(0.25)
+        assert limits["itunes_rss"]["rate"] == pytest.approx(RATE_LIMITS["itunes_rss"]["rate"] / 4)
+
+    def test_base_limits_unchanged(self):
+        """Splitting does not modify this process's RATE_LIMITS"""
+        before = {family: dict(spec) for family, spec in RATE_LIMITS.items()}
+        scraper._scrape_worker_settings(4)
+        assert RATE_LIMITS == before
+
+    def test_settings_picklable(self):
+        """Settings cross to spawned workers by pickling"""
+        settings = scraper._scrape_worker_settings(3)
+        assert pickle.loads(pickle.dumps(settings)) == settings
+
+
+class TestWorkerInit:
+    """Tests for applying the settings in a fresh worker"""
+
+    @pytest.fixture
+    def worker_globals(self, monkeypatch):
+        """Copies of the globals the initializer replaces, restored afterwards"""
+        monkeypatch.setattr(scraper, "RATE_LIMITS",
+                            {family: dict(spec) for family, spec in RATE_LIMITS.items()})
+        monkeypatch.setattr(scraper, "HOST_CONCURRENCY", dict(scraper.HOST_CONCURRENCY))
+        for name in ("DEFAULT_HOST_CONCURRENCY", "HTTP_CACHE_ENABLED", "CHECKPOINTS_ENABLED",
+                     "_state_dir", "DATA_DIR", "IOS_DATA_DIR", "ANDROID_DATA_DIR", "OUTPUT_DIR",
+                     "INSIGHTS_DIR", "REPORTS_DIR", "VISUALIZATIONS_DIR", "CHECKPOINT_FILE",
+                     "REVIEW_STORE_FILE", "RATING_HISTORY_FILE", "CURRENT_RATINGS_FILE",
+                     "HTTP_CACHE_FILE", "CLASSIFICATION_CACHE_FILE", "STORE_DATASETS"):
+            monkeypatch.setattr(scraper, name, getattr(scraper, name))
+
+    def test_applies_split_limits(self, worker_globals):
+        """A worker's limiters are built from the divided budget"""
+        settings = scraper._scrape_worker_settings(4)
+        scraper._init_scrape_worker(settings)
+        assert scraper.rate_limiter("play").rate == pytest.approx(RATE_LIMITS["play"]["rate"] / 4)
+        assert scraper.rate_limiter("play").burst == settings["rate_limits"]["play"]["burst"]
+
+    def test_applies_switches(self, worker_globals):
+        """Host caps, cache and checkpoint switches follow the parent"""
+        settings = scraper._scrape_worker_settings(2)
+        settings.update(host_concurrency={"play.google.com": 1}, default_host_concurrency=3,
+                        http_cache=False, checkpoints=False)
+        scraper._init_scrape_worker(settings)
+        assert scraper.HOST_CONCURRENCY["play.google.com"] == 1
+        assert scraper.DEFAULT_HOST_CONCURRENCY == 3
+        assert scraper.HTTP_CACHE_ENABLED is False
+        assert scraper.CHECKPOINTS_ENABLED is False
+
+    def test_applies_state_dir(self, worker_globals, tmp_path):
+        """A worker of a replayed run checkpoints into the same state directory"""
+        settings = scraper._scrape_worker_settings(2)
+        settings["state_dir"] = str(tmp_path)
+        scraper._init_scrape_worker(settings)
+        assert scraper.CHECKPOINT_FILE == os.path.join(str(tmp_path), "scrape_checkpoints.sqlite")
+
+
+class TestProcessStream:
+    """Tests for stream_storefronts with storefronts in worker processes"""
+
+    def test_storefronts_in_order(self):
+        """Each storefront arrives whole, in order, from a worker, with its bookkeeping"""
+        countries = ["us", "gb", "de"]
+        result = ScrapeResult()
+        pages = list(stream_storefronts(stub_pages, countries, 500, workers=2, processes=True,
+                                        watermarks={"gb": 41}, depths={"de": 50},
+                                        result=result))
+        assert [[r["id"] for r in page] for page in pages] == \
+            [[f"{c}-0", f"{c}-1"] for c in countries]
+        assert all(isinstance(page, ScrapeResult) for page in pages)
+        assert all(r["pid"] != os.getpid() for page in pages for r in page)
+        assert [(page[0]["depth"], page[0]["since"]) for page in pages] == \
+            [(500, None), (500, 41), (50, None)]
+        assert result.watermarks == {"us": 1, "gb": 42, "de": 1}
+        assert result.checkpoints == countries
+        assert result.activity == {"us": 500.0, "gb": 500.0, "de": 50.0}
+        assert result.complete
+        assert len(result) == 0
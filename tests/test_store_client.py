@@ -0,0 +1,262 @@
+"""
+Unit tests for the scraper's pooled store HTTP client and response cache
+"""
+import threading
+import pytest
+import sys
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import StoreClient, ResponseCache
+
+FAMILY = "itunes_rss"
+URL = "https://itunes.apple.com/us/rss/customerreviews/page=1/id=1/sortby=mostrecent/json"
+
+
+class CannedAdapter(HTTPAdapter):
+    """Transport adapter that answers from a list of (status, headers, body) and records requests"""
+
+    def __init__(self, replies):
+        super().__init__()
+        self.replies = list(replies)
+        self.requests = []
+        self.timeouts = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        self.timeouts.append(kwargs.get("timeout"))
+        status, headers, body = self.replies.pop(0)
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers.update(headers)
+        resp._content = body
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    """Give each test its own rate limiters and skip real sleeps"""
+    monkeypatch.setattr(scraper, "_rate_limiters", {})
+    monkeypatch.setattr(scraper, "backoff_delay", lambda attempt: 0.0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Empty response cache in a temporary directory"""
+    with ResponseCache(str(tmp_path / "http_cache.sqlite")) as c:
+        yield c
+
+
+def age_entries(cache, seconds):
+    """Make every cached entry look fetched that many seconds earlier"""
+    cache._conn.execute("UPDATE responses SET fetched_at = fetched_at - ?", (seconds,))
+    cache._conn.commit()
+
+
+def canned_client(replies, cache=None):
+    """StoreClient whose session is served by a CannedAdapter"""
+    client = StoreClient(cache=cache)
+    adapter = CannedAdapter(replies)
+    client.session.mount("https://", adapter)
+    return client, adapter
+
+
+class TestStoreClient:
+    """Tests for the shared session, timeouts and error handling"""
+
+    def test_one_session_for_all_requests(self):
+        """Every get() goes through the same pooled session"""
+        client, adapter = canned_client([(200, {}, b"{}")] * 3)
+        with client:
+            for page in range(3):
+                client.get(FAMILY, URL.replace("page=1", f"page={page + 1}"))
+        assert len(adapter.requests) == 3
+        assert client.session.get_adapter(URL) is adapter
+
+    def test_default_headers(self):
+        """Requests ask for gzip and carry the store User-Agent"""
+        client, adapter = canned_client([(200, {}, b"{}")])
+        with client:
+            client.get(FAMILY, URL, headers={"X-Apple-Store-Front": "143441-1,29"})
+        sent = adapter.requests[0].headers
+        assert "gzip" in sent["Accept-Encoding"]
+        assert sent["User-Agent"] == scraper.STORE_HEADERS["User-Agent"]
+        assert sent["X-Apple-Store-Front"] == "143441-1,29"
+
+    def test_family_timeouts(self):
+        """Each endpoint family gets its own timeout unless one is given"""
+        client, adapter = canned_client([(200, {}, b"{}")] * 2)
+        with client:
+            client.get("itunes_lookup", URL)
+            client.get(FAMILY, URL, timeout=5)
+        assert adapter.timeouts[0] == scraper.REQUEST_TIMEOUTS["itunes_lookup"]
+        assert adapter.timeouts[1] == 5
+
+    def test_pool_size_covers_workers(self):
+        """The connection pool is at least as large as the scrape workers"""
+        with StoreClient() as client:
+            assert client.pool_size >= scraper.SCRAPE_WORKERS
+
+    def test_get_json(self):
+        """get_json decodes the body"""
+        client, _ = canned_client([(200, {"Content-Type": "application/json"}, b'{"feed": 1}')])
+        with client:
+            assert client.get_json(FAMILY, URL) == {"feed": 1}
+
+    def test_get_json_raises_on_error_status(self):
+        """A non-2xx status raises instead of decoding"""
+        client, _ = canned_client([(404, {}, b"not found")])
+        with client:
+            with pytest.raises(requests.HTTPError):
+                client.get_json(FAMILY, URL)
+
+    def test_throttle_retried(self):
+        """A 429 is retried through the rate limiter"""
+        client, adapter = canned_client([(429, {"Retry-After": "0"}, b""), (200, {}, b"{}")])
+        with client:
+            assert client.get(FAMILY, URL).status_code == 200
+        assert len(adapter.requests) == 2
+
+    def test_persistent_throttle_raises(self, monkeypatch):
+        """A 429 that outlasts the retries raises rather than reading as an empty page"""
+        monkeypatch.setattr(scraper, "MAX_RETRIES", 1)
+        client, adapter = canned_client([(503, {"Retry-After": "0"}, b"")] * 2)
+        with client:
+            with pytest.raises(requests.HTTPError):
+                client.get(FAMILY, URL)
+        assert len(adapter.requests) == 2
+
+
+class TestResponseCache:
+    """Tests for TTL hits, conditional revalidation and cache keys"""
+
+    VALIDATORS = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jul 2026 10:00:00 GMT"}
+
+    def test_fresh_entry_skips_network(self, cache):
+        """Within the family TTL a cached response is served with no request"""
+        client, adapter = canned_client([(200, self.VALIDATORS, b'{"page": 1}')])
+        client.cache = cache
+        assert client.get_json(FAMILY, URL) == {"page": 1}
+        assert client.get_json(FAMILY, URL) == {"page": 1}
+        assert len(adapter.requests) == 1
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    def test_counts_exact_across_threads(self, cache):
+        """Hits counted from several scraping threads add up"""
+        client, adapter = canned_client([(200, self.VALIDATORS, b'{"page": 1}')])
+        client.cache = cache
+        client.get(FAMILY, URL)
+
+        def fetch():
+            for _ in range(200):
+                client.get(FAMILY, URL)
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert (cache.misses, cache.hits, cache.revalidated) == (1, 800, 0)
+        assert len(adapter.requests) == 1
+
+    def test_stale_entry_revalidated(self, cache):
+        """Past the TTL the request carries the stored validators"""
+        client, adapter = canned_client([(200, self.VALIDATORS, b"{}"), (304, {}, b"")])
+        client.cache = cache
+        client.get(FAMILY, URL)
+        age_entries(cache, scraper.CACHE_TTLS[FAMILY] + 1)
+        client.get(FAMILY, URL)
+        sent = adapter.requests[1].headers
+        assert sent["If-None-Match"] == '"v1"'
+        assert sent["If-Modified-Since"] == self.VALIDATORS["Last-Modified"]
+
+    def test_not_modified_serves_and_renews(self, cache):
+        """A 304 returns the cached body and restarts the TTL"""
+        client, adapter = canned_client([(200, self.VALIDATORS, b'{"page": 1}'), (304, {}, b"")])
+        client.cache = cache
+        client.get(FAMILY, URL)
+        age_entries(cache, scraper.CACHE_TTLS[FAMILY] + 1)
+        resp = client.get(FAMILY, URL)
+        assert resp.status_code == 200
+        assert resp.json() == {"page": 1}
+        assert cache.revalidated == 1
+        assert client.get_json(FAMILY, URL) == {"page": 1}
+        assert len(adapter.requests) == 2
+
+    def test_changed_response_replaces_entry(self, cache):
+        """A 200 on revalidation stores the new body"""
+        client, _ = canned_client([(200, self.VALIDATORS, b'{"v": 1}'),
+                                   (200, {"ETag": '"v2"'}, b'{"v": 2}')])
+        client.cache = cache
+        client.get(FAMILY, URL)
+        age_entries(cache, scraper.CACHE_TTLS[FAMILY] + 1)
+        assert client.get_json(FAMILY, URL) == {"v": 2}
+        assert cache.lookup(cache.key(URL))["etag"] == '"v2"'
+
+    def test_errors_not_cached(self, cache):
+        """Only 200 responses are stored"""
+        client, adapter = canned_client([(404, {}, b""), (200, {}, b"{}")])
+        client.cache = cache
+        client.get(FAMILY, URL)
+        assert cache.lookup(cache.key(URL)) is None
+        client.get(FAMILY, URL)
+        assert len(adapter.requests) == 2
+
+    def test_uncached_family_always_revalidates(self, cache):
+        """A family without a TTL goes to the network every time"""
+        client, adapter = canned_client([(200, self.VALIDATORS, b"{}"), (304, {}, b"")])
+        client.cache = cache
+        client.get("play", URL)
+        client.get("play", URL)
+        assert len(adapter.requests) == 2
+        assert cache.revalidated == 1
+
+    def test_vary_headers_select_entry(self, cache):
+        """Storefront-selecting headers are part of the key"""
+        client, adapter = canned_client([(200, {}, b'{"sf": "us"}'), (200, {}, b'{"sf": "gb"}')])
+        client.cache = cache
+        us = {"X-Apple-Store-Front": "143441-1,29"}
+        gb = {"X-Apple-Store-Front": "143444-2,29"}
+        assert client.get_json(FAMILY, URL, headers=us) == {"sf": "us"}
+        assert client.get_json(FAMILY, URL, headers=gb) == {"sf": "gb"}
+        assert client.get_json(FAMILY, URL, headers=us) == {"sf": "us"}
+        assert len(adapter.requests) == 2
+
+    def test_key_ignores_other_headers_and_case(self):
+        """Header name case and non-vary headers do not change the key"""
+        key = ResponseCache.key(URL, {"X-Apple-Store-Front": "143441-1,29"})
+        assert ResponseCache.key(URL, {"x-apple-store-front": "143441-1,29",
+                                       "User-Agent": "other"}) == key
+        assert ResponseCache.key(URL) != key
+        assert ResponseCache.key(URL + "&x=1", {"X-Apple-Store-Front": "143441-1,29"}) != key
+
+    def test_entries_persist(self, tmp_path):
+        """A reopened cache still serves its entries"""
+        path = str(tmp_path / "http_cache.sqlite")
+        client, _ = canned_client([(200, {"Content-Type": "application/json"}, b'{"a": 1}')],
+                                  cache=ResponseCache(path))
+        with client:
+            client.get(FAMILY, URL)
+        client, adapter = canned_client([], cache=ResponseCache(path))
+        with client:
+            assert client.get_json(FAMILY, URL) == {"a": 1}
+        assert adapter.requests == []
+
+    def test_old_entries_pruned_on_open(self, tmp_path):
+        """Entries untouched for CACHE_MAX_AGE are dropped when the cache opens"""
+        path = str(tmp_path / "http_cache.sqlite")
+        with ResponseCache(path) as c:
+            client, _ = canned_client([(200, {}, b"{}")], cache=c)
+            client.get(FAMILY, URL)
+            age_entries(c, scraper.CACHE_MAX_AGE + 1)
+        with ResponseCache(path) as c:
+            assert c.lookup(c.key(URL)) is None
@@ -0,0 +1,154 @@
+"""
+Unit tests for the scraper's offline store replay
+"""
+import pytest
+import shutil
+import sys
+import os
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import ResponseCache, replay_store_traffic
+from store_replay import StoreFixtures, play_call_key
+
+URL = "https://itunes.apple.com/lookup?id=469284907&country=us"
+
+# Module state that replay_store_traffic changes
+REPLAY_GLOBALS = ("DATA_DIR", "IOS_DATA_DIR", "ANDROID_DATA_DIR", "OUTPUT_DIR", "INSIGHTS_DIR",
+                  "REPORTS_DIR", "VISUALIZATIONS_DIR", "REVIEW_STORE_FILE", "CHECKPOINT_FILE",
+                  "RATING_HISTORY_FILE", "CURRENT_RATINGS_FILE", "HTTP_CACHE_FILE",
+                  "CLASSIFICATION_CACHE_FILE", "STORE_DATASETS", "HTTP_CACHE_ENABLED",
+                  "_state_dir", "_store_traffic")
+
+
+@pytest.fixture
+def isolated(monkeypatch):
+    """Restore the scraper's paths, client and google_play_scraper after the test"""
+    for name in REPLAY_GLOBALS:
+        monkeypatch.setattr(scraper, name, getattr(scraper, name))
+    monkeypatch.setattr(scraper, "_store_client", None)
+    monkeypatch.setattr(scraper, "_rate_limiters", {})
+    monkeypatch.setitem(sys.modules, "google_play_scraper", sys.modules.get("google_play_scraper"))
+    yield
+    if scraper._store_client is not None:
+        scraper._store_client.close()
+
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    """Fixture directory with one iTunes response and one Play call recorded"""
+    fixtures = StoreFixtures(str(tmp_path / "fixtures"))
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["Content-Type"] = "application/json"
+    resp._content = b'{"resultCount": 1}'
+    # Keyed on the headers as sent, like the recorder (requests adds Accept: */*)
+    fixtures.save_http(ResponseCache.key(URL, {"Accept": "*/*"}), URL, resp)
+    fixtures.save_call(play_call_key("app", "com.hp.printercontrol", "en", "us"), {"score": 4.5})
+    return fixtures.directory
+
+
+@pytest.fixture
+def replay(isolated, fixture_dir, tmp_path):
+    """Running stand-in replaying fixture_dir with its state in tmp_path/state"""
+    standin = replay_store_traffic(fixture_dir, state_dir=str(tmp_path / "state"))
+    yield standin
+    standin.stop()
+
+
+class TestReplay:
+    """Tests for serving recorded traffic"""
+
+    def test_itunes_response_replayed(self, replay):
+        """iTunes requests are answered from the fixtures"""
+        assert scraper.store_client().get_json("itunes_lookup", URL) == {"resultCount": 1}
+        assert replay.requests == 1
+        assert replay.missing == 0
+
+    def test_play_call_replayed(self, replay):
+        """google_play_scraper is replaced by the stand-in module"""
+        import google_play_scraper
+        assert google_play_scraper.app("com.hp.printercontrol", lang="en", country="us") == \
+            {"score": 4.5}
+
+    def test_unrecorded_request_missing(self, replay):
+        """A request with no fixture is a 404 and counted"""
+        resp = scraper.store_client().get("itunes_lookup", URL + "&entity=x")
+        assert resp.status_code == 404
+        assert replay.missing == 1
+
+    def test_http_cache_bypassed(self, replay):
+        """Every replayed request reaches the stand-in; nothing is cached"""
+        client = scraper.store_client()
+        assert client.cache is None
+        assert not scraper._scrape_worker_settings(2)["http_cache"]
+        client.get("itunes_lookup", URL)
+        client.get("itunes_lookup", URL)
+        assert replay.requests == 2
+
+
+class TestReplayState:
+    """Tests for keeping a replayed run's state out of data/"""
+
+    def test_state_files_in_state_dir(self, replay, tmp_path):
+        """Store, checkpoints, ratings and HTTP cache all live in the state directory"""
+        state = str(tmp_path / "state")
+        for name in ("REVIEW_STORE_FILE", "CHECKPOINT_FILE", "RATING_HISTORY_FILE",
+                     "CURRENT_RATINGS_FILE", "HTTP_CACHE_FILE", "CLASSIFICATION_CACHE_FILE"):
+            assert os.path.dirname(getattr(scraper, name)) == state
+
+    def test_outputs_in_state_dir(self, replay, tmp_path):
+        """Dataset exports, analytics and reports are written under the state directory"""
+        state = str(tmp_path / "state")
+        for name in ("DATA_DIR", "IOS_DATA_DIR", "ANDROID_DATA_DIR", "OUTPUT_DIR",
+                     "INSIGHTS_DIR", "REPORTS_DIR", "VISUALIZATIONS_DIR"):
+            path = getattr(scraper, name)
+            assert os.path.commonpath([path, state]) == state
+            assert os.path.isdir(path)
+        assert all(os.path.commonpath([spec["dir"], state]) == state
+                   for spec in scraper.STORE_DATASETS)
+
+    def test_published_dataset_in_state_dir(self, replay, tmp_path):
+        """Publishing a dataset leaves the real data directory alone"""
+        spec = scraper.STORE_DATASETS[0]
+        store = scraper.open_review_store()
+        try:
+            scraper.publish_dataset(store, spec)
+        finally:
+            store.close()
+        written = os.path.join(spec["dir"], f"{spec['name']}.json")
+        assert os.path.exists(written)
+        assert os.path.dirname(os.path.dirname(written)) == str(tmp_path / "state")
+
+    def test_store_opens_in_state_dir(self, replay, tmp_path):
+        """open_review_store() follows the redirected path"""
+        store = scraper.open_review_store()
+        try:
+            assert store.path == os.path.join(str(tmp_path / "state"), "reviews.sqlite")
+        finally:
+            store.close()
+
+    def test_workers_get_state_dir(self, replay, tmp_path):
+        """Scrape worker processes are pointed at the same state directory"""
+        settings = scraper._scrape_worker_settings(2)
+        assert settings["state_dir"] == str(tmp_path / "state")
+        assert settings["store_traffic"][0] == "replay"
+
+    def test_default_state_dir_is_fresh(self, isolated, fixture_dir):
+        """Without state_dir each replay gets a new temporary directory"""
+        dirs = []
+        for _ in range(2):
+            standin = replay_store_traffic(fixture_dir)
+            standin.stop()
+            dirs.append(scraper._state_dir)
+        try:
+            assert dirs[0] != dirs[1]
+            assert all(not files for d in dirs for _, _, files in os.walk(d))
+        finally:
+            for d in dirs:
+                shutil.rmtree(d, ignore_errors=True)
@@ -0,0 +1,307 @@
+"""
+Unit tests for streaming storefront scrapes into the review store
+"""
+import itertools
+import threading
+import time
+import pytest
+import sys
+import os
+import re
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import (
+    ReviewStore,
+    ScrapeCheckpoints,
+    ScrapeResult,
+    iter_ios_review_pages,
+    stream_storefronts,
+    STREAM_BUFFER_PAGES,
+)
+
+COUNTRIES = ["us", "gb", "de", "fr"]
+NEWEST = int(datetime(2026, 7, 1, tzinfo=timezone.utc).timestamp())
+
+
+class FakePages:
+    """
+    Stand-in for iter_*_review_pages: each storefront yields `pages` pages
+    (forever if None), sleeping delays[country] before each, and raises
+    after fail[country] pages. Records pages produced and storefronts finished.
+    """
+
+    def __init__(self, pages=3, delays=None, fail=None):
+        self.pages = pages
+        self.delays = delays or {}
+        self.fail = fail or {}
+        self.produced = {}
+        self.finished = []
+        self.active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, country, max_reviews=500, since=None, result=None):
+        with self.lock:
+            self.active += 1
+        try:
+            numbers = itertools.count() if self.pages is None else range(self.pages)
+            for n in numbers:
+                if self.fail.get(country) == n:
+                    raise RuntimeError(f"{country} failed")
+                time.sleep(self.delays.get(country, 0))
+                with self.lock:
+                    self.produced[country] = self.produced.get(country, 0) + 1
+                yield [{"id": f"{country}-{n}", "depth": max_reviews, "since": since}]
+            self.finished.append(country)
+            result.absorb(ScrapeResult(watermarks={country: n}, checkpoints=[country]))
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class FakeFeed:
+    """
+    Stand-in store client serving an iTunes RSS review feed of `pages`
+    pages of `per_page` entries, newest first. Raises on the pages in fail
+    and answers the pages in status with that HTTP status.
+    """
+
+    def __init__(self, pages=4, per_page=5, fail=(), status=None):
+        self.pages = pages
+        self.per_page = per_page
+        self.fail = set(fail)
+        self.status = status or {}
+        self.requested = []
+
+    def get(self, family, url):
+        country, page = re.search(r"/(\w+)/rss/customerreviews/page=(\d+)/", url).groups()
+        page = int(page)
+        self.requested.append((country, page))
+        if page in self.fail:
+            raise ConnectionError(f"page {page} failed")
+        if page in self.status:
+            return FakeResponse({}, self.status[page])
+        entries = []
+        if page <= self.pages:
+            for i in range(self.per_page):
+                n = (page - 1) * self.per_page + i
+                updated = datetime.fromtimestamp(NEWEST - n * 3600, timezone.utc).isoformat()
+                entries.append({"id": {"label": f"{country}-{n}"},
+                                "author": {"name": {"label": "User"}},
+                                "im:rating": {"label": "5"}, "title": {"label": "Title"},
+                                "content": {"label": f"Review {n}"},
+                                "im:version": {"label": "1.0"}, "updated": {"label": updated},
+                                "im:voteCount": {"label": "0"}, "im:voteSum": {"label": "0"}})
+        return FakeResponse({"feed": {"entry": entries}})
+
+
+class FakeResponse:
+    text = "{}"
+
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    """Process-wide scrape checkpoints in a temporary directory"""
+    cp = ScrapeCheckpoints(str(tmp_path / "scrape_checkpoints.sqlite"))
+    monkeypatch.setattr(scraper, "_scrape_checkpoints", cp)
+    yield cp
+    cp.close()
+
+
+def serve(monkeypatch, feed):
+    """Answer store_client() requests from feed"""
+    monkeypatch.setattr(scraper, "store_client", lambda: feed)
+    return feed
+
+
+def consume(stream):
+    """Pages of a stream as lists of review IDs"""
+    return [[r["id"] for r in page] for page in stream]
+
+
+class TestStreamOrder:
+    """Tests for yielding concurrent storefronts in serial order"""
+
+    def test_matches_serial(self):
+        """Pages and bookkeeping are the same as the serial loop's"""
+        serial, streamed = ScrapeResult(), ScrapeResult()
+        expected = consume(stream_storefronts(FakePages(), COUNTRIES, 500, workers=1,
+                                              result=serial))
+        pages = FakePages(delays={"us": 0.02, "gb": 0.01})
+        assert consume(stream_storefronts(pages, COUNTRIES, 500, workers=4,
+                                          result=streamed)) == expected
+        assert streamed.watermarks == serial.watermarks
+        assert streamed.checkpoints == serial.checkpoints == COUNTRIES
+
+    def test_slow_first_storefront(self):
+        """Storefronts finishing out of order are still yielded in order"""
+        pages = FakePages(delays={"us": 0.03})
+        ids = [page[0]["id"] for page in stream_storefronts(pages, COUNTRIES, 500, workers=4)]
+        assert pages.finished.index("de") < pages.finished.index("us")
+        assert ids == [f"{c}-{n}" for c in COUNTRIES for n in range(3)]
+
+    def test_per_storefront_options(self):
+        """depths and watermarks reach each storefront's scrape"""
+        pages = stream_storefronts(FakePages(pages=1), COUNTRIES, 500, workers=4,
+                                   watermarks={"gb": 7}, depths={"de": 50})
+        options = {page[0]["id"][:2]: (page[0]["depth"], page[0]["since"]) for page in pages}
+        assert options == {"us": (500, None), "gb": (500, 7), "de": (50, None), "fr": (500, None)}
+
+
+class TestStreamStop:
+    """Tests for early close and producer errors"""
+
+    def test_close_stops_producers(self):
+        """Closing the stream stops every producer within its read-ahead"""
+        pages = FakePages(pages=None)
+        stream = stream_storefronts(pages, COUNTRIES, 500, workers=3)
+        next(stream)
+        stream.close()
+        assert pages.active == 0
+        produced = dict(pages.produced)
+        assert "fr" not in produced
+        assert all(n <= STREAM_BUFFER_PAGES + 2 for n in produced.values())
+        time.sleep(0.2)
+        assert pages.produced == produced
+
+    def test_producer_error_raised(self):
+        """A storefront's exception reaches the consumer after its pages, as in serial"""
+        for workers in (1, 4):
+            pages, seen = FakePages(fail={"gb": 1}), []
+            with pytest.raises(RuntimeError, match="gb failed"):
+                for page in stream_storefronts(pages, COUNTRIES, 500, workers=workers):
+                    seen.append(page[0]["id"])
+            assert seen == ["us-0", "us-1", "us-2", "gb-0"]
+            assert pages.active == 0
+
+    def test_streamed_into_store(self, tmp_path):
+        """Upserting the stream stores every storefront's reviews"""
+        with ReviewStore(str(tmp_path / "reviews.sqlite")) as store:
+            stream = stream_storefronts(FakePages(), COUNTRIES, 500, workers=4)
+            stats = store.upsert(dict(r, platform="iOS App Store", content="x", date="")
+                                 for page in stream for r in page)
+        assert stats["added"] == len(COUNTRIES) * 3
+
+
+class TestIosResume:
+    """Tests for resuming an iTunes RSS scrape from its checkpoint"""
+
+    def test_uninterrupted(self, checkpoints, monkeypatch):
+        feed = serve(monkeypatch, FakeFeed())
+        result = ScrapeResult()
+        pages = consume(iter_ios_review_pages("us", 500, result=result))
+        assert len(pages) == 4
+        assert feed.requested == [("us", page) for page in range(1, 6)]
+        assert result.complete
+        assert result.checkpoints == [ScrapeCheckpoints.key("iOS App Store", "us")]
+
+    def test_resume_after_interruption(self, checkpoints, monkeypatch):
+        """A scrape stopped after two pages resumes at page 3 with the same output"""
+        serve(monkeypatch, FakeFeed())
+        expected = consume(iter_ios_review_pages("us", 500))
+        checkpoints.clear()
+
+        interrupted = ScrapeResult()
+        scrape = iter_ios_review_pages("us", 500, result=interrupted)
+        first = [next(scrape), next(scrape)]
+        scrape.close()
+        assert interrupted.checkpoints == []
+        assert checkpoints.load(ScrapeCheckpoints.key("iOS App Store", "us")) == \
+            {"cursor": 3, "done": False, "saved": 10, "depth": 500}
+
+        feed = serve(monkeypatch, FakeFeed())
+        result = ScrapeResult()
+        pages = consume(iter_ios_review_pages("us", 500, result=result))
+        assert pages[:2] == consume(first)
+        assert pages == expected
+        assert feed.requested == [("us", 3), ("us", 4), ("us", 5)]
+        assert result.complete
+
+    def test_failed_page_keeps_checkpoint(self, checkpoints, monkeypatch):
+        """A request error leaves the scrape incomplete and resumable"""
+        serve(monkeypatch, FakeFeed(fail={3}))
+        failed = ScrapeResult()
+        assert len(consume(iter_ios_review_pages("us", 500, result=failed))) == 2
+        assert not failed.complete
+        assert failed.checkpoints == []
+
+        feed = serve(monkeypatch, FakeFeed())
+        assert len(consume(iter_ios_review_pages("us", 500))) == 4
+        assert feed.requested[0] == ("us", 3)
+
+    @pytest.mark.parametrize("status", [500, 502, 403])
+    def test_error_status_mid_feed(self, checkpoints, monkeypatch, status):
+        """An error status after the first page is a failure, not the end of the feed"""
+        serve(monkeypatch, FakeFeed(status={2: status}))
+        failed = ScrapeResult()
+        assert len(consume(iter_ios_review_pages("de", 500, result=failed))) == 1
+        assert not failed.complete
+        assert failed.watermarks == {}
+        assert failed.checkpoints == []
+
+        feed = serve(monkeypatch, FakeFeed())
+        result = ScrapeResult()
+        assert len(consume(iter_ios_review_pages("de", 500, result=result))) == 4
+        assert feed.requested[0] == ("de", 2)
+        assert result.complete
+        assert "de" in result.watermarks
+
+    def test_error_status_on_first_page(self, checkpoints, monkeypatch):
+        """A storefront whose feed is unavailable reads as empty"""
+        serve(monkeypatch, FakeFeed(status={1: 404}))
+        result = ScrapeResult()
+        assert consume(iter_ios_review_pages("de", 500, result=result)) == []
+        assert result.watermarks == {}
+
+    def test_finished_checkpoint_reused(self, checkpoints, monkeypatch):
+        """A storefront finished by an earlier run is read from its checkpoint"""
+        serve(monkeypatch, FakeFeed())
+        expected = consume(iter_ios_review_pages("us", 500))
+        feed = serve(monkeypatch, FakeFeed())
+        result = ScrapeResult()
+        assert consume(iter_ios_review_pages("us", 500, result=result)) == expected
+        assert feed.requested == []
+        assert result.complete
+
+    def test_resume_at_new_depth(self, checkpoints, monkeypatch):
+        """A scrape interrupted at one planned depth resumes at another"""
+        serve(monkeypatch, FakeFeed())
+        scrape = iter_ios_review_pages("us", 500)
+        next(scrape)
+        scrape.close()
+
+        feed = serve(monkeypatch, FakeFeed())
+        result = ScrapeResult()
+        pages = consume(iter_ios_review_pages("us", 15, result=result))
+        assert [len(page) for page in pages] == [5, 5, 5]
+        assert feed.requested == [("us", 2), ("us", 3)]
+        assert result.complete
+
+    def test_stream_resumes_partial_storefront(self, checkpoints, monkeypatch):
+        """A concurrent stream resumes one storefront and matches the serial scrape"""
+        serve(monkeypatch, FakeFeed())
+        expected = consume(stream_storefronts(iter_ios_review_pages, COUNTRIES, 500, workers=1))
+        checkpoints.clear()
+
+        scrape = iter_ios_review_pages("gb", 500)
+        next(scrape)
+        scrape.close()
+        feed = serve(monkeypatch, FakeFeed())
+        result = ScrapeResult()
+        assert consume(stream_storefronts(iter_ios_review_pages, COUNTRIES, 500, workers=4,
+                                          result=result)) == expected
+        assert ("gb", 1) not in feed.requested
+        assert ("gb", 2) in feed.requested
+        assert result.complete
+        assert len(result.checkpoints) == len(COUNTRIES)
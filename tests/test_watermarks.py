@@ -0,0 +1,81 @@
+"""
+Unit tests for the scraper's incremental (watermark) stopping rule
+"""
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import weekly_friday_scraper as scraper
+from weekly_friday_scraper import (
+    ReviewStore,
+    ScrapeResult,
+    page_before_watermark,
+    WATERMARK_OVERLAP,
+)
+
+IOS = "iOS App Store"
+MARK = int(datetime(2026, 7, 1, tzinfo=timezone.utc).timestamp())
+
+
+def at(epoch):
+    """Review dict dated at a UTC epoch"""
+    return {"id": str(epoch), "date": datetime.fromtimestamp(epoch, timezone.utc).isoformat()}
+
+
+class TestPageBeforeWatermark:
+    """Tests for deciding that a page holds only stored reviews"""
+
+    def test_no_watermark(self):
+        """Without a watermark every page is read"""
+        assert not page_before_watermark([at(MARK - 10 * 86400)], None)
+
+    def test_empty_page(self):
+        assert not page_before_watermark([], MARK)
+
+    def test_page_older_than_overlap(self):
+        """A page entirely older than the mark minus the overlap stops paging"""
+        page = [at(MARK - WATERMARK_OVERLAP - 60), at(MARK - 5 * 86400)]
+        assert page_before_watermark(page, MARK)
+
+    def test_page_inside_overlap(self):
+        """Reviews just below the mark are still read (late publication)"""
+        page = [at(MARK - WATERMARK_OVERLAP + 60), at(MARK - 5 * 86400)]
+        assert not page_before_watermark(page, MARK)
+
+    def test_undated_review_keeps_paging(self):
+        """A review without a date never counts as already stored"""
+        page = [at(MARK - 5 * 86400), {"id": "x", "date": ""}]
+        assert not page_before_watermark(page, MARK)
+
+    def test_agent_path_added_once(self):
+        """Repeated calls do not grow sys.path"""
+        before = list(sys.path)
+        for _ in range(3):
+            page_before_watermark([at(MARK)], MARK)
+        assert sys.path == before
+        assert sys.path.count(scraper.PROJECT_ROOT) <= 1
+
+
+class TestWatermarkBookkeeping:
+    """Tests for merging and storing per-storefront watermarks"""
+
+    def test_absorb_merges(self):
+        """absorb() combines reviews, watermarks and completeness"""
+        total = ScrapeResult(watermarks={"us": 1})
+        total.absorb(ScrapeResult([at(MARK)], complete=False, watermarks={"gb": 2}))
+        assert len(total) == 1
+        assert total.watermarks == {"us": 1, "gb": 2}
+        assert not total.complete
+
+    def test_advance_never_lowers(self, tmp_path):
+        """Stored watermarks only move forward"""
+        with ReviewStore(str(tmp_path / "reviews.sqlite")) as store:
+            store.advance_watermarks(IOS, {"us": MARK, "gb": MARK})
+            store.advance_watermarks(IOS, {"us": MARK - 100, "gb": MARK + 100})
+            assert store.watermarks(IOS) == {"us": MARK, "gb": MARK + 100}
+            assert store.watermarks("Google Play") == {}